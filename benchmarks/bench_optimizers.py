@@ -0,0 +1,57 @@
+"""
+Compare the active-set QP optimizers against the SLSQP path, for speed and for how
+close the resulting weights are.
+
+    python -m benchmarks.bench_optimizers [--sizes 10 50 100 300] [--repeat 3]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.analytics.optimization.markowitz import compute_min_var_portfolio, maximize_sharpe_ratio
+
+
+def synthetic_inputs(n_assets: int, seed: int = 0):
+    """Annualized mu / cov from a 5-factor model plus idiosyncratic noise."""
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(0, 0.12, size=(n_assets, 5))
+    cov = loadings @ loadings.T + np.diag(rng.uniform(0.01, 0.09, n_assets))
+    mu = rng.uniform(-0.02, 0.18, n_assets)
+    return mu, cov
+
+
+def best_time(fn, repeat):
+    best, result = np.inf, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(sizes, repeat, rf=0.03):
+    header = f"{'objective':<10} {'assets':>6} {'qp [ms]':>10} {'slsqp [ms]':>11} {'speedup':>8} {'max |dw|':>10} {'obj gap':>10}"
+    print(header)
+    print("-" * len(header))
+    for n in sizes:
+        mu, cov = synthetic_inputs(n)
+        for name, solve, objective in (
+            ("min_var", lambda m: compute_min_var_portfolio(mu, cov, method=m), lambda w: w @ cov @ w),
+            ("max_sharpe", lambda m: maximize_sharpe_ratio(mu, cov, rf, method=m),
+             lambda w: -(w @ mu - rf) / np.sqrt(w @ cov @ w)),
+        ):
+            t_qp, w_qp = best_time(lambda: solve("qp"), repeat)
+            t_sl, w_sl = best_time(lambda: solve("slsqp"), repeat)
+            # positive gap: the QP found the better objective value
+            gap = objective(w_sl) - objective(w_qp)
+            print(f"{name:<10} {n:>6} {t_qp * 1e3:>10.2f} {t_sl * 1e3:>11.2f} {t_sl / t_qp:>7.1f}x "
+                  f"{np.abs(w_qp - w_sl).max():>10.2e} {gap:>10.2e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 300])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
@@ -0,0 +1,403 @@
+"""
+Benchmarks for the analytics hot paths, on synthetic seeded prices (no network).
+
+Every benchmark runs for each (assets, days) size; results are written to
+benchmarks/results/<timestamp>_<commit>.json so two runs can be compared:
+
+    python -m benchmarks.suite [--quick] [--filter optim] [--repeat 5]
+    python -m benchmarks.suite --compare latest      # run again and diff against the last saved run
+    python -m benchmarks.suite --compare a.json b.json   # diff two saved runs
+
+Import times of the analytics modules are measured too, each in a fresh interpreter
+(records named "import:<module>"), so a headless worker's startup cost is tracked.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.helpers.costs import CostModel
+from src.analytics.helpers.kernels import ema, stop_loss_positions
+from src.analytics.optimization.batch import PortfolioSpec, optimize_portfolios
+from src.analytics.optimization.markowitz import (
+    compute_min_var_portfolio,
+    maximize_sharpe_ratio,
+    prepare_portfolio_inputs,
+)
+from src.analytics.optimization.markowitz_backtesting import (
+    backtest_portfolio,
+    random_portfolio_paths,
+    random_portfolio_returns,
+)
+from src.analytics.optimization.random_portfolios import generate_portfolios
+from src.analytics.optimization.risk_parity import equal_risk_contribution, hierarchical_risk_parity
+from src.analytics.risk import risk_metrics
+from src.analytics.risk.covariance import FactorCovariance, LedoitWolfCovariance
+from src.analytics.risk.monte_carlo import simulate_portfolio
+from src.analytics.risk.performance import performance_report, wealth_to_returns
+from src.analytics.risk.var import rolling_var
+from src.analytics.strategies.sma_strategy import run_sma_strategy
+from src.analytics.strategies.sweep import sweep_ma_windows
+from src.data.price_cache import PriceCache, get_price_cache, set_price_cache
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# (n_assets, n_days)
+QUICK_SIZES = [(10, 504), (50, 1260)]
+FULL_SIZES = [(10, 504), (50, 1260), (100, 2520), (300, 2520)]
+
+# modules a headless worker imports; pandas alone is the floor to compare against
+IMPORT_TARGETS = [
+    "pandas",
+    "src.analytics.helpers.returns",
+    "src.analytics.risk.risk_metrics",
+    "src.analytics.optimization.markowitz",
+    "src.analytics.optimization.markowitz_backtesting",
+    "src.analytics.strategies.sma_strategy",
+]
+# optional heavy dependencies that should only load when a function needs them
+LAZY_MODULES = ("matplotlib", "seaborn", "scipy", "yfinance", "numba")
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """
+    Register a benchmark. The decorated function gets a price DataFrame and returns the
+    zero-argument callable to time, so setup work stays out of the measurement.
+    """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def synthetic_prices(n_assets: int, n_days: int, seed: int = 0) -> pd.DataFrame:
+    """Business-day close prices from a 3-factor model, one column per synthetic ticker."""
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(0, 0.006, size=(n_assets, 3))
+    noise = rng.normal(0, 0.012, size=(n_days, n_assets))
+    steps = rng.normal(0, 1, size=(n_days, 3)) @ loadings.T + noise + rng.uniform(0, 0.0006, n_assets)
+    index = pd.bdate_range(end="2024-12-31", periods=n_days)
+    columns = [f"T{i:03d}" for i in range(n_assets)]
+    return pd.DataFrame(100 * np.exp(np.cumsum(steps, axis=0)), index=index, columns=columns)
+
+
+class SyntheticBackend:
+    """PriceCache backend returning deterministic random walks, seeded by the ticker name."""
+
+    def __call__(self, tickers, start, end) -> pd.DataFrame:
+        index = pd.bdate_range(start, end - pd.Timedelta(days=1))
+        columns = {}
+        for ticker in tickers:
+            rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+            columns[ticker] = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, len(index))))
+        return pd.DataFrame(columns, index=index)
+
+
+@benchmark("prepare_portfolio_inputs")
+def bench_prepare_inputs(prices):
+    return lambda: prepare_portfolio_inputs(prices)
+
+
+@benchmark("compute_min_var_portfolio")
+def bench_min_var(prices):
+    mu, cov = prepare_portfolio_inputs(prices)
+    return lambda: compute_min_var_portfolio(mu.values, cov.values)
+
+
+@benchmark("maximize_sharpe_ratio")
+def bench_max_sharpe(prices):
+    mu, cov = prepare_portfolio_inputs(prices)
+    return lambda: maximize_sharpe_ratio(mu.values, cov.values, rf=0.03)
+
+
+@benchmark("generate_portfolios")
+def bench_generate_portfolios(prices):
+    mu, cov = prepare_portfolio_inputs(prices)
+    return lambda: generate_portfolios(mu.values, cov.values, n_portfolios=5000, seed=0)
+
+
+@benchmark("backtest_portfolio")
+def bench_backtest(prices):
+    weights = np.full(prices.shape[1], 1 / prices.shape[1])
+    return lambda: backtest_portfolio(weights, prices)
+
+
+@benchmark("random_portfolio_returns")
+def bench_random_portfolios(prices):
+    return lambda: random_portfolio_returns(prices, n_portfolios=100, seed=0)
+
+
+@benchmark("run_sma_strategy")
+def bench_sma_strategy(prices):
+    # the warm-up call fills the on-disk cache, so the timing covers reading the
+    # series from disk plus the strategy itself
+    cache = PriceCache(tempfile.mkdtemp(prefix="optifund-bench-"), backend=SyntheticBackend())
+    period = f"{max(1, len(prices) // 252)}y"
+
+    def run():
+        previous = get_price_cache()
+        set_price_cache(cache)
+        try:
+            return run_sma_strategy("SYNTH", window=50, period=period)
+        finally:
+            set_price_cache(previous)
+    return run
+
+
+@benchmark("risk_metrics")
+def bench_risk_metrics(prices):
+    returns = prices.pct_change().dropna()
+
+    def run():
+        risk_metrics.compute_annualized_covariance(returns)
+        risk_metrics.compute_correlation(returns)
+        risk_metrics.compute_kurtosis(returns)
+        returns.apply(risk_metrics.compute_sharpe_ratio)
+    return run
+
+
+@benchmark("covariance_estimators")
+def bench_covariance_estimators(prices):
+    returns = prices.pct_change().dropna()
+
+    def run():
+        LedoitWolfCovariance().fit(returns)
+        FactorCovariance(n_factors=5).fit(returns)
+    return run
+
+
+@benchmark("monte_carlo")
+def bench_monte_carlo(prices):
+    mu, cov = prepare_portfolio_inputs(prices)
+    weights = np.full(prices.shape[1], 1 / prices.shape[1])
+    return lambda: simulate_portfolio(weights, mu, cov, n_paths=10_000, horizon=252, seed=0)
+
+
+@benchmark("ma_sweep")
+def bench_ma_sweep(prices):
+    return lambda: sweep_ma_windows(prices, windows=range(2, 60))
+
+
+@benchmark("ma_sweep_costs")
+def bench_ma_sweep_costs(prices):
+    costs = CostModel(bps=5, fixed=1e-4, slippage=0.2)
+    return lambda: sweep_ma_windows(prices, windows=range(2, 60), costs=costs)
+
+
+@benchmark("kernels")
+def bench_kernels(prices):
+    values = prices.to_numpy()
+    average = ema(values, 20, seed="sma")
+
+    def run():
+        ema(values, 20, seed="sma")
+        stop_loss_positions(values, average, stop_loss=0.05, trailing=True)
+    return run
+
+
+@benchmark("risk_parity")
+def bench_risk_parity(prices):
+    _, cov = prepare_portfolio_inputs(prices)
+
+    def run():
+        equal_risk_contribution(cov)
+        hierarchical_risk_parity(cov)
+    return run
+
+
+@benchmark("optimize_portfolios")
+def bench_optimize_portfolios(prices):
+    # 200 overlapping client portfolios of up to 10 holdings
+    rng = np.random.default_rng(0)
+    tickers = list(prices.columns)
+    specs = [PortfolioSpec(f"client_{i}", list(rng.choice(tickers, min(10, len(tickers)), replace=False)))
+             for i in range(200)]
+    return lambda: optimize_portfolios(specs, prices=prices)
+
+
+@benchmark("performance_report")
+def bench_performance_report(prices):
+    # ranking 10k random portfolios in one call
+    wealth = random_portfolio_paths(prices, n_portfolios=10_000, seed=0)["cumulative"]
+    returns = wealth_to_returns(wealth)
+    return lambda: performance_report(returns).sort_values("sharpe")
+
+
+@benchmark("rolling_var")
+def bench_rolling_var(prices):
+    returns = prices.pct_change().iloc[1:]
+    return lambda: rolling_var(returns, window=252, confidence=0.95)
+
+
+def time_call(fn, repeat: int) -> list[float]:
+    """Wall-clock seconds of repeat calls to fn, after one warm-up call."""
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_suite(sizes=QUICK_SIZES, repeat: int = 3, pattern: str | None = None, verbose: bool = True) -> list[dict]:
+    """
+    Run every registered benchmark whose name contains pattern, at every size.
+
+    Returns:
+        list of records with name, n_assets, n_days, best, median (seconds).
+    """
+    records = []
+    for n_assets, n_days in sizes:
+        prices = synthetic_prices(n_assets, n_days)
+        for name, setup in BENCHMARKS.items():
+            if pattern and pattern not in name:
+                continue
+            # keep anything the analytics write to stdout out of the report
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                timings = time_call(setup(prices), repeat)
+            record = {"name": name, "n_assets": n_assets, "n_days": n_days,
+                      "best": min(timings), "median": float(np.median(timings))}
+            records.append(record)
+            if verbose:
+                print(f"{name:<28} {n_assets:>6} {n_days:>6} {record['best'] * 1e3:>10.2f} ms")
+    return records
+
+
+def time_import(module: str) -> tuple[float, list[str]]:
+    """Seconds to import module in a fresh interpreter, and the LAZY_MODULES it loaded."""
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(elapsed, *[m for m in {LAZY_MODULES!r} if m in sys.modules])\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=Path(__file__).resolve().parents[1]).stdout.split()
+    return float(out[0]), out[1:]
+
+
+def run_import_benchmarks(repeat: int = 3, pattern: str | None = None, verbose: bool = True) -> list[dict]:
+    """Import time of every IMPORT_TARGETS module (best of repeat fresh interpreters)."""
+    records = []
+    for module in IMPORT_TARGETS:
+        name = f"import:{module}"
+        if pattern and pattern not in name:
+            continue
+        runs = [time_import(module) for _ in range(repeat)]
+        timings = [elapsed for elapsed, _ in runs]
+        record = {"name": name, "n_assets": 0, "n_days": 0, "best": min(timings),
+                  "median": float(np.median(timings)), "loaded": runs[0][1]}
+        records.append(record)
+        if verbose:
+            loaded = f"  (loads {', '.join(record['loaded'])})" if record["loaded"] else ""
+            print(f"{name:<56} {record['best'] * 1e3:>10.2f} ms{loaded}")
+    return records
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).parent).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit or "unknown",
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.platform(),
+    }
+
+
+def save_results(records: list[dict], directory: Path = RESULTS_DIR) -> Path:
+    """Write the records plus commit / version info to a new json file in directory."""
+    env = environment()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{datetime.now():%Y%m%d-%H%M%S}_{env['commit']}.json"
+    with open(path, "w") as f:
+        json.dump({"environment": env, "results": records}, f, indent=2)
+    return path
+
+
+def load_results(path: str | Path, directory: Path = RESULTS_DIR) -> dict:
+    """Load a saved run; "latest" picks the most recent file in directory."""
+    if str(path) == "latest":
+        saved = sorted(directory.glob("*.json"))
+        if not saved:
+            raise FileNotFoundError(f"No saved benchmark results in {directory}")
+        path = saved[-1]
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline: list[dict], current: list[dict], threshold: float = 1.25, verbose: bool = True) -> list[dict]:
+    """
+    Match records by (name, n_assets, n_days) and compare their best times.
+
+    Returns:
+        the records that got slower than baseline by more than threshold, with a "ratio" key.
+    """
+    before = {(r["name"], r["n_assets"], r["n_days"]): r["best"] for r in baseline}
+    regressions = []
+    for record in current:
+        key = (record["name"], record["n_assets"], record["n_days"])
+        if key not in before:
+            continue
+        ratio = record["best"] / before[key]
+        flag = ""
+        if ratio > threshold:
+            flag = "  <-- slower"
+            regressions.append({**record, "ratio": ratio})
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        if verbose:
+            print(f"{key[0]:<28} {key[1]:>6} {key[2]:>6} {before[key] * 1e3:>10.2f} -> "
+                  f"{record['best'] * 1e3:>10.2f} ms {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="only the small sizes")
+    parser.add_argument("--filter", help="only benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--compare", nargs="+", metavar="RUN",
+                        help="saved run to compare against ('latest' for the last one); two runs compares them directly")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    if args.compare and len(args.compare) == 2:
+        regressions = compare(load_results(args.compare[0])["results"], load_results(args.compare[1])["results"],
+                              args.threshold)
+        return 1 if regressions else 0
+
+    baseline = load_results(args.compare[0]) if args.compare else None
+    records = run_suite(QUICK_SIZES if args.quick else FULL_SIZES, args.repeat, args.filter)
+    records += run_import_benchmarks(args.repeat, args.filter)
+    if not args.no_save:
+        print(f"saved to {save_results(records)}")
+    if baseline:
+        print(f"\ncompared with {baseline['environment']['commit']} ({baseline['environment']['date']})")
+        return 1 if compare(baseline["results"], records, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
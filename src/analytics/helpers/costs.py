@@ -0,0 +1,103 @@
+"""
+Transaction costs for the backtests, charged on position (or weight) changes.
+
+The cost of trading a fraction |dw| of the portfolio on day t is
+    |dw| * (bps / 10_000 + slippage * vol[t]) + fixed   (if dw != 0)
+where vol[t] is the asset's daily return volatility over the previous vol_window days, so
+illiquid / volatile names cost more to trade. Costs are a fraction of wealth and are
+subtracted from that day's return.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class CostModel:
+    """
+    Attributes:
+        bps: proportional cost in basis points of the traded value (commissions, spread).
+        fixed: cost per trade as a fraction of the portfolio (e.g. a $5 ticket on a
+            $100k account is 5e-5).
+        slippage: price impact per unit traded, in multiples of the asset's daily volatility.
+        vol_window: days of returns used for the volatility.
+    """
+
+    bps: float = 0.0
+    fixed: float = 0.0
+    slippage: float = 0.0
+    vol_window: int = 20
+
+    def unit_costs(self, returns: np.ndarray) -> np.ndarray | float:
+        """
+        Proportional cost per unit traded for every (day, asset) of a (T, N) returns array,
+        or a scalar when there is no slippage. Depends only on the returns, so a sweep
+        computes it once and reuses it for every window.
+        """
+        unit = self.bps / 10_000
+        if not self.slippage:
+            return unit
+        return unit + self.slippage * trailing_volatility(returns, self.vol_window)
+
+    def flip_costs(self, returns: np.ndarray) -> np.ndarray:
+        """
+        Cost of a full position flip (|trade| = 1, e.g. 0/1 moving-average positions) for every
+        (day, asset): the unit cost plus the fixed cost, as a (T, N) array.
+        """
+        return np.broadcast_to(self.unit_costs(returns) + self.fixed, np.shape(returns))
+
+    def trade_costs(self, trades: np.ndarray, unit_costs: np.ndarray | float) -> np.ndarray:
+        """Cost of every trade, elementwise, for trades = position changes (same shape as returns)."""
+        traded = np.abs(trades)
+        costs = traded * unit_costs
+        if self.fixed:
+            costs += self.fixed * (traded > 0)
+        return costs
+
+    def costs(self, returns: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """Cost per (day, column) of holding positions, entering from flat on the first day."""
+        return self.trade_costs(position_changes(positions), self.unit_costs(returns))
+
+
+def position_changes(positions: np.ndarray) -> np.ndarray:
+    """Day-over-day change of a (T,) or (T, N) position array, starting from flat."""
+    positions = np.asarray(positions, dtype=float)
+    changes = np.empty_like(positions)
+    changes[0] = positions[0]
+    np.subtract(positions[1:], positions[:-1], out=changes[1:])
+    return changes
+
+
+def trailing_volatility(returns: np.ndarray, window: int) -> np.ndarray:
+    """
+    Std of each column's daily returns over the window days before every day (so no
+    look-ahead into the trading day), from running sums; 0 until two returns are available.
+    """
+    returns = np.nan_to_num(np.asarray(returns, dtype=float))
+    squeeze = returns.ndim == 1
+    if squeeze:
+        returns = returns[:, None]
+    sums = np.zeros((len(returns) + 1, returns.shape[1]))
+    squares = np.zeros_like(sums)
+    np.cumsum(returns, axis=0, out=sums[1:])
+    np.cumsum(returns * returns, axis=0, out=squares[1:])
+    ends = np.arange(len(returns))
+    starts = np.maximum(ends - window, 0)
+    n = (ends - starts)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = (sums[ends] - sums[starts]) / n
+        var = ((squares[ends] - squares[starts]) - n * mean ** 2) / (n - 1)
+    vol = np.where(n > 1, np.sqrt(np.clip(var, 0, None)), 0.0)
+    return vol[:, 0] if squeeze else vol
+
+
+def apply_costs(strategy_returns, positions, market_returns, costs: CostModel | None):
+    """
+    Strategy returns net of costs (pandas or numpy in, same type out). market_returns are the
+    asset returns the positions are held in (used for the slippage volatility).
+    """
+    if costs is None:
+        return strategy_returns
+    return strategy_returns - costs.costs(np.asarray(market_returns, dtype=float), np.asarray(positions))
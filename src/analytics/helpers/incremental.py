@@ -0,0 +1,253 @@
+"""
+Incremental (one bar at a time) versions of the formulas in returns.py and risk_metrics.py.
+
+Each state covers many tickers at once (one array entry per ticker), is updated with the
+newest row of closes, and round-trips through to_dict / from_dict (plain json types), so a
+nightly job can store it and update thousands of tickers without reloading the history.
+from_history() seeds a state from existing prices.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _row(values, n_assets: int) -> np.ndarray:
+    row = np.asarray(values, dtype=float).reshape(-1)
+    if len(row) != n_assets:
+        raise ValueError(f"Expected {n_assets} values, got {len(row)}")
+    return row
+
+
+def _columns(prices) -> list | None:
+    return list(prices.columns) if isinstance(prices, pd.DataFrame) else None
+
+
+def _as_2d(prices) -> np.ndarray:
+    values = np.asarray(prices, dtype=float)
+    return values.reshape(len(values), -1)
+
+
+class _State:
+    # attributes saved by to_dict, besides the constructor arguments
+    _arrays: tuple[str, ...] = ()
+    _scalars: tuple[str, ...] = ()
+
+    def _params(self) -> dict:
+        raise NotImplementedError
+
+    def to_dict(self) -> dict:
+        data = {"type": type(self).__name__, "columns": self.columns, "params": self._params()}
+        data.update({name: getattr(self, name).tolist() for name in self._arrays})
+        data.update({name: getattr(self, name) for name in self._scalars})
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        if data.get("type") != cls.__name__:
+            raise ValueError(f"Not a {cls.__name__}: {data.get('type')}")
+        state = cls(**data["params"], columns=data["columns"])
+        for name in cls._arrays:
+            if name in data:  # states saved by older versions keep the constructor default
+                setattr(state, name, np.array(data[name], dtype=getattr(state, name).dtype))
+        for name in cls._scalars:
+            setattr(state, name, data[name])
+        return state
+
+
+class SMAState(_State):
+    """
+    Rolling simple moving average, same values as compute_sma (NaN until the window is full
+    and while it holds a missing price). Keeps the last window closes in a ring buffer;
+    an update costs O(1) per ticker.
+    """
+
+    _arrays = ("buffer", "total", "n_missing")
+    _scalars = ("position", "count")
+
+    def __init__(self, window: int, n_assets: int, columns: list | None = None):
+        self.window = window
+        self.n_assets = n_assets
+        self.columns = columns
+        self.buffer = np.full((window, n_assets), np.nan)
+        self.total = np.zeros(n_assets)
+        self.n_missing = np.full(n_assets, window, dtype=np.int64)
+        self.position = 0
+        self.count = 0
+
+    def _params(self):
+        return {"window": self.window, "n_assets": self.n_assets}
+
+    def update(self, prices) -> np.ndarray:
+        """Add the newest closes and return the current SMA of every ticker."""
+        new = _row(prices, self.n_assets)
+        old = self.buffer[self.position]
+        old_missing, new_missing = np.isnan(old), np.isnan(new)
+        self.total += np.where(new_missing, 0.0, new) - np.where(old_missing, 0.0, old)
+        self.n_missing += new_missing.astype(np.int64) - old_missing
+        self.buffer[self.position] = new
+        self.position = (self.position + 1) % self.window
+        self.count += 1
+        if self.position == 0:
+            # resum once per window so the running total doesn't drift
+            self.total = np.where(np.isnan(self.buffer), 0.0, self.buffer).sum(axis=0)
+        return self.value
+
+    @property
+    def value(self) -> np.ndarray:
+        return np.where(self.n_missing == 0, self.total / self.window, np.nan)
+
+    @classmethod
+    def from_history(cls, prices, window: int):
+        values = _as_2d(prices)
+        state = cls(window, values.shape[1], _columns(prices))
+        for row in values[-window:]:
+            state.update(row)
+        state.count = len(values)
+        return state
+
+
+class EMAState(_State):
+    """
+    Exponential moving average with compute_ema's definition (ewm(span, adjust=False)):
+    EMA(t) = a P(t) + (1 - a) EMA(t-1), starting from the first close.
+
+    A missing close leaves the average unchanged, but like pandas (ignore_na=False) the old
+    average keeps decaying across it: after k missing closes the next one is blended as
+    (w EMA + a P) / (w + a) with w = (1 - a)^(k + 1) (pandas uses 1 - w instead of a for
+    span 3).
+    """
+
+    _arrays = ("ema", "weight")
+
+    def __init__(self, span: int, n_assets: int, columns: list | None = None):
+        self.span = span
+        self.n_assets = n_assets
+        self.columns = columns
+        self.alpha = 2 / (span + 1)
+        self.ema = np.full(n_assets, np.nan)
+        # weight of the current average, (1 - a)^(missing closes since the last one)
+        self.weight = np.ones(n_assets)
+
+    def _params(self):
+        return {"span": self.span, "n_assets": self.n_assets}
+
+    def update(self, prices) -> np.ndarray:
+        new = _row(prices, self.n_assets)
+        seen = ~np.isnan(new)
+        weight = self.weight * (1 - self.alpha)
+        # pandas gives the new close 1 - w instead of a when com == 1 (span 3)
+        new_weight = 1 - weight if self.alpha == 0.5 else self.alpha
+        blended = (weight * self.ema + new_weight * new) / (weight + new_weight)
+        self.ema = np.where(np.isnan(self.ema), new, np.where(seen, blended, self.ema))
+        self.weight = np.where(seen, 1.0, weight)
+        return self.ema
+
+    @property
+    def value(self) -> np.ndarray:
+        return self.ema
+
+    @classmethod
+    def from_history(cls, prices, span: int):
+        values = _as_2d(prices)
+        state = cls(span, values.shape[1], _columns(prices))
+        if len(values):
+            state.ema = pd.DataFrame(values).ewm(span=span, adjust=False).mean().to_numpy()[-1]
+            # closes missing at the end of the history keep decaying the average
+            trailing_missing = np.argmax(~np.isnan(values[::-1]), axis=0)
+            state.weight = (1 - state.alpha) ** trailing_missing
+        return state
+
+
+class CumulativeReturnState(_State):
+    """
+    Daily and cumulative returns with the rules of compute_daily_returns /
+    compute_cumulative_returns (a return next to a missing close counts as 0).
+    """
+
+    _arrays = ("last_price", "growth")
+
+    def __init__(self, n_assets: int, columns: list | None = None):
+        self.n_assets = n_assets
+        self.columns = columns
+        self.last_price = np.full(n_assets, np.nan)
+        self.growth = np.ones(n_assets)
+
+    def _params(self):
+        return {"n_assets": self.n_assets}
+
+    def update(self, prices) -> np.ndarray:
+        """Add the newest closes and return that day's returns."""
+        new = _row(prices, self.n_assets)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            daily = new / self.last_price - 1
+        daily[~np.isfinite(daily)] = 0.0
+        self.growth *= 1 + daily
+        self.last_price = new
+        return daily
+
+    @property
+    def value(self) -> np.ndarray:
+        """Cumulative returns since the first close."""
+        return self.growth - 1
+
+    @classmethod
+    def from_history(cls, prices):
+        values = _as_2d(prices)
+        state = cls(values.shape[1], _columns(prices))
+        if len(values):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                daily = values[1:] / values[:-1] - 1
+            daily[~np.isfinite(daily)] = 0.0
+            state.growth = np.prod(1 + daily, axis=0)
+            state.last_price = values[-1].copy()
+        return state
+
+
+class CovarianceState(_State):
+    """
+    Running mean and covariance of daily returns (Welford's update, O(n^2) per day).
+
+    Rows with a missing return are skipped, like clean_returns does; covariance() and
+    annualized() then match compute_annualized_covariance / compute_annualized_returns.
+    """
+
+    _arrays = ("mean", "m2")
+    _scalars = ("count",)
+
+    def __init__(self, n_assets: int, columns: list | None = None):
+        self.n_assets = n_assets
+        self.columns = columns
+        self.count = 0
+        self.mean = np.zeros(n_assets)
+        self.m2 = np.zeros((n_assets, n_assets))
+
+    def _params(self):
+        return {"n_assets": self.n_assets}
+
+    def update(self, returns):
+        row = _row(returns, self.n_assets)
+        if np.isnan(row).any():
+            return
+        self.count += 1
+        delta = row - self.mean
+        self.mean += delta / self.count
+        self.m2 += np.outer(delta, row - self.mean)
+
+    def covariance(self, ddof: int = 1) -> np.ndarray:
+        """Daily covariance of the returns seen so far."""
+        return self.m2 / (self.count - ddof)
+
+    def annualized(self):
+        """Annualized mean returns and covariance, as prepare_portfolio_inputs computes them."""
+        return (1 + self.mean) ** 252 - 1, self.covariance() * 252
+
+    @classmethod
+    def from_history(cls, returns):
+        values = _as_2d(returns)
+        values = values[~np.isnan(values).any(axis=1)]
+        state = cls(values.shape[1], _columns(returns))
+        state.count = len(values)
+        if len(values):
+            state.mean = values.mean(axis=0)
+            centered = values - state.mean
+            state.m2 = centered.T @ centered
+        return state
@@ -0,0 +1,284 @@
+"""
+Path-dependent loops (EMA with custom seeding, drawdown tracking, stop-loss position state
+machines) with an optional compiled backend.
+
+Each computation has a plain loop kernel written so numba can compile it, and a NumPy
+implementation used when numba isn't installed (pip install numba) or is disabled with
+$OPTIFUND_DISABLE_NUMBA. Kernels are compiled on first use, not at import, and numba keeps
+the compiled code in default_cache_dir()/numba (or $NUMBA_CACHE_DIR), so later processes
+load it from disk instead of compiling again.
+"""
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from src.data.price_cache import default_cache_dir
+from src.instrumentation import get_logger
+
+logger = get_logger(__name__)
+
+EMA_SEEDS = ("first", "sma")
+
+
+def numba_available() -> bool:
+    """True when the compiled backend will be used."""
+    if os.environ.get("OPTIFUND_DISABLE_NUMBA", "") not in ("", "0"):
+        return False
+    return _import_numba() is not None
+
+
+def ema(values, span: int, seed: str = "first", backend: str | None = None):
+    """
+    Exponential moving average EMA(t) = a x(t) + (1 - a) EMA(t-1), a = 2 / (span + 1), of
+    every column.
+
+    Args:
+        values: Series, DataFrame or array of shape (T,) or (T, N).
+        span: EMA span.
+        seed: "first" starts from the first value (compute_ema, pandas adjust=False);
+            "sma" starts from the mean of the first span values and is NaN before them
+            (the usual charting convention).
+        backend: "numba" or "numpy" (defaults to numba when available).
+
+    Missing values keep decaying the previous EMA, so the first value after k missing ones
+    gets the weight it would have had without the gap (pandas' default ignore_na=False, as in
+    compute_ema); leading missing values delay the seed.
+
+    Returns:
+        same type and shape as values.
+    """
+    if seed not in EMA_SEEDS:
+        raise ValueError(f"Unknown EMA seed: {seed}")
+    array, wrap = _as_2d(values)
+    alpha = 2 / (span + 1)
+    if _use_numba(backend):
+        out = _compiled("ema")(array, alpha, span, seed == "sma")
+    else:
+        out = _ema_numpy(array, alpha, span, seed == "sma")
+    return wrap(out)
+
+
+def drawdown(wealth, initial: float | None = None, backend: str | None = None):
+    """
+    Drawdown from the running peak of every column, wealth / peak - 1 (<= 0).
+
+    Args:
+        wealth: wealth curves (Series, DataFrame or array).
+        initial: starting capital counted as the first peak (None: the first value).
+        backend: "numba" or "numpy".
+
+    Returns:
+        same type and shape as wealth.
+    """
+    array, wrap = _as_2d(wealth)
+    start = np.nan if initial is None else float(initial)
+    if _use_numba(backend):
+        out = _compiled("drawdown")(array, start)
+    else:
+        peaks = np.fmax.accumulate(array, axis=0)
+        if initial is not None:
+            np.fmax(peaks, initial, out=peaks)
+        out = array / peaks - 1
+    return wrap(out)
+
+
+def stop_loss_positions(prices, average, stop_loss: float | None = None, trailing: bool = False,
+                        backend: str | None = None):
+    """
+    Next-day 0/1 positions of the moving-average rule with a stop-loss.
+
+    Without a stop this is build_positions(generate_signals(prices, average)). With one, a
+    position is also closed once the close falls stop_loss below the entry price (or below
+    the highest close since entry when trailing), and the strategy stays flat until the
+    price has been back below the average, i.e. it waits for a fresh crossover to re-enter.
+    Entries and exits are decided at the close and acted on the next session.
+
+    Args:
+        prices: close prices (Series, DataFrame or array).
+        average: moving average of the same shape (e.g. compute_sma / compute_ema).
+        stop_loss: fractional stop, e.g. 0.1 for 10% (None: no stop).
+        trailing: measure the stop from the highest close since entry.
+        backend: "numba" or "numpy".
+
+    Returns:
+        positions of the same type and shape as prices (float 0/1).
+    """
+    array, wrap = _as_2d(prices)
+    average = np.asarray(average, dtype=float).reshape(array.shape)
+    stop = 1.0 if stop_loss is None else float(stop_loss)  # a 100% stop never triggers
+    if _use_numba(backend):
+        out = _compiled("stop_loss")(array, average, stop, trailing)
+    else:
+        out = _stop_loss_numpy(array, average, stop, trailing)
+    return wrap(out)
+
+
+# -- loop kernels (compiled by numba, or run as plain Python in the parity tests) --
+
+def _ema_kernel(values, alpha, span, sma_seed):
+    n_rows, n_cols = values.shape
+    out = np.empty((n_rows, n_cols))
+    for j in range(n_cols):
+        state = np.nan
+        old = 1.0  # weight left on the EMA, (1 - a)^k after k missing values
+        seen = 0
+        total = 0.0
+        for t in range(n_rows):
+            x = values[t, j]
+            if x == x:
+                if state == state:
+                    old *= 1 - alpha
+                    # pandas gives the new value 1 - old instead of a when com == 1 (span 3)
+                    new = 1 - old if alpha == 0.5 else alpha
+                    state = (old * state + new * x) / (old + new)
+                    old = 1.0
+                elif not sma_seed:
+                    state = x
+                else:
+                    seen += 1
+                    total += x
+                    if seen == span:
+                        state = total / span
+            elif state == state:
+                old *= 1 - alpha
+            out[t, j] = state
+    return out
+
+
+def _drawdown_kernel(wealth, initial):
+    n_rows, n_cols = wealth.shape
+    out = np.empty((n_rows, n_cols))
+    for j in range(n_cols):
+        peak = initial
+        for t in range(n_rows):
+            x = wealth[t, j]
+            if x > peak or peak != peak:
+                peak = x
+            out[t, j] = x / peak - 1
+    return out
+
+
+def _stop_loss_kernel(prices, average, stop, trailing):
+    n_rows, n_cols = prices.shape
+    out = np.zeros((n_rows, n_cols))
+    for j in range(n_cols):
+        held = False
+        armed = True  # False after a stop until the price is back below the average
+        reference = 0.0
+        for t in range(n_rows - 1):
+            price = prices[t, j]
+            above = price > average[t, j]
+            if held:
+                if trailing and price > reference:
+                    reference = price
+                if not above:
+                    held = False
+                elif price <= reference * (1 - stop):
+                    held = False
+                    armed = False
+            elif above and armed:
+                held = True
+                reference = price
+            if not above:
+                armed = True
+            out[t + 1, j] = 1.0 if held else 0.0
+    return out
+
+
+# -- NumPy implementations --
+
+def _ema_numpy(values, alpha, span, sma_seed):
+    if not np.isnan(values).any():
+        from scipy.signal import lfilter
+
+        start = span - 1 if sma_seed else 0
+        out = np.full(values.shape, np.nan)
+        if start >= len(values):
+            return out
+        seed = values[:span].mean(axis=0) if sma_seed else values[0]
+        out[start] = seed
+        if start + 1 < len(values):
+            out[start + 1:], _ = lfilter([alpha], [1, alpha - 1], values[start + 1:], axis=0,
+                                         zi=(1 - alpha) * seed[None, :])
+        return out
+    # missing values: each column from its own seed, through pandas' EMA decaying across gaps
+    frame = pd.DataFrame(values)
+    if not sma_seed:
+        return frame.ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    out = np.full(values.shape, np.nan)
+    for j in range(values.shape[1]):
+        valid = np.flatnonzero(~np.isnan(values[:, j]))
+        if len(valid) < span:
+            continue
+        seeded = values[valid[span - 1]:, j].copy()
+        seeded[0] = values[valid[:span], j].mean()
+        out[valid[span - 1]:, j] = pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean()
+    return out
+
+
+def _stop_loss_numpy(prices, average, stop, trailing):
+    # loops over dates only; every step updates all columns at once
+    n_rows, n_cols = prices.shape
+    out = np.zeros((n_rows, n_cols))
+    above = prices > average
+    held = np.zeros(n_cols, dtype=bool)
+    armed = np.ones(n_cols, dtype=bool)
+    reference = np.zeros(n_cols)
+    for t in range(n_rows - 1):
+        price = prices[t]
+        if trailing:
+            np.maximum(reference, np.where(held, price, reference), out=reference)
+        stopped = held & above[t] & (price <= reference * (1 - stop))
+        held &= above[t] & ~stopped
+        armed &= ~stopped
+        enter = ~held & above[t] & armed & ~stopped
+        reference = np.where(enter, price, reference)
+        held |= enter
+        armed |= ~above[t]
+        out[t + 1] = held
+    return out
+
+
+_KERNELS = {"ema": _ema_kernel, "drawdown": _drawdown_kernel, "stop_loss": _stop_loss_kernel}
+
+
+@lru_cache(maxsize=None)
+def _import_numba():
+    os.environ.setdefault("NUMBA_CACHE_DIR", str(default_cache_dir() / "numba"))
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba
+
+
+@lru_cache(maxsize=None)
+def _compiled(name: str):
+    logger.debug("compiling kernel %s", name)
+    return _import_numba().njit(cache=True)(_KERNELS[name])
+
+
+def _use_numba(backend: str | None) -> bool:
+    if backend is None:
+        return numba_available()
+    if backend == "numba":
+        if _import_numba() is None:
+            raise ImportError("The numba backend needs numba (pip install numba)")
+        return True
+    if backend == "numpy":
+        return False
+    raise ValueError(f"Unknown kernel backend: {backend}")
+
+
+def _as_2d(data):
+    """(T, N) float array of data and a function putting a result back into data's type."""
+    if isinstance(data, pd.Series):
+        return data.to_numpy(dtype=float)[:, None], lambda out: pd.Series(out[:, 0], index=data.index, name=data.name)
+    if isinstance(data, pd.DataFrame):
+        return data.to_numpy(dtype=float), lambda out: pd.DataFrame(out, index=data.index, columns=data.columns)
+    array = np.asarray(data, dtype=float)
+    if array.ndim == 1:
+        return array[:, None], lambda out: out[:, 0]
+    return array, lambda out: out
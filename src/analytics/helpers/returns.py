@@ -1,6 +1,6 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 from src.data.fetch_data import get_close_prices
+from src.data.panel import PricePanel
 
 
 
@@ -9,11 +9,13 @@ def compute_daily_returns(prices):
     Compute daily returns from a Pandas Series of prices.
 
     Params:
-        prices : Pandas series or dataframe of daily stock prices indexed by date
+        prices : Pandas series or dataframe (or PricePanel) of daily stock prices indexed by date
 
     Returns:
          Daily returns as percentages (e.g., 0.02 = 2%) for each stock
     """
+    if isinstance(prices, PricePanel):
+        return pd.DataFrame(prices.daily_returns(), index=prices.dates, columns=prices.tickers, copy=False)
 
     returns = prices.pct_change()
 
@@ -70,6 +72,8 @@ def get_company_returns(ticker: str ="AAPL"):
 
 
 def compute_sma(prices: pd.Series, window: int) -> pd.Series:
+    if isinstance(prices, PricePanel):
+        prices = prices.to_frame()
     # using the rolling method on series to get a rolling object, which then allows us to
     # compute a moving average as we extract the mean of each value using the window
 
@@ -99,6 +103,8 @@ def compute_ema(prices, span):
         # , so I can then call .mean() (for ema), to then do the operation we describe on top
 
 
+    if isinstance(prices, PricePanel):
+        prices = prices.to_frame()
     return prices.ewm(span=span, adjust=False).mean()
 
 def compute_annualized_returns(daily_returns):
@@ -113,6 +119,8 @@ def plot_MAs(prices, sma, ema, ticker):
     """
     Plot stock prices with SMA and EMA
     """
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10,6))
     plt.plot(prices, label=f"{ticker} Price", linewidth=2)
     plt.plot(sma, label="SMA", linestyle = "--")
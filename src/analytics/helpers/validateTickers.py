@@ -1,11 +1,112 @@
-import pandas as pd
-import yfinance as yf
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
+from src.data.price_cache import default_cache_dir
+
+TICKER_CACHE_TTL = 24 * 3600
+
+
+class TickerCache:
+    """
+    Validation results with a time-to-live, kept in memory and mirrored to a json file.
+
+    Args:
+        path: json file backing the cache (None keeps it in memory only).
+        ttl: seconds a result stays valid.
+    """
+
+    def __init__(self, path: str | Path | None = None, ttl: float = TICKER_CACHE_TTL):
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self._entries: dict[str, tuple[bool, float]] = {}
+        if self.path and self.path.exists():
+            with open(self.path) as f:
+                self._entries = {t: (v, ts) for t, (v, ts) in json.load(f).items()}
+
+    def get(self, ticker: str, now: float | None = None) -> bool | None:
+        """Cached result for ticker, or None if unknown or expired."""
+        entry = self._entries.get(ticker)
+        if entry is None:
+            return None
+        valid, checked_at = entry
+        if (now or time.time()) - checked_at > self.ttl:
+            return None
+        return valid
+
+    def update(self, results: dict[str, bool], now: float | None = None):
+        checked_at = now or time.time()
+        self._entries.update({t: (v, checked_at) for t, v in results.items()})
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.path)
+
+
+_ticker_cache: TickerCache | None = None
+
+
+def get_ticker_cache() -> TickerCache:
+    """Process-wide validation cache, stored next to the price cache."""
+    global _ticker_cache
+    if _ticker_cache is None:
+        _ticker_cache = TickerCache(default_cache_dir() / "tickers.json")
+    return _ticker_cache
 
-def validateTicker(ticker: str) -> bool:
-    try:
-        info = yf.Ticker(ticker).info
 
-        return info.get("currency") == "USD"
-    except Exception:
-        return False
+def check_ticker(ticker: str) -> bool:
+    """Ask yfinance whether ticker is a USD traded asset. Network errors are raised."""
+    import yfinance as yf
+
+    info = yf.Ticker(ticker).info
+    return info.get("currency") == "USD"
+
+
+def validate_tickers(
+    tickers: list[str],
+    max_workers: int = 8,
+    cache: TickerCache | None = None,
+    check=check_ticker,
+) -> dict[str, bool]:
+    """
+    Validate many tickers at once.
+
+    Cached results are reused until they expire; the rest are checked concurrently on a
+    thread pool (the yfinance lookups are network bound). Lookups that fail with an error
+    count as invalid but are not cached, so they are retried next time.
+
+    Args:
+        tickers: tickers to validate (case-insensitive).
+        max_workers: maximum number of concurrent lookups.
+        cache: TickerCache to use (defaults to the process-wide one).
+        check: callable ticker -> bool doing the actual lookup.
+
+    Returns:
+        dict mapping each (upper-cased) ticker to True if it is a USD traded asset.
+    """
+    cache = cache or get_ticker_cache()
+    tickers = list(dict.fromkeys(t.upper().strip() for t in tickers))
+    results = {t: cache.get(t) for t in tickers}
+    missing = [t for t, valid in results.items() if valid is None]
+
+    if missing:
+        def safe_check(ticker):
+            try:
+                return bool(check(ticker))
+            except Exception:
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as pool:
+            checked = dict(zip(missing, pool.map(safe_check, missing)))
+        cache.update({t: v for t, v in checked.items() if v is not None})
+        results.update({t: bool(v) for t, v in checked.items()})
+
+    return results
+
+
+def validateTicker(ticker: str) -> bool:
+    return validate_tickers([ticker])[ticker.upper().strip()]
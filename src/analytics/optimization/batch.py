@@ -0,0 +1,173 @@
+"""
+Optimize many portfolios that share holdings with a single price fetch.
+
+The union of every spec's tickers is downloaded once, mu and the covariance are estimated once
+on that shared panel, and each spec is solved on its sub-vector / sub-matrix, optionally on a
+pool of worker processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.optimization.markowitz import (
+    compute_min_var_portfolio,
+    maximize_sharpe_ratio,
+    portfolio_stats,
+)
+from src.data.panel import PricePanel
+from src.instrumentation import get_logger, timed_stage
+
+logger = get_logger(__name__)
+
+OBJECTIVES = ("max_sharpe", "min_var")
+
+
+@dataclass
+class PortfolioSpec:
+    """
+    One portfolio to optimize.
+
+    Attributes:
+        name: label of the portfolio (e.g. a client id), unique within a batch.
+        tickers: holdings to allocate between (case-insensitive).
+        objective: "max_sharpe" or "min_var".
+        rf: annual risk-free rate.
+        allow_short: allow negative weights.
+    """
+
+    name: str
+    tickers: list[str]
+    objective: str = "max_sharpe"
+    rf: float = 0.03
+    allow_short: bool = False
+
+    def __post_init__(self):
+        if self.objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {self.objective}")
+        self.tickers = list(dict.fromkeys(t.upper().strip() for t in self.tickers))
+
+
+@dataclass
+class PortfolioResult:
+    """
+    Outcome of one spec.
+
+    Attributes:
+        spec: the spec that was solved.
+        weights: weight per ticker (None if the spec failed).
+        stats: portfolio_stats of the weights ("Return", "Risk", "Sharpe Ratio").
+        error: why the spec couldn't be solved, e.g. tickers without price data.
+    """
+
+    spec: PortfolioSpec
+    weights: pd.Series | None = None
+    stats: dict = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@timed_stage()
+def optimize_portfolios(
+    specs: list[PortfolioSpec],
+    start: str | None = None,
+    end: str | None = None,
+    period: str = "5y",
+    prices: pd.DataFrame | PricePanel | None = None,
+    n_jobs: int | None = None,
+) -> list[PortfolioResult]:
+    """
+    Optimize every spec against one shared estimate of mu and the covariance.
+
+    Each pair of tickers is estimated over the days both have prices, so a spec whose holdings
+    share the same history gets exactly the inputs run_optimization would compute for it alone,
+    regardless of the other tickers in the batch.
+
+    Args:
+        specs: portfolios to optimize.
+        start/end: date range of the price history (see get_close_prices).
+        period: history to fetch when no start/end is given.
+        prices: close prices of (at least) the union of the tickers, instead of fetching them.
+        n_jobs: solve the specs on this many worker processes (None or 1 solves in-process).
+
+    Returns:
+        one PortfolioResult per spec, in the order of specs. A spec that can't be solved has
+        its error set instead of failing the whole batch.
+    """
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError("Portfolio spec names must be unique")
+    universe = list(dict.fromkeys(t for spec in specs for t in spec.tickers))
+
+    if prices is None:
+        from src.data.fetch_data import get_close_prices
+        prices = (
+            get_close_prices(universe, start=start, end=end)
+            if (start or end)
+            else get_close_prices(universe, period=period)
+        )
+    elif isinstance(prices, PricePanel):
+        prices = prices.to_frame()
+    mu, cov = shared_inputs(prices)
+    logger.debug("optimizing %d portfolios over %d tickers", len(specs), len(universe))
+
+    results, jobs = [None] * len(specs), []
+    for i, spec in enumerate(specs):
+        missing = [t for t in spec.tickers if t not in mu.index or np.isnan(mu[t])]
+        if missing:
+            results[i] = PortfolioResult(spec, error=f"No price data for {', '.join(missing)}")
+            continue
+        sub_cov = cov.loc[spec.tickers, spec.tickers]
+        # tickers whose histories never overlap have no pairwise covariance
+        unpaired = [t for t in spec.tickers if sub_cov[t].isna().any()]
+        if unpaired:
+            results[i] = PortfolioResult(spec, error=f"No overlapping history for {', '.join(unpaired)}")
+            continue
+        jobs.append((i, spec, mu[spec.tickers].to_numpy(), sub_cov.to_numpy()))
+
+    args = ([job[1] for job in jobs], [job[2] for job in jobs], [job[3] for job in jobs])
+    if n_jobs and n_jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            solved = list(pool.map(_solve_spec, *args, chunksize=max(1, len(jobs) // (4 * n_jobs))))
+    else:
+        solved = list(map(_solve_spec, *args))
+    for (i, spec, _, _), result in zip(jobs, solved):
+        results[i] = result
+    return results
+
+
+def shared_inputs(prices: pd.DataFrame) -> tuple[pd.Series, pd.DataFrame]:
+    """
+    Annualized mu and covariance of every column, each pair over the days both have returns
+    (prepare_portfolio_inputs drops every day on which any ticker is missing instead).
+    """
+    returns = prices.pct_change().iloc[1:]
+    returns.columns = [str(c).upper() for c in returns.columns]
+    mu = (1 + returns.mean()) ** 252 - 1
+    cov = returns.cov() * 252
+    return mu, cov
+
+
+def results_frame(results: list[PortfolioResult]) -> pd.DataFrame:
+    """One row per portfolio with its objective, stats and error, for reports."""
+    return pd.DataFrame(
+        [{"objective": r.spec.objective, "n_assets": len(r.spec.tickers), **r.stats, "error": r.error}
+         for r in results],
+        index=pd.Index([r.spec.name for r in results], name="portfolio"),
+    )
+
+
+def _solve_spec(spec: PortfolioSpec, mu: np.ndarray, cov: np.ndarray) -> PortfolioResult:
+    try:
+        if spec.objective == "min_var":
+            weights = compute_min_var_portfolio(mu, cov, spec.rf, allow_short=spec.allow_short)
+        else:
+            weights = maximize_sharpe_ratio(mu, cov, spec.rf, allow_short=spec.allow_short)
+    except Exception as e:
+        return PortfolioResult(spec, error=f"{type(e).__name__}: {e}")
+    weights = np.asarray(weights, dtype=float)
+    return PortfolioResult(spec, pd.Series(weights, index=spec.tickers), portfolio_stats(weights, mu, cov))
@@ -0,0 +1,462 @@
+import numpy as np
+import pandas as pd
+
+from src.instrumentation import timed_stage
+
+# a bound asset whose variance is unexplained by the free assets below this fraction is
+# treated as spanned by them and never freed
+SPANNED_TOL = 1e-10
+
+
+class EfficientFrontier:
+    """
+    Exact long-only efficient frontier computed with the Critical Line Algorithm.
+
+    The frontier is piecewise: between two adjacent corner portfolios the optimal weights
+    move linearly with the target return. Once the corners are known, any point on the
+    frontier is an interpolation between two of them, so queries cost O(n) instead of a
+    new optimization.
+
+    Args:
+        mu: expected returns (length n)
+        cov: covariance matrix (n x n)
+        lower: lower weight bound per asset (scalar or array, default 0)
+        upper: upper weight bound per asset (scalar or array, default 1)
+
+    Attributes:
+        weights: (k, n) corner portfolio weights, from highest return to minimum variance
+        returns: (k,) expected return of each corner
+        risks: (k,) standard deviation of each corner
+        lambdas: (k,) risk-aversion multipliers at each corner
+    """
+
+    def __init__(self, mu, cov, lower=0.0, upper=1.0):
+        self.assets = list(mu.index) if isinstance(mu, pd.Series) else None
+        self.mu = np.asarray(mu, dtype=float)
+        self.cov = np.asarray(cov, dtype=float)
+        n = len(self.mu)
+        self.lower = np.broadcast_to(np.asarray(lower, dtype=float), (n,)).copy()
+        self.upper = np.broadcast_to(np.asarray(upper, dtype=float), (n,)).copy()
+        if self.lower.sum() > 1 or self.upper.sum() < 1:
+            raise ValueError("Weight bounds admit no fully invested portfolio")
+
+        weights, lambdas = critical_line_algorithm(self.mu, self.cov, self.lower, self.upper)
+        self.weights = weights
+        self.lambdas = lambdas
+        self.returns = weights @ self.mu
+        self.risks = np.sqrt(np.einsum("ij,jk,ik->i", weights, self.cov, weights))
+
+        # per segment k: w(t) = w_k + t * dw_k, var(t) = c + b t + a t^2 for t in [0, 1]
+        self._dw = np.diff(weights, axis=0)
+        cov_w = weights[:-1] @ self.cov
+        self._var_c = self.risks[:-1] ** 2
+        self._var_b = 2 * np.einsum("ij,ij->i", cov_w, self._dw)
+        self._var_a = np.einsum("ij,jk,ik->i", self._dw, self.cov, self._dw)
+
+    def min_variance(self) -> np.ndarray:
+        """Weights of the minimum-variance corner."""
+        return self.weights[-1].copy()
+
+    def weights_for_return(self, target: float) -> np.ndarray:
+        """
+        Frontier weights with the given expected return (clipped to the attainable range).
+        """
+        # returns decrease along the corners; search on the reversed, increasing array
+        rets = self.returns[::-1]
+        target = float(np.clip(target, rets[0], rets[-1]))
+        if len(rets) == 1:
+            return self.weights[0].copy()
+        idx = len(rets) - 1 - np.searchsorted(rets, target)
+        k = int(np.clip(idx, 0, len(self._dw) - 1))
+        span = self.returns[k + 1] - self.returns[k]
+        t = 0.0 if span == 0 else (target - self.returns[k]) / span
+        return self.weights[k] + np.clip(t, 0, 1) * self._dw[k]
+
+    def weights_for_risk(self, target: float) -> np.ndarray:
+        """
+        Highest-return frontier weights with the given standard deviation
+        (clipped to the attainable range).
+        """
+        risks = self.risks[::-1]
+        target = float(np.clip(target, risks[0], risks[-1]))
+        if len(risks) == 1:
+            return self.weights[0].copy()
+        idx = len(risks) - 1 - np.searchsorted(risks, target)
+        k = int(np.clip(idx, 0, len(self._dw) - 1))
+        a, b, c = self._var_a[k], self._var_b[k], self._var_c[k] - target**2
+        if abs(a) < 1e-18:
+            t = 0.0 if b == 0 else -c / b
+        else:
+            disc = max(b * b - 4 * a * c, 0.0)
+            roots = np.array([(-b - np.sqrt(disc)) / (2 * a), (-b + np.sqrt(disc)) / (2 * a)])
+            inside = roots[(roots >= -1e-9) & (roots <= 1 + 1e-9)]
+            t = inside.min() if len(inside) else roots[np.argmin(np.abs(roots - 0.5))]
+        return self.weights[k] + np.clip(t, 0, 1) * self._dw[k]
+
+    def max_sharpe(self, rf: float = 0.02) -> np.ndarray:
+        """
+        Maximum-Sharpe weights on the frontier.
+
+        Along each segment the Sharpe ratio (p + q t) / sqrt(a t^2 + b t + c) has a single
+        stationary point, so every segment is checked in O(1).
+        """
+        best_w, best_sharpe = self.weights[0], -np.inf
+        for k in range(len(self.weights)):
+            sharpe = (self.returns[k] - rf) / self.risks[k]
+            if sharpe > best_sharpe:
+                best_w, best_sharpe = self.weights[k], sharpe
+        for k in range(len(self._dw)):
+            p = self.returns[k] - rf
+            q = self.returns[k + 1] - self.returns[k]
+            a, b, c = self._var_a[k], self._var_b[k], self._var_c[k]
+            denom = q * b / 2 - p * a
+            if denom == 0:
+                continue
+            t = (p * b / 2 - q * c) / denom
+            if 0 < t < 1:
+                sharpe = (p + q * t) / np.sqrt(a * t * t + b * t + c)
+                if sharpe > best_sharpe:
+                    best_w, best_sharpe = self.weights[k] + t * self._dw[k], sharpe
+        return np.array(best_w, copy=True)
+
+    def curve(self, points_per_segment: int = 20) -> pd.DataFrame:
+        """
+        Sample the frontier for plotting.
+
+        Returns:
+            DataFrame with "risk" and "ret" columns, ordered from minimum variance upwards
+        """
+        t = np.linspace(0, 1, points_per_segment, endpoint=False)
+        risks, rets = [], []
+        for k in range(len(self._dw)):
+            rets.append(self.returns[k] + t * (self.returns[k + 1] - self.returns[k]))
+            risks.append(np.sqrt(np.maximum(self._var_c[k] + self._var_b[k] * t + self._var_a[k] * t**2, 0)))
+        rets.append(self.returns[-1:])
+        risks.append(self.risks[-1:])
+        frame = pd.DataFrame({"risk": np.concatenate(risks), "ret": np.concatenate(rets)})
+        return frame.iloc[::-1].reset_index(drop=True)
+
+    def corners(self) -> pd.DataFrame:
+        """Corner portfolios as a DataFrame (one row per corner, plus return/risk/lambda columns)."""
+        frame = pd.DataFrame(self.weights, columns=self.assets)
+        frame["ret"] = self.returns
+        frame["risk"] = self.risks
+        frame["lambda"] = self.lambdas
+        return frame
+
+
+@timed_stage()
+def critical_line_algorithm(mu, cov, lower, upper, tol=1e-10):
+    """
+    Markowitz' Critical Line Algorithm for
+        min w' cov w - lambda mu' w   s.t.  sum(w) = 1,  lower <= w <= upper
+    over all lambda >= 0.
+
+    Starting from the highest-return portfolio, each step either pins a free weight to one of its
+    bounds or frees a bound weight, whichever happens first as lambda decreases, until lambda
+    reaches 0 (the minimum-variance portfolio). The free block of the covariance is solved
+    afresh at every corner, and a bound asset that the free assets already span (e.g. a second
+    share class of a free one) is never freed, since the free block would become singular.
+
+    Args:
+        mu: expected returns
+        cov: covariance matrix
+        lower: lower bounds per asset
+        upper: upper bounds per asset
+        tol: tolerance used to discard duplicate and inefficient corners
+
+    Returns:
+        (weights, lambdas): (k, n) corner weights from highest return to minimum variance and
+        the (k,) lambda at each corner (inf for the first one)
+
+    Raises:
+        np.linalg.LinAlgError: a corner came out infeasible because the covariance is too
+            ill-conditioned for the algorithm; use the QP optimizers instead.
+    """
+    n = len(mu)
+    free, w = _starting_portfolio(mu, cov, lower, upper)
+    corners = [w.copy()]
+    lambdas = [np.inf]
+    bound_idx = np.array(_bound(free, n), dtype=int)
+    inv_ones, inv_mu, u = _solve_free(cov, mu, free, bound_idx)
+    pinned = []  # weights pinned back at the current lambda
+
+    while True:
+        w_b = w[bound_idx] if len(bound_idx) else None
+        inv_b = u @ w_b if len(bound_idx) else None
+        # events must happen strictly below the current lambda, otherwise round-off can
+        # free a weight that was just bound (or the reverse) and cycle forever
+        ceiling = lambdas[-1] - 1e-9 * max(1.0, abs(lambdas[-1])) if np.isfinite(lambdas[-1]) else np.inf
+
+        # a) bound one of the free weights
+        lambda_in, i_in, bound_in = None, None, None
+        if len(free) > 1:
+            lams, bounds = _lambdas_to_bound(inv_ones, inv_mu, inv_b, w_b, lower[free], upper[free])
+            # a weight sitting on the bound it moves towards, e.g. the near-copy of an asset that
+            # was just bound, leaves at this very lambda: pin it without adding a corner
+            stuck = np.isfinite(lams) & (lams >= ceiling) & (np.abs(w[free] - bounds) <= 1e-9)
+            if stuck.any():
+                j = int(np.argmax(np.where(stuck, lams, -np.inf)))
+                w[free[j]] = bounds[j]
+                pinned.append(free[j])
+                free.remove(free[j])
+                bound_idx = np.array(_bound(free, n), dtype=int)
+                inv_ones, inv_mu, u = _solve_free(cov, mu, free, bound_idx)
+                continue
+            lams = np.where(np.isfinite(lams) & (lams < ceiling), lams, -np.inf)
+            if np.isfinite(lams).any():
+                j = int(np.argmax(lams))
+                lambda_in, i_in, bound_in = lams[j], free[j], bounds[j]
+
+        # b) free one of the bound weights
+        lambda_out, i_out = None, None
+        if len(bound_idx):
+            lams = _lambdas_to_free(cov, mu, w, free, bound_idx, inv_ones, inv_mu, u)
+            ok = lams < ceiling
+            if pinned:
+                # the exact copy of a pinned weight enters where the pinned one left, so after
+                # a pin the other bound weights may also move at this lambda (never the pinned ones)
+                now = lambdas[-1] + 1e-9 * max(1.0, abs(lambdas[-1]))
+                ok |= (lams <= now) & ~np.isin(bound_idx, pinned)
+            lams = np.where(np.isfinite(lams) & ok, lams, -np.inf)
+            if np.isfinite(lams).any():
+                j = int(np.argmax(lams))
+                lambda_out, i_out = lams[j], int(bound_idx[j])
+
+        if (lambda_in is None or lambda_in < 0) and (lambda_out is None or lambda_out < 0):
+            # c) no more events before lambda = 0: finish at the minimum-variance portfolio
+            lambdas.append(0.0)
+        else:
+            if lambda_out is None or (lambda_in is not None and lambda_in > lambda_out):
+                lambdas.append(float(lambda_in))
+                free.remove(i_in)
+                w[i_in] = bound_in
+            else:
+                lambdas.append(float(lambda_out))
+                free.append(i_out)
+            if lambdas[-1] < lambdas[-2] - 1e-9 * max(1.0, abs(lambdas[-2])):
+                pinned = []
+            bound_idx = np.array(_bound(free, n), dtype=int)
+            inv_ones, inv_mu, u = _solve_free(cov, mu, free, bound_idx)
+            w_b = w[bound_idx] if len(bound_idx) else None
+            inv_b = u @ w_b if len(bound_idx) else None
+
+        w[free] = _free_weights(inv_ones, inv_mu, inv_b, w_b, lambdas[-1])
+        corners.append(w.copy())
+        if lambdas[-1] == 0:
+            break
+
+    weights, lambdas = np.array(corners), np.array(lambdas)
+    feasible = (
+        (np.abs(weights.sum(axis=1) - 1) <= 1e-6)
+        & np.all(weights >= lower - 1e-6, axis=1)
+        & np.all(weights <= upper + 1e-6, axis=1)
+    )
+    if not feasible.all():
+        raise np.linalg.LinAlgError(
+            f"Critical Line Algorithm produced {np.count_nonzero(~feasible)} infeasible corner(s); "
+            "the covariance matrix is too ill-conditioned"
+        )
+    # round-off on nearly collinear assets can leave weights a hair outside their bounds
+    weights = np.clip(weights, lower, upper)
+
+    # drop corners on the inefficient part (return below a later, lower-risk corner)
+    rets = weights @ mu
+    later_max = np.maximum.accumulate(rets[::-1])[::-1]
+    keep = np.append(rets[:-1] >= later_max[1:] - tol, True)
+    weights, lambdas = weights[keep], lambdas[keep]
+
+    # consecutive duplicate corners (same weights) add nothing to the curve
+    distinct = np.append(True, np.abs(np.diff(weights, axis=0)).max(axis=1) > tol)
+    return weights[distinct], lambdas[distinct]
+
+
+def _starting_portfolio(mu, cov, lower, upper):
+    """
+    Fill the highest-return assets up to their upper bound until the budget is spent.
+
+    Assets tied at the return where the budget runs out share what is left by their
+    minimum-variance mix (the limit of the frontier as lambda -> inf), and the ones strictly
+    inside their bounds start free. A tied asset the others already span stays at its lower
+    bound so the free block isn't singular.
+    """
+    order = np.argsort(mu, kind="stable")
+    w = lower.copy()
+    i = len(order)
+    while w.sum() < 1:
+        i -= 1
+        w[order[i]] = upper[order[i]]
+    marginal = int(order[i])
+    tied = np.flatnonzero(mu == mu[marginal])
+    if len(tied) == 1:
+        w[marginal] += 1 - w.sum()
+        return [marginal], w
+
+    w[tied] = lower[tied]
+    budget = 1 - w.sum()
+    kept = _unspanned(cov, tied)
+    if (upper[kept] - lower[kept]).sum() < budget:
+        kept = tied
+    rest = np.setdiff1d(np.arange(len(mu)), kept)
+    w[kept] = _box_min_variance(cov[np.ix_(kept, kept)], cov[np.ix_(kept, rest)] @ w[rest], budget,
+                                lower[kept], upper[kept])
+    inside = np.minimum(w[kept] - lower[kept], upper[kept] - w[kept])
+    free = [int(j) for j in kept[inside > 1e-12]] or [int(kept[np.argmax(inside)])]
+    return free, w
+
+
+def _unspanned(cov, candidates):
+    """The candidates, without those (numerically) spanned by the ones kept before them."""
+    kept = [candidates[0]]
+    for j in candidates[1:]:
+        s = cov[kept, j]
+        e = cov[j, j] - s @ np.linalg.lstsq(cov[np.ix_(kept, kept)], s, rcond=None)[0]
+        if e > SPANNED_TOL * cov[j, j]:
+            kept.append(j)
+    return np.array(kept, dtype=int)
+
+
+def _box_min_variance(Q, c, budget, lower, upper, max_iter=1000):
+    """
+    min 1/2 x' Q x + c' x  s.t.  sum(x) = budget,  lower <= x <= upper, with a primal
+    active-set method (used on the few assets tied for the highest return).
+    """
+    m = len(c)
+    x = lower.copy()
+    for j in range(m):
+        x[j] += min(upper[j] - lower[j], budget - x.sum())
+    # -1: at the lower bound, 1: at the upper bound, 0: free
+    state = np.where(x >= upper, 1, -1)
+    state[np.argmax(np.minimum(x - lower, upper - x))] = 0
+
+    for _ in range(max_iter):
+        free, fixed = np.flatnonzero(state == 0), np.flatnonzero(state != 0)
+        k = len(free)
+        kkt = np.zeros((k + 1, k + 1))
+        kkt[:k, :k] = Q[np.ix_(free, free)]
+        kkt[:k, k] = kkt[k, :k] = 1
+        rhs = np.append(-c[free] - Q[np.ix_(free, fixed)] @ x[fixed], budget - x[fixed].sum())
+        target = np.linalg.lstsq(kkt, rhs, rcond=None)[0][:k]
+        step = target - x[free]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            room = np.where(step < 0, (lower[free] - x[free]) / step, (upper[free] - x[free]) / step)
+        room = np.where(np.abs(step) > 1e-14 * max(1.0, abs(budget)), room, np.inf)
+        alpha = min(1.0, room.min())
+        x[free] += alpha * step
+        if alpha < 1:
+            j = free[np.argmin(room)]
+            state[j] = -1 if step[np.argmin(room)] < 0 else 1
+            x[j] = lower[j] if state[j] < 0 else upper[j]
+            continue
+        # optimal on the free set; release the bound asset whose multiplier has the wrong sign
+        grad = Q @ x + c
+        nu = grad[free].mean()
+        violation = np.where(state < 0, nu - grad, np.where(state > 0, grad - nu, 0.0))
+        j = int(np.argmax(violation))
+        if violation[j] <= 1e-12 * max(1.0, np.abs(grad).max()):
+            return x
+        state[j] = 0
+    return x
+
+
+def _bound(free, n):
+    free_set = set(free)
+    return [i for i in range(n) if i not in free_set]
+
+
+def _solve_free(cov, mu, free, bound_idx):
+    """
+    cov_f^-1 1, cov_f^-1 mu_f and cov_f^-1 cov[free, bound] for the free block cov_f, from one
+    factorization (least squares if the block is exactly singular).
+    """
+    cov_f = cov[np.ix_(free, free)]
+    rhs = np.column_stack([np.ones(len(free)), mu[free], cov[np.ix_(free, bound_idx)]])
+    try:
+        sol = np.linalg.solve(cov_f, rhs)
+    except np.linalg.LinAlgError:
+        sol = np.linalg.lstsq(cov_f, rhs, rcond=None)[0]
+    return sol[:, 0], sol[:, 1], sol[:, 2:]
+
+
+def _lambdas_to_bound(inv_ones, inv_mu, inv_b, w_b, lower_f, upper_f):
+    """
+    Lambda at which each free weight would hit a bound, and which bound it hits
+    (inv_b = cov_f^-1 cov[free, bound] w_b).
+    """
+    c4 = inv_ones
+    c2 = inv_mu
+    c1 = c4.sum()
+    c3 = c2.sum()
+    c = _sensitivity(c1, c2, c3, c4)
+    bounds = np.where(c > 0, upper_f, lower_f)
+    if w_b is None:
+        num = c4 - c1 * bounds
+    else:
+        num = (1 - w_b.sum() + inv_b.sum()) * c4 - c1 * (bounds + inv_b)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lams = np.where(c != 0, num / c, np.nan)
+    return lams, bounds
+
+
+def _lambdas_to_free(cov, mu, w, free, bound_idx, inv_ones, inv_mu, u):
+    """
+    Lambda at which each bound weight would become free.
+
+    Adding asset i to the free set borders the free covariance block with s = cov[free, i];
+    its inverse follows from the Schur complement e = cov[i, i] - s' cov_f^-1 s, so all
+    candidates are evaluated from u = cov_f^-1 cov[free, bound] without a solve per candidate.
+    Candidates the free assets already span (e ~ 0) are skipped.
+    """
+    mu_f = mu[free]
+    s = cov[np.ix_(free, bound_idx)]
+    d = cov[bound_idx, bound_idx]
+    e = d - np.einsum("ij,ij->j", s, u)
+    e = np.where(e > SPANNED_TOL * d, e, np.nan)
+    ones_u = u.sum(axis=0)
+
+    c1 = inv_ones.sum() + (ones_u - 1) ** 2 / e
+    c4 = (1 - ones_u) / e
+    u_mu = u.T @ mu_f
+    c2 = (mu[bound_idx] - u_mu) / e
+    c3 = inv_mu.sum() + (u_mu - mu[bound_idx]) * (ones_u - 1) / e
+    c = _sensitivity(c1, c2, c3, c4)
+
+    w_i = w[bound_idx]
+    if len(bound_idx) == 1:
+        num = c4 - c1 * w_i
+    else:
+        cov_fb_w = cov[np.ix_(free, bound_idx)] @ w_i
+        cov_bb_w = cov[np.ix_(bound_idx, bound_idx)] @ w_i
+        l1 = w_i.sum() - w_i
+        # r = cov[free + i, bound - i] @ w[bound - i], split into its free part and its i-th entry
+        u_r = u.T @ cov_fb_w - w_i * np.einsum("ij,ij->j", u, s)
+        r_i = cov_bb_w - cov[bound_idx, bound_idx] * w_i
+        l3 = (r_i - u_r) / e
+        l2 = inv_ones @ cov_fb_w - w_i * ones_u + (u_r - r_i) * (ones_u - 1) / e
+        num = (1 - l1 + l2) * c4 - c1 * (w_i + l3)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(c != 0, num / c, np.nan)
+
+
+def _sensitivity(c1, c2, c3, c4):
+    """
+    c = c3 c4 - c1 c2, which decides whether a weight moves with lambda. Zero instead of
+    round-off when the two terms cancel (an asset tied in expected return with the free ones
+    never reaches an event as lambda changes).
+    """
+    c = c3 * c4 - c1 * c2
+    return np.where(np.abs(c) > 1e-12 * (np.abs(c1 * c2) + np.abs(c3 * c4)), c, 0.0)
+
+
+def _free_weights(inv_ones, inv_mu, inv_b, w_b, lam):
+    g1 = inv_mu.sum()
+    g2 = inv_ones.sum()
+    if w_b is None:
+        gamma = -lam * g1 / g2 + 1 / g2
+        w1 = 0
+    else:
+        g3 = w_b.sum()
+        w1 = inv_b
+        g4 = w1.sum()
+        gamma = -lam * g1 / g2 + (1 - g3 + g4) / g2
+    return -w1 + gamma * inv_ones + lam * inv_mu
@@ -1,24 +1,45 @@
 import numpy as np
 from src.analytics.helpers.returns import compute_annualized_returns
+from src.analytics.risk.covariance import CovarianceEstimator, get_estimator
 from src.analytics.risk.risk_metrics import clean_returns, compute_annualized_covariance
-from scipy.optimize import minimize
-
+from src.analytics.optimization.solvers import (
+    QPNotConverged,
+    long_only_max_sharpe,
+    long_only_min_variance,
+    max_sharpe_closed_form,
+    min_variance_closed_form,
+    negative_sharpe_with_grad,
+    portfolio_variance,
+    portfolio_variance_grad,
+)
 from src.data.fetch_data import get_close_prices
+from src.instrumentation import get_logger, timed_stage
+
+logger = get_logger(__name__)
 
 
-def prepare_portfolio_inputs(prices):
+@timed_stage()
+def prepare_portfolio_inputs(prices, estimator: CovarianceEstimator | str | None = None):
     """
     converts prices to returns and then annualizes coveraince and annualized returns
     Args:
-        prices: DF or array-like of close prices (columns are different assets)
-    
+        prices: DF, PricePanel or array-like of close prices (columns are different assets)
+        estimator: optional covariance estimator (instance or name, see
+            src.analytics.risk.covariance) used instead of the sample covariance
+
     Returns:
         mu: 1D array of annyalized expected returns of each asset
-        cov: annualized covariance matrix.
+        cov: annualized covariance matrix. With an estimator, the fitted estimator itself,
+            which every function of this module accepts in place of the matrix.
     """
     daily_returns  = clean_returns(prices)
     mu = compute_annualized_returns(daily_returns)
-    cov = compute_annualized_covariance(daily_returns)
+    if estimator is None:
+        cov = compute_annualized_covariance(daily_returns)
+    else:
+        if isinstance(estimator, str):
+            estimator = get_estimator(estimator)
+        cov = estimator.fit(daily_returns)
 
     return mu, cov
 
@@ -41,11 +62,13 @@ def compute_porfolio_risk(w, cov):
     compute the portfolio risk ( represented by the standard dev of the porfolio expected return)
     Args:
         w: 1D array of portfolio weights
-        cov: covariance matrix of asset returns.
+        cov: covariance matrix of asset returns (or a fitted CovarianceEstimator).
     
     Returns:
         Scalar portfolio standard deviation
     """
+    if isinstance(cov, CovarianceEstimator):
+        return cov.volatility(w)
     return np.sqrt(w.T @ cov @ w)
 
 
@@ -64,44 +87,76 @@ def compute_sharpe_ratio(w, mu, cov, rf=0.05):
     return (compute_portfolio_return(w, mu) - rf) / compute_porfolio_risk(w, cov)
 
 # now we're aiming for
-def compute_min_var_portfolio(mu, cov, rf = 0.02):
+@timed_stage()
+def compute_min_var_portfolio(mu, cov, rf = 0.02, allow_short: bool = False, method: str = "qp"):
     """
     Finding the minimum-variance portfolio under:
         - weights sum up to 1 ( allocate all ressources given )
-        - no short selling, so the weights must be >= 0
+        - no short selling, so the weights must be >= 0 (unless allow_short)
     Args:
         mu: expected returns
-        cov: covariance matrix
+        cov: covariance matrix (or a fitted CovarianceEstimator)
+        allow_short: drop the w >= 0 constraint and use the closed-form solution
+        method: "qp" for the active-set solver, "slsqp" for scipy's generic SLSQP.
+            "qp" falls back to SLSQP if the active-set solver doesn't converge.
 
     Returns:
         Optimized weights as a 1D array
     """
+    if allow_short:
+        return min_variance_closed_form(cov)
+    cov = np.asarray(cov, dtype=float)
+    if method == "qp":
+        try:
+            return long_only_min_variance(cov)
+        except QPNotConverged as e:
+            logger.warning("%s; falling back to SLSQP", e)
+
     n = len(mu)
     w0 = np.ones(n) / n # start with equal weights
-    target_fct = lambda w: w.T @ cov @ w
-    constraints = [{"type": "eq", "fun": lambda w: np.sum(w) - 1}, {"type": "ineq", "fun": lambda w: w}]
+    constraints = [{"type": "eq", "fun": lambda w: np.sum(w) - 1, "jac": lambda w: np.ones(n)}]
     bounds = [(0,1)] * n
-    res = minimize(target_fct, w0, bounds=bounds, constraints=constraints)
+    from scipy.optimize import minimize
+
+    res = minimize(portfolio_variance, w0, args=(cov,), jac=portfolio_variance_grad,
+                   bounds=bounds, constraints=constraints, method="SLSQP")
     w_opt = res.x
 
     return w_opt
 
-def maximize_sharpe_ratio(mu, cov, rf=0.02):
+@timed_stage()
+def maximize_sharpe_ratio(mu, cov, rf=0.02, allow_short: bool = False, method: str = "qp"):
     """
     Maximize portfolio sharpe ratio with same constraints as min-variance
-        -full allocation of all ressources and no short selling
+        -full allocation of all ressources and no short selling (unless allow_short)
     Args:
         mu: expected returns
-        cov: covariance matrix
+        cov: covariance matrix (or a fitted CovarianceEstimator)
+        allow_short: drop the w >= 0 constraint and use the closed-form solution
+        method: "qp" for the active-set solver, "slsqp" for scipy's generic SLSQP.
+            "qp" falls back to SLSQP when no asset beats the risk-free rate or the
+            active-set solver doesn't converge.
     Returns:
         Optimized weights as a 1D array
     """
+    mu = np.asarray(mu, dtype=float)
+    if allow_short:
+        return max_sharpe_closed_form(mu, cov, rf)
+    cov = np.asarray(cov, dtype=float)
+    if method == "qp" and mu.max() > rf:
+        try:
+            return long_only_max_sharpe(mu, cov, rf)
+        except QPNotConverged as e:
+            logger.warning("%s; falling back to SLSQP", e)
+
     n = len(mu)
     w0 = np.ones(n) / n
-    target_fct = lambda w: -compute_sharpe_ratio(w, mu, cov, rf)
-    constraints = [{"type": "eq", "fun": lambda w: np.sum(w) - 1}, {"type": "ineq", "fun": lambda w: w}]
+    constraints = [{"type": "eq", "fun": lambda w: np.sum(w) - 1, "jac": lambda w: np.ones(n)}]
     bounds = [(0,1)] * n
-    res = minimize(target_fct, w0, bounds=bounds, constraints=constraints)
+    from scipy.optimize import minimize
+
+    res = minimize(negative_sharpe_with_grad, w0, args=(mu, cov, rf), jac=True,
+                   bounds=bounds, constraints=constraints, method="SLSQP")
     w_opt = res.x
     return w_opt
 
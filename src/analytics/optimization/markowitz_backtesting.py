@@ -1,31 +1,132 @@
 import numpy as np
 import pandas as pd
 from src.analytics.optimization.markowitz import prepare_portfolio_inputs, maximize_sharpe_ratio, compute_min_var_portfolio
+from src.analytics.helpers.costs import CostModel
+from src.analytics.optimization.random_portfolios import random_weights
+from src.analytics.optimization.risk_parity import equal_risk_contribution, hierarchical_risk_parity
+from src.analytics.risk.risk_metrics import clean_returns, compute_correlation
+from src.analytics.risk.performance import performance_report, wealth_to_returns
 from src.analytics.helpers.returns import get_close_prices
-from src.visualization.plot import plot_cumulative_returns
 from pathlib import Path
-from src.analytics.helpers.validateTickers import validateTicker
+from src.analytics.helpers.validateTickers import validate_tickers
+from src.data.panel import PricePanel
+from src.instrumentation import timed_stage
 
 BASE_DIR = Path(__file__).resolve().parents[3]
+# default place for saved plots; created when a plot is saved, not at import
 out_dir = BASE_DIR / "src" / "plots" / "optim"
-out_dir.mkdir(parents=True, exist_ok=True)
 
 
-def backtest_portfolio(weights: np.ndarray, prices: pd.DataFrame) -> pd.Series:
+@timed_stage()
+def backtest_portfolio(weights: np.ndarray, prices: pd.DataFrame, costs: CostModel | None = None,
+                       rebalance: int | None = 1) -> pd.Series:
     """
     Compute cumulative returns of a fixed-weight portfolio on given price data.
 
     Args:
         weights: 1d array of portfolio weights (len == prices.shape[1]).
-        prices: price dataframe with columns matching tickers.
+        prices: price dataframe (or PricePanel) with columns matching tickers.
+        costs: optional transaction cost model, charged on the initial purchase and on the
+            trades that bring the drifted weights back to target at every rebalance.
+        rebalance: trading days between rebalances to the target weights (1 = daily); None
+            buys once and lets the weights drift (buy and hold).
+
+    Missing closes are carried forward (the asset is flat until its next close), and an asset
+    is flat before its first close.
 
     Returns:
         cumulative returns series (index = prices.index).
     """
-    returns = prices.pct_change().dropna(how="all")
-    port_daily = returns @ weights
-    cumu = (1 + port_daily).cumprod()
-    return cumu
+    if rebalance is not None and not (isinstance(rebalance, (int, np.integer)) and rebalance >= 1):
+        raise ValueError(f"rebalance must be None or a whole number of days >= 1, got {rebalance!r}")
+    returns, dates = _period_returns(prices)
+    if costs is None and rebalance == 1:
+        port_daily = pd.Series(returns @ weights, index=dates)
+        return (1 + port_daily).cumprod()
+    wealth, trades = _rebalanced_wealth(returns, np.asarray(weights, dtype=float), rebalance)
+    if costs is not None:
+        charged = costs.trade_costs(trades, costs.unit_costs(returns)).sum(axis=1)
+        wealth *= np.cumprod(1 - charged)
+    return pd.Series(wealth, index=dates)
+
+
+def _rebalanced_wealth(returns: np.ndarray, weights: np.ndarray, rebalance: int | None):
+    """
+    Wealth path of a portfolio reset to weights every rebalance days (never if None), and
+    the (T, n) trades made at the start of each day (nonzero on rebalance days only).
+
+    Within a holding period every asset grows by its own cumulative return, so the path is
+    read off the assets' cumulative growth divided by its value when the period started.
+    """
+    n_days = len(returns)
+    growth = np.cumprod(1 + returns, axis=0)
+    period = np.arange(n_days) // rebalance if rebalance else np.zeros(n_days, dtype=int)
+    starts = np.flatnonzero(np.diff(period, prepend=-1))
+    base = np.vstack([np.ones(returns.shape[1]), growth[starts[1:] - 1]])
+    held = growth / base[period]  # each asset's growth since its period started
+    period_growth = held @ weights
+    ends = np.append(starts[1:] - 1, n_days - 1)
+    start_wealth = np.concatenate([[1.0], np.cumprod(period_growth[ends])[:-1]])
+    wealth = start_wealth[period] * period_growth
+
+    trades = np.zeros_like(returns)
+    trades[0] = weights
+    if len(starts) > 1:
+        before = starts[1:] - 1
+        drifted = weights * held[before] / period_growth[before, None]
+        trades[starts[1:]] = weights - drifted
+    return wealth, trades
+
+
+def _period_returns(prices) -> tuple[np.ndarray, pd.DatetimeIndex]:
+    """
+    Daily returns matrix without the all-missing rows, and its dates. A missing close is
+    carried forward, so the asset's move across the gap lands on its next close instead of
+    being lost, and returns before an asset's first close are 0 (so a late listing doesn't
+    blank out the other assets' moves).
+    """
+    if isinstance(prices, PricePanel):
+        if not np.isnan(prices.returns).any():
+            return prices.returns, prices.dates[1:]
+        prices = prices.to_frame()
+    returns = prices.ffill().pct_change().dropna(how="all")
+    return np.nan_to_num(returns.to_numpy(dtype=float)), returns.index
+
+
+@timed_stage()
+def random_portfolio_paths(
+    prices: pd.DataFrame,
+    n_portfolios: int = 100,
+    seed: int | None = None,
+    quantiles: tuple[float, ...] = (0.05, 0.5, 0.95),
+) -> dict:
+    """
+    Backtest many random portfolios at once.
+
+    Daily returns are computed once and multiplied by the (n_assets x n_portfolios) weight
+    matrix in a single matmul, so thousands of comparison portfolios stay cheap.
+
+    Args:
+        prices: price dataframe or PricePanel.
+        n_portfolios: number of random portfolios to generate.
+        seed: optional RNG seed.
+        quantiles: quantiles of the cumulative returns reported for every date.
+
+    Returns:
+        dict with keys:
+          - "weights": (n_portfolios, n_assets) array of weights
+          - "cumulative": (n_days, n_portfolios) array of cumulative returns (same convention
+            as backtest_portfolio)
+          - "band": DataFrame of the requested quantiles per date (columns = quantiles)
+    """
+    rng = np.random.default_rng(seed)
+    returns, dates = _period_returns(prices)
+    weights = random_weights(prices.shape[1], n_portfolios, rng)
+    cumu = returns @ weights.T
+    cumu += 1
+    np.cumprod(cumu, axis=0, out=cumu)
+    band = pd.DataFrame(np.quantile(cumu, quantiles, axis=1).T, index=dates, columns=list(quantiles))
+    return {"weights": weights, "cumulative": cumu, "band": band}
 
 
 def random_portfolio_returns(prices: pd.DataFrame, n_portfolios: int = 100, seed: int | None = None) -> dict[str, pd.Series]:
@@ -40,16 +141,12 @@ def random_portfolio_returns(prices: pd.DataFrame, n_portfolios: int = 100, seed
     Returns:
         dict mapping "random_i" -> cumulative returns series.
     """
-    rng = np.random.default_rng(seed)
-    n = prices.shape[1]
-    curves: dict[str, pd.Series] = {}
-    for i in range(n_portfolios):
-        w = rng.random(n)
-        w /= w.sum()
-        curves[f"random_{i}"] = backtest_portfolio(w, prices)
-    return curves
+    paths = random_portfolio_paths(prices, n_portfolios, seed)
+    index = paths["band"].index
+    return {f"random_{i}": pd.Series(paths["cumulative"][:, i], index=index) for i in range(n_portfolios)}
 
 
+@timed_stage()
 def run_backtest(
     tickers: list[str],
     train_start: str,
@@ -60,7 +157,9 @@ def run_backtest(
     n_random: int = 100,
     save_plot: bool = False,
     plot_path: Path | None = None,
-    return_fig: bool = False
+    return_fig: bool = False,
+    costs: CostModel | None = None,
+    rebalance: int | None = 1,
 ):
     """
     Args:
@@ -68,23 +167,29 @@ def run_backtest(
         train_start/train_end: date range for training (to compute mu, cov).
         test_start/test_end: date range for backtest.
         rf: risk-free rate passed to Sharpe optimizer.
-        n_random: how many random portfolios for comparison.
+        n_random: how many random portfolios for comparison (drawn as a quantile band).
         save_plot: whether to save a plot of curves.
         plot_path: target path for saved plot (if save_plot True).
+        costs: optional transaction cost model for the portfolio curves (the random
+            portfolio band stays frictionless and daily rebalanced).
+        rebalance: trading days between rebalances, None for buy and hold (see backtest_portfolio).
 
     Returns:
         dict with keys:
-          - "weights": {"max_sharpe": np.ndarray, "min_var": np.ndarray, "equal": np.ndarray}
-          - "curves": {"max_sharpe": Series, "min_var": Series, "equal": Series, "random_*": Series...}
+          - "weights": {"max_sharpe", "min_var", "equal", "risk_parity", "hrp"} -> np.ndarray
+          - "curves": {"Max Sharpe Portfolio", "Min Var Portfolio", "Equal Weight", "Risk Parity",
+            "HRP"} -> cumulative returns Series
+          - "random_band": 5% / 50% / 95% quantiles of the n_random random portfolios per date
+          - "report": performance_report of the portfolio curves (one row per portfolio)
     """
     tickers = [t.upper().strip() for t in tickers]
 
     if not (train_start < train_end and train_end < test_start and test_start < test_end):
        raise Exception("There is a date mismatch")
     
-    for ticker in tickers:
-        if not validateTicker(ticker):
-            raise Exception("One of the tickers doesn't exist as a USD traded asset")
+    statuses = validate_tickers(tickers)
+    if not all(statuses.values()):
+        raise Exception("One of the tickers doesn't exist as a USD traded asset")
     
     train_prices = get_close_prices(tickers, start=train_start, end=train_end)
     mu, cov = prepare_portfolio_inputs(train_prices)
@@ -93,23 +198,38 @@ def run_backtest(
     w_max_sharpe = maximize_sharpe_ratio(mu, cov, rf)
     w_min_var = compute_min_var_portfolio(mu, cov)
     w_equal = np.ones(len(tickers)) / len(tickers)
+    w_risk_parity = equal_risk_contribution(cov)
+    w_hrp = hierarchical_risk_parity(cov, corr=compute_correlation(clean_returns(train_prices)))
 
     test_prices = get_close_prices(tickers, start=test_start, end=test_end)
     curves = {
-        "Max Sharpe Portfolio": backtest_portfolio(w_max_sharpe, test_prices),
-        "Min Var Portfolio": backtest_portfolio(w_min_var, test_prices),
-        "Equal Weight": backtest_portfolio(w_equal, test_prices),
+        "Max Sharpe Portfolio": backtest_portfolio(w_max_sharpe, test_prices, costs, rebalance),
+        "Min Var Portfolio": backtest_portfolio(w_min_var, test_prices, costs, rebalance),
+        "Equal Weight": backtest_portfolio(w_equal, test_prices, costs, rebalance),
+        "Risk Parity": backtest_portfolio(w_risk_parity, test_prices, costs, rebalance),
+        "HRP": backtest_portfolio(w_hrp, test_prices, costs, rebalance),
     }
-    rand_curves = random_portfolio_returns(test_prices, n_portfolios=n_random)
-    curves.update(rand_curves)
+    random_band = random_portfolio_paths(test_prices, n_portfolios=n_random)["band"]
 
+    if save_plot or return_fig:
+        from src.visualization.plot import plot_cumulative_returns
     if save_plot:
-        plot_cumulative_returns(path=plot_path, curves=curves)
+        if plot_path is not None:
+            Path(plot_path).parent.mkdir(parents=True, exist_ok=True)
+        plot_cumulative_returns(path=plot_path, curves=curves, band=random_band)
     elif return_fig:
-        return plot_cumulative_returns(path=plot_path, return_fig=True, curves = curves)
+        return plot_cumulative_returns(path=plot_path, return_fig=True, curves = curves, band=random_band)
     return {
-        "weights": {"max_sharpe": w_max_sharpe, "min_var": w_min_var, "equal": w_equal},
+        "weights": {
+            "max_sharpe": w_max_sharpe,
+            "min_var": w_min_var,
+            "equal": w_equal,
+            "risk_parity": w_risk_parity,
+            "hrp": w_hrp,
+        },
         "curves": curves,
+        "random_band": random_band,
+        "report": performance_report(wealth_to_returns(pd.DataFrame(curves)), rf=rf),
     }
 
 
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from src.instrumentation import timed_stage
+
+
+def random_weights(n_assets: int, n_portfolios: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draw long-only weight vectors that sum to 1, one portfolio per row.
+
+    Args:
+        n_assets: number of assets per portfolio.
+        n_portfolios: number of weight vectors to draw.
+        rng: numpy Generator to draw from.
+
+    Returns:
+        (n_portfolios, n_assets) array of weights.
+    """
+    w = rng.random((n_portfolios, n_assets))
+    w /= w.sum(axis=1, keepdims=True)
+    return w
+
+
+@timed_stage()
+def generate_portfolios(
+    mu,
+    cov,
+    n_portfolios: int = 5000,
+    rf: float = 0.02,
+    seed: int | np.random.Generator | None = None,
+    chunk_size: int = 100_000,
+    return_weights: bool = False,
+):
+    """
+    Sample random long-only portfolios and compute their return, risk and Sharpe ratio.
+
+    Weights are drawn as one (chunk_size, n_assets) matrix at a time, so memory stays bounded
+    by chunk_size no matter how many portfolios are requested. The chunking does not change
+    the result: the same seed gives the same portfolios for any chunk_size.
+
+    Args:
+        mu: annualized expected returns (length n_assets).
+        cov: annualized covariance matrix (n_assets x n_assets).
+        n_portfolios: number of portfolios to sample.
+        rf: annual risk-free rate used for the Sharpe ratio.
+        seed: int seed or numpy Generator for reproducible draws.
+        chunk_size: maximum number of portfolios evaluated at once.
+        return_weights: also return the (n_portfolios, n_assets) weight matrix.
+
+    Returns:
+        DataFrame with columns "ret", "risk" and "sharpe" (one row per portfolio),
+        plus the weight matrix when return_weights is True.
+    """
+    rng = np.random.default_rng(seed)
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    n = len(mu)
+
+    ret = np.empty(n_portfolios)
+    risk = np.empty(n_portfolios)
+    weights = np.empty((n_portfolios, n)) if return_weights else None
+
+    for lo in range(0, n_portfolios, chunk_size):
+        hi = min(lo + chunk_size, n_portfolios)
+        w = random_weights(n, hi - lo, rng)
+        ret[lo:hi] = w @ mu
+        risk[lo:hi] = np.sqrt(np.einsum("ij,ij->i", w @ cov, w))
+        if return_weights:
+            weights[lo:hi] = w
+
+    portfolios = pd.DataFrame({"ret": ret, "risk": risk, "sharpe": (ret - rf) / risk})
+    if return_weights:
+        return portfolios, weights
+    return portfolios
@@ -0,0 +1,138 @@
+import numpy as np
+
+from src.instrumentation import get_logger, timed_stage
+
+logger = get_logger(__name__)
+
+
+def risk_contributions(w, cov) -> np.ndarray:
+    """Share of the portfolio variance contributed by each asset, w_i (cov w)_i / w'cov w."""
+    w = np.asarray(w, dtype=float)
+    marginal = np.asarray(cov, dtype=float) @ w
+    return w * marginal / (w @ marginal)
+
+
+@timed_stage()
+def equal_risk_contribution(cov, budget=None, method: str = "newton", tol: float = 1e-10,
+                            max_iter: int = 1000) -> np.ndarray:
+    """
+    Long-only portfolio whose assets contribute equally (or per budget) to the variance.
+
+    Both solvers minimize the convex 1/2 x'cov x - sum(b_i log x_i), whose minimizer
+    normalized to sum to 1 is the risk-parity portfolio:
+      - "newton": damped Newton steps (Spinu, 2013); converges in a few dozen iterations,
+        each solving one n x n system.
+      - "ccd": cyclical coordinate descent; every coordinate update has a closed form (the
+        positive root of a quadratic) and keeps cov x up to date with one column, so a sweep
+        costs O(n^2) and nothing is solved, but more sweeps are needed on correlated assets.
+
+    Args:
+        cov: covariance matrix (or a fitted covariance estimator).
+        budget: target risk shares (defaults to equal); normalized to sum to 1.
+        method: "newton" or "ccd".
+        tol: stop when no risk contribution is further than tol from its target.
+        max_iter: maximum number of Newton iterations / coordinate sweeps. If they run out,
+            a warning is logged and the last iterate is returned.
+
+    Returns:
+        1D array of weights summing to 1.
+    """
+    cov = np.asarray(cov, dtype=float)
+    n = len(cov)
+    b = np.full(n, 1 / n) if budget is None else np.asarray(budget, dtype=float) / np.sum(budget)
+    if method == "newton":
+        x = _erc_newton(cov, b, tol, max_iter)
+    elif method == "ccd":
+        x = _erc_ccd(cov, b, tol, max_iter)
+    else:
+        raise ValueError(f"Unknown risk parity method: {method}")
+    error = np.abs(risk_contributions(x, cov) - b).max()
+    if not error < tol:
+        logger.warning("Risk parity (%s) did not converge in %d iterations; risk contributions are "
+                       "up to %.2g off target", method, max_iter, error)
+    return x / x.sum()
+
+
+def _erc_newton(cov, b, tol, max_iter):
+    x = b / np.sqrt(b @ cov @ b)
+    for _ in range(max_iter):
+        cov_x = cov @ x
+        if np.abs(x * cov_x / (x @ cov_x) - b).max() < tol:
+            break
+        grad = cov_x - b / x
+        hessian = cov + np.diag(b / x ** 2)
+        step = np.linalg.solve(hessian, grad)
+        # Newton decrement; the damped step keeps x positive (the objective is self-concordant)
+        decrement = np.sqrt(grad @ step)
+        x = x - step / (1 + decrement) if decrement > 0.25 else x - step
+    return x
+
+
+def _erc_ccd(cov, b, tol, max_iter):
+    diag = np.diag(cov).copy()
+    x = 1 / np.sqrt(diag)
+    x /= np.sqrt(x @ cov @ x)
+    cov_x = cov @ x
+    for _ in range(max_iter):
+        for i in range(len(x)):
+            c = cov_x[i] - diag[i] * x[i]
+            new = (-c + np.sqrt(c * c + 4 * diag[i] * b[i])) / (2 * diag[i])
+            cov_x += (new - x[i]) * cov[:, i]
+            x[i] = new
+        if np.abs(x * cov_x / (x @ cov_x) - b).max() < tol:
+            break
+    return x
+
+
+@timed_stage()
+def hierarchical_risk_parity(cov, corr=None, linkage_method: str = "single") -> np.ndarray:
+    """
+    Hierarchical Risk Parity weights (Lopez de Prado).
+
+    Assets are clustered on the correlation distance sqrt((1 - corr) / 2), ordered so similar
+    assets sit next to each other, and the weight is split top-down between the two halves
+    of every cluster in inverse proportion to their inverse-variance portfolio variance.
+    The covariance matrix is never inverted, so this works for thousands of assets and for
+    singular covariances.
+
+    Args:
+        cov: covariance matrix (or a fitted covariance estimator).
+        corr: correlation matrix, e.g. compute_correlation of the daily returns; derived
+            from cov when not given.
+        linkage_method: scipy linkage method ("single", "average", "complete", "ward").
+
+    Returns:
+        1D array of weights summing to 1 (same asset order as cov).
+    """
+    from scipy.cluster.hierarchy import leaves_list, linkage
+    from scipy.spatial.distance import squareform
+
+    cov = np.asarray(cov, dtype=float)
+    if corr is None:
+        std = np.sqrt(np.diag(cov))
+        corr = cov / np.outer(std, std)
+    corr = np.asarray(corr, dtype=float)
+    distance = np.sqrt(np.clip((1 - corr) / 2, 0, None))
+    np.fill_diagonal(distance, 0)
+    order = leaves_list(linkage(squareform(distance, checks=False), method=linkage_method))
+
+    weights = np.ones(len(cov))
+    clusters = [order]
+    while clusters:
+        clusters = [half for cluster in clusters if len(cluster) > 1
+                    for half in (cluster[:len(cluster) // 2], cluster[len(cluster) // 2:])]
+        for left, right in zip(clusters[::2], clusters[1::2]):
+            var_left, var_right = _cluster_variance(cov, left), _cluster_variance(cov, right)
+            alpha = 1 - var_left / (var_left + var_right)
+            weights[left] *= alpha
+            weights[right] *= 1 - alpha
+    return weights / weights.sum()
+
+
+def _cluster_variance(cov: np.ndarray, members: np.ndarray) -> float:
+    """Variance of the inverse-variance portfolio of the cluster members."""
+    sub = cov[np.ix_(members, members)]
+    w = 1 / np.diag(sub)
+    w /= w.sum()
+    return float(w @ sub @ w)
+
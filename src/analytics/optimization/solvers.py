@@ -0,0 +1,225 @@
+import numpy as np
+
+
+class QPNotConverged(RuntimeError):
+    """solve_simplex_qp ran out of iterations before reaching an optimal point."""
+
+
+def portfolio_variance(w, cov):
+    """Portfolio variance w' cov w."""
+    return w @ cov @ w
+
+
+def portfolio_variance_grad(w, cov):
+    """Gradient of w' cov w with respect to the weights: 2 cov w."""
+    return 2 * cov @ w
+
+
+def portfolio_variance_hess(cov):
+    """Hessian of w' cov w (constant): 2 cov."""
+    return 2 * cov
+
+
+def negative_sharpe_with_grad(w, mu, cov, rf=0.02):
+    """
+    Negative Sharpe ratio and its gradient, in the (value, gradient) form scipy expects with jac=True.
+
+    With r = w'mu - rf and s = sqrt(w' cov w):
+        d(r / s)/dw = mu / s - r * cov w / s^3
+    """
+    cov_w = cov @ w
+    s = np.sqrt(w @ cov_w)
+    r = w @ mu - rf
+    grad = mu / s - r * cov_w / s**3
+    return -r / s, -grad
+
+
+def min_variance_closed_form(cov):
+    """
+    Global minimum-variance weights when short selling is allowed:
+        w = cov^-1 1 / (1' cov^-1 1)
+
+    Args:
+        cov: covariance matrix, or a fitted CovarianceEstimator (its cached factorization is used)
+    Returns:
+        1D array of weights summing to 1 (may contain negative weights)
+    """
+    x = _solve_cov(cov, np.ones(len(cov)))
+    return x / x.sum()
+
+
+def max_sharpe_closed_form(mu, cov, rf=0.02):
+    """
+    Tangency (max-Sharpe) weights when short selling is allowed:
+        w = cov^-1 (mu - rf) / (1' cov^-1 (mu - rf))
+
+    Args:
+        mu: expected returns
+        cov: covariance matrix, or a fitted CovarianceEstimator (its cached factorization is used)
+        rf: risk-free rate
+    Returns:
+        1D array of weights summing to 1 (may contain negative weights)
+    """
+    x = _solve_cov(cov, np.asarray(mu, dtype=float) - rf)
+    if x.sum() <= 0:
+        raise ValueError("No tangency portfolio: the risk-free rate is above the min-variance return")
+    return x / x.sum()
+
+
+def _solve_cov(cov, b):
+    if hasattr(cov, "solve"):
+        return cov.solve(b)
+    return np.linalg.solve(np.asarray(cov, dtype=float), b)
+
+
+def long_only_min_variance(cov, x0=None):
+    """
+    Minimum-variance weights with w >= 0 and sum(w) == 1.
+
+    Args:
+        cov: covariance matrix
+        x0: optional feasible weights to warm start from (e.g. the previous rebalance)
+    Returns:
+        1D array of weights
+    """
+    cov = np.asarray(cov, dtype=float)
+    n = len(cov)
+    w = solve_simplex_qp(cov, np.zeros(n), np.ones(n), 1.0, x0=x0)
+    return w / w.sum()
+
+
+def long_only_max_sharpe(mu, cov, rf=0.02, x0=None):
+    """
+    Maximum-Sharpe weights with w >= 0 and sum(w) == 1.
+
+    Uses the usual change of variables y = w / ((mu - rf)' w), which turns the
+    Sharpe maximization into the convex QP
+        min y' cov y   s.t.  (mu - rf)' y = 1,  y >= 0
+    and w = y / sum(y).
+
+    Args:
+        mu: expected returns
+        cov: covariance matrix
+        rf: risk-free rate
+        x0: optional feasible weights to warm start from
+    Returns:
+        1D array of weights
+    """
+    cov = np.asarray(cov, dtype=float)
+    excess = np.asarray(mu, dtype=float) - rf
+    if excess.max() <= 0:
+        raise ValueError("Every asset returns less than the risk-free rate")
+
+    y0 = None
+    if x0 is not None:
+        scale = excess @ x0
+        if scale > 0:
+            y0 = np.asarray(x0, dtype=float) / scale
+
+    y = solve_simplex_qp(cov, np.zeros(len(cov)), excess, 1.0, x0=y0)
+    return y / y.sum()
+
+
+def solve_simplex_qp(P, q, a, b, x0=None, tol=1e-10, max_iter=None):
+    """
+    Primal active-set solver for
+        min 1/2 x' P x - q' x   s.t.  a' x = b,  x >= 0
+    with P positive (semi-)definite.
+
+    The working set is the set of free (strictly positive) variables. Each iteration solves the
+    equality-constrained problem on that set through its KKT system; negative components are
+    handled with a ratio-test step that pins the blocking variable to zero, and a bound variable
+    is released when its multiplier is negative. A good starting working set comes from
+    repeatedly dropping negative entries of the unconstrained solution, or from x0.
+
+    Args:
+        P: (n, n) matrix of the quadratic term
+        q: (n,) linear term
+        a: (n,) equality constraint coefficients
+        b: equality constraint right-hand side
+        x0: optional feasible starting point
+        tol: tolerance on weights and multipliers
+        max_iter: iteration cap (defaults to 10 n + 100)
+
+    Returns:
+        1D optimal x
+
+    Raises:
+        QPNotConverged: no optimal point was found within max_iter iterations.
+    """
+    P = np.asarray(P, dtype=float)
+    q = np.asarray(q, dtype=float)
+    a = np.asarray(a, dtype=float)
+    n = len(q)
+    max_iter = max_iter or 10 * n + 100
+
+    x, free = _initial_point(P, q, a, b, x0, tol)
+
+    for _ in range(max_iter):
+        x_free, lam = _solve_eqp(P, q, a, b, free)
+        scale = max(1.0, np.abs(x_free).max())
+
+        if np.all(x_free >= -tol * scale):
+            x = np.zeros(n)
+            x[free] = np.maximum(x_free, 0)
+            bound = np.setdiff1d(np.arange(n), free)
+            if len(bound) == 0:
+                return x
+            multipliers = (P[bound] @ x) - q[bound] + lam * a[bound]
+            j = np.argmin(multipliers)
+            if multipliers[j] >= -tol * max(1.0, np.abs(multipliers).max()):
+                return x
+            free = np.sort(np.append(free, bound[j]))
+        else:
+            step = x_free - x[free]
+            shrinking = step < 0
+            ratios = x[free][shrinking] / -step[shrinking]
+            alpha = min(1.0, ratios.min())
+            x[free] += alpha * step
+            blocking = x[free] <= tol * scale
+            x[free[blocking]] = 0.0
+            free = free[~blocking]
+
+    raise QPNotConverged(f"Active-set QP did not converge in {max_iter} iterations")
+
+
+def _initial_point(P, q, a, b, x0, tol):
+    n = len(q)
+    if x0 is not None:
+        x0 = np.asarray(x0, dtype=float)
+        if np.all(x0 >= 0) and abs(a @ x0 - b) <= 1e-8 * max(1.0, abs(b)):
+            free = np.flatnonzero(x0 > tol)
+            if len(free):
+                return x0.copy(), free
+
+    free = np.arange(n)
+    while len(free) and np.any(a[free] != 0):
+        x_free, _ = _solve_eqp(P, q, a, b, free)
+        positive = x_free > tol
+        if positive.all():
+            x = np.zeros(n)
+            x[free] = x_free
+            if abs(a @ x - b) <= 1e-8 * max(1.0, abs(b)):
+                return x, free
+            break
+        free = free[positive]
+
+    # fall back to the single best asset for the constraint, which is always feasible
+    j = np.argmax(a / b) if b != 0 else np.argmax(np.abs(a))
+    x = np.zeros(n)
+    x[j] = b / a[j]
+    return x, np.array([j])
+
+
+def _solve_eqp(P, q, a, b, free):
+    k = len(free)
+    kkt = np.zeros((k + 1, k + 1))
+    kkt[:k, :k] = P[np.ix_(free, free)]
+    kkt[:k, k] = a[free]
+    kkt[k, :k] = a[free]
+    rhs = np.append(q[free], b)
+    try:
+        sol = np.linalg.solve(kkt, rhs)
+    except np.linalg.LinAlgError:
+        sol = np.linalg.lstsq(kkt, rhs, rcond=None)[0]
+    return sol[:k], sol[k]
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from src.analytics.optimization.markowitz import compute_min_var_portfolio, maximize_sharpe_ratio
+from src.analytics.optimization.solvers import QPNotConverged, long_only_max_sharpe, long_only_min_variance
+from src.analytics.risk.risk_metrics import clean_returns
+from src.instrumentation import timed_stage
+
+
+class RollingMoments:
+    """
+    Running sums of daily returns and of their cross-products over a window of rows.
+
+    Rows can be added at the end and removed from the start of the window, so moving the
+    window by k days costs O(k n^2) instead of rebuilding the covariance from scratch.
+    """
+
+    def __init__(self, n_assets: int):
+        self.count = 0
+        self.total = np.zeros(n_assets)
+        self.cross = np.zeros((n_assets, n_assets))
+
+    def add(self, rows: np.ndarray):
+        if len(rows):
+            self.count += len(rows)
+            self.total += rows.sum(axis=0)
+            self.cross += rows.T @ rows
+
+    def remove(self, rows: np.ndarray):
+        if len(rows):
+            self.count -= len(rows)
+            self.total -= rows.sum(axis=0)
+            self.cross -= rows.T @ rows
+
+    def annualized(self):
+        """
+        Annualized mean returns and covariance, with the same conventions as
+        prepare_portfolio_inputs (compounded mean, sample covariance * 252).
+        """
+        mean = self.total / self.count
+        cov = (self.cross - np.outer(self.total, mean)) / (self.count - 1)
+        return (1 + mean) ** 252 - 1, cov * 252
+
+
+def rebalance_dates(index: pd.DatetimeIndex, frequency: str = "M") -> pd.DatetimeIndex:
+    """
+    Last available date of every period ("M" monthly, "Q" quarterly, "W" weekly, "Y" yearly).
+    """
+    periods = index.to_period(frequency)
+    last = pd.Series(index, index=index).groupby(periods).max()
+    return pd.DatetimeIndex(last.values)
+
+
+@timed_stage()
+def walk_forward_backtest(
+    prices: pd.DataFrame,
+    frequency: str = "M",
+    lookback: int | None = 252,
+    objective: str = "max_sharpe",
+    rf: float = 0.03,
+    min_history: int = 60,
+) -> dict:
+    """
+    Walk-forward backtest that re-optimizes the portfolio on a rebalancing schedule.
+
+    At the close of every rebalance date, mu and cov are re-estimated from the trailing
+    lookback days (or all history so far if lookback is None), the portfolio is re-optimized
+    starting from the previous weights, and the new weights are held from the next session
+    until the following rebalance.
+
+    Args:
+        prices: price dataframe with columns matching tickers.
+        frequency: rebalancing frequency ("M", "Q", "W", "Y").
+        lookback: rolling estimation window in trading days, None for an expanding window.
+        objective: "max_sharpe" or "min_var".
+        rf: risk-free rate passed to the Sharpe optimizer.
+        min_history: days of returns required before the first rebalance.
+
+    Returns:
+        dict with keys:
+          - "weights": DataFrame of weights (one row per rebalance date)
+          - "returns": daily portfolio returns Series (from the first rebalance on)
+          - "curve": cumulative returns series, as backtest_portfolio computes it
+    """
+    returns = clean_returns(prices)
+    values = returns.to_numpy(dtype=float)
+    n_days, n_assets = values.shape
+    positions = returns.index.get_indexer(rebalance_dates(returns.index, frequency))
+
+    moments = RollingMoments(n_assets)
+    start, end = 0, 0
+    w_prev = None
+    weights, weight_dates = [], []
+    port = np.full(n_days, np.nan)
+
+    for k, pos in enumerate(positions):
+        if pos + 1 < min_history:
+            continue
+        moments.add(values[end:pos + 1])
+        end = pos + 1
+        if lookback:
+            new_start = max(0, end - lookback)
+            moments.remove(values[start:new_start])
+            start = new_start
+
+        mu, cov = moments.annualized()
+        w = _optimize(objective, mu, cov, rf, w_prev)
+
+        hold_until = positions[k + 1] + 1 if k + 1 < len(positions) else n_days
+        port[end:hold_until] = values[end:hold_until] @ w
+        weights.append(w)
+        weight_dates.append(returns.index[pos])
+        w_prev = w
+
+    port_daily = pd.Series(port, index=returns.index).dropna()
+    return {
+        "weights": pd.DataFrame(weights, index=pd.DatetimeIndex(weight_dates), columns=returns.columns),
+        "returns": port_daily,
+        "curve": (1 + port_daily).cumprod(),
+    }
+
+
+def _optimize(objective, mu, cov, rf, w_prev):
+    # warm start from the previous weights; if that doesn't converge, solve from scratch
+    # (which falls back to SLSQP in turn)
+    if objective == "min_var":
+        try:
+            return long_only_min_variance(cov, x0=w_prev)
+        except QPNotConverged:
+            return compute_min_var_portfolio(mu, cov, rf)
+    if objective == "max_sharpe":
+        if mu.max() > rf:
+            try:
+                return long_only_max_sharpe(mu, cov, rf, x0=w_prev)
+            except QPNotConverged:
+                pass
+        return maximize_sharpe_ratio(mu, cov, rf)
+    raise ValueError(f"Unknown objective: {objective}")
@@ -0,0 +1,239 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+class CovarianceEstimator:
+    """
+    Base class for annualized covariance estimators.
+
+    fit() takes daily returns; afterwards the estimator can be used wherever a covariance
+    matrix is expected (np.asarray(estimator) gives the matrix). Decompositions are computed
+    on first use and cached, so repeated risk and optimization calls on the same estimate
+    don't refactorize the matrix.
+
+    Args:
+        periods_per_year: annualization factor for daily returns.
+    """
+
+    def __init__(self, periods_per_year: int = TRADING_DAYS):
+        self.periods_per_year = periods_per_year
+        self.columns = None
+        self._matrix = None
+        self._cholesky = None
+        self._eigh = None
+
+    def fit(self, returns):
+        """
+        Estimate the covariance from daily returns (DataFrame or (T, n) array).
+        Returns the estimator itself.
+        """
+        self.columns = returns.columns if isinstance(returns, pd.DataFrame) else None
+        values = np.asarray(returns, dtype=float)
+        self._matrix = None
+        self._cholesky = None
+        self._eigh = None
+        self._fit(values)
+        return self
+
+    def _fit(self, values: np.ndarray):
+        raise NotImplementedError
+
+    @property
+    def n_assets(self) -> int:
+        return len(self.matrix)
+
+    def __len__(self):
+        return self.n_assets
+
+    def __array__(self, dtype=None, copy=None):
+        return self.matrix if dtype is None else self.matrix.astype(dtype)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Annualized (n, n) covariance matrix."""
+        if self._matrix is None:
+            raise ValueError("Estimator is not fitted yet")
+        return self._matrix
+
+    def to_frame(self) -> pd.DataFrame:
+        """Covariance matrix as a DataFrame labelled by the fitted columns."""
+        return pd.DataFrame(self.matrix, index=self.columns, columns=self.columns)
+
+    def cholesky(self) -> np.ndarray:
+        """Lower Cholesky factor L (cov = L L'), computed once."""
+        if self._cholesky is None:
+            self._cholesky = np.linalg.cholesky(self.matrix)
+        return self._cholesky
+
+    def eigh(self) -> tuple[np.ndarray, np.ndarray]:
+        """Eigenvalues (ascending) and eigenvectors, computed once."""
+        if self._eigh is None:
+            self._eigh = np.linalg.eigh(self.matrix)
+        return self._eigh
+
+    def variance(self, w):
+        """Portfolio variance w' cov w, for one weight vector or a (k, n) stack of them."""
+        weights = np.atleast_2d(np.asarray(w, dtype=float))
+        var = np.einsum("ij,ij->i", weights @ self.matrix, weights)
+        return var[0] if np.ndim(w) == 1 else var
+
+    def volatility(self, w):
+        """Portfolio standard deviation."""
+        return np.sqrt(self.variance(w))
+
+    def solve(self, b):
+        """cov^-1 b through the cached Cholesky factor."""
+        from scipy.linalg import solve_triangular
+
+        L = self.cholesky()
+        y = solve_triangular(L, np.asarray(b, dtype=float), lower=True)
+        return solve_triangular(L.T, y, lower=False)
+
+
+class SampleCovariance(CovarianceEstimator):
+    """Sample covariance (ddof=1), the same estimate as compute_annualized_covariance."""
+
+    def _fit(self, values):
+        self._matrix = np.cov(values, rowvar=False, ddof=1).reshape(values.shape[1], -1) * self.periods_per_year
+
+
+class LedoitWolfCovariance(CovarianceEstimator):
+    """
+    Ledoit-Wolf shrinkage of the sample covariance towards a scaled identity matrix.
+
+    The shrinkage intensity is the optimal one from Ledoit & Wolf (2004) unless a fixed value
+    is given. The shrunk matrix is always well conditioned, even with more assets than days.
+
+    Args:
+        shrinkage: fixed intensity in [0, 1], or None to estimate it.
+    """
+
+    def __init__(self, shrinkage: float | None = None, periods_per_year: int = TRADING_DAYS):
+        super().__init__(periods_per_year)
+        self.shrinkage = shrinkage
+        self.shrinkage_ = None
+
+    def _fit(self, values):
+        T, n = values.shape
+        X = values - values.mean(axis=0)
+        S = X.T @ X / T
+        target = np.trace(S) / n
+
+        if self.shrinkage is None:
+            d2 = (np.sum(S * S) - 2 * target * np.trace(S) + n * target ** 2) / n
+            row_norms = np.einsum("ij,ij->i", X, X)
+            b2 = (np.sum(row_norms ** 2) - T * np.sum(S * S)) / (n * T ** 2)
+            self.shrinkage_ = 0.0 if d2 == 0 else min(b2, d2) / d2
+        else:
+            self.shrinkage_ = float(self.shrinkage)
+
+        shrunk = (1 - self.shrinkage_) * S
+        shrunk[np.diag_indices(n)] += self.shrinkage_ * target
+        self._matrix = shrunk * self.periods_per_year
+
+
+class EWMACovariance(CovarianceEstimator):
+    """
+    Exponentially weighted covariance: day t-k gets weight proportional to decay**k,
+    so the estimate follows volatility regimes faster than the equally weighted one.
+
+    Args:
+        decay: daily decay factor (0.94 is the RiskMetrics value).
+    """
+
+    def __init__(self, decay: float = 0.94, periods_per_year: int = TRADING_DAYS):
+        super().__init__(periods_per_year)
+        if not 0 < decay < 1:
+            raise ValueError("decay must be between 0 and 1")
+        self.decay = decay
+
+    def _fit(self, values):
+        weights = self.decay ** np.arange(len(values) - 1, -1, -1, dtype=float)
+        weights /= weights.sum()
+        X = values - weights @ values
+        self._matrix = (X * weights[:, None]).T @ X * self.periods_per_year
+
+
+class FactorCovariance(CovarianceEstimator):
+    """
+    Statistical factor model cov = B B' + diag(d) from the first principal components.
+
+    B (n, k) holds the loadings on the k largest principal components of the returns and d the
+    variance they leave unexplained. Portfolio risk costs O(n k) and solves use the Woodbury
+    identity, so the (n, n) matrix is only built if something asks for it.
+
+    Args:
+        n_factors: number of principal components kept.
+    """
+
+    def __init__(self, n_factors: int = 5, periods_per_year: int = TRADING_DAYS):
+        super().__init__(periods_per_year)
+        self.n_factors = n_factors
+        self.loadings = None
+        self.specific = None
+        self._woodbury = None
+
+    def _fit(self, values):
+        T, n = values.shape
+        X = (values - values.mean(axis=0)) / np.sqrt(T - 1)
+        _, s, vt = np.linalg.svd(X, full_matrices=False)
+        k = min(self.n_factors, len(s))
+        loadings = vt[:k].T * s[:k]
+        total = np.einsum("ij,ij->j", X, X)
+        specific = total - np.einsum("ij,ij->i", loadings, loadings)
+        # keep the model positive definite when the factors explain (almost) everything
+        specific = np.maximum(specific, 1e-8 * total.mean())
+
+        self.loadings = loadings * np.sqrt(self.periods_per_year)
+        self.specific = specific * self.periods_per_year
+        self._woodbury = None
+
+    @property
+    def n_assets(self) -> int:
+        return len(self.specific)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            if self.loadings is None:
+                raise ValueError("Estimator is not fitted yet")
+            self._matrix = self.loadings @ self.loadings.T
+            self._matrix[np.diag_indices(self.n_assets)] += self.specific
+        return self._matrix
+
+    def variance(self, w):
+        weights = np.atleast_2d(np.asarray(w, dtype=float))
+        var = np.sum((weights @ self.loadings) ** 2, axis=1) + (weights ** 2) @ self.specific
+        return var[0] if np.ndim(w) == 1 else var
+
+    def solve(self, b):
+        """
+        cov^-1 b = D^-1 b - D^-1 B (I + B' D^-1 B)^-1 B' D^-1 b, with the small (k, k)
+        system factorized once.
+        """
+        b = np.asarray(b, dtype=float)
+        d_inv_b = b / self.specific if b.ndim == 1 else b / self.specific[:, None]
+        if self._woodbury is None:
+            scaled = self.loadings / self.specific[:, None]
+            inner = np.eye(self.loadings.shape[1]) + self.loadings.T @ scaled
+            self._woodbury = (scaled, np.linalg.cholesky(inner))
+        scaled, L = self._woodbury
+        z = np.linalg.solve(L.T, np.linalg.solve(L, self.loadings.T @ d_inv_b))
+        return d_inv_b - scaled @ z
+
+
+ESTIMATORS = {
+    "sample": SampleCovariance,
+    "ledoit_wolf": LedoitWolfCovariance,
+    "ewma": EWMACovariance,
+    "factor": FactorCovariance,
+}
+
+
+def get_estimator(name: str, **kwargs) -> CovarianceEstimator:
+    """Create an (unfitted) estimator by name: "sample", "ledoit_wolf", "ewma" or "factor"."""
+    if name not in ESTIMATORS:
+        raise ValueError(f"Unknown covariance estimator: {name}")
+    return ESTIMATORS[name](**kwargs)
@@ -0,0 +1,152 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.instrumentation import timed_stage
+
+METHODS = ("normal", "student_t", "bootstrap")
+
+
+@timed_stage()
+def simulate_portfolio(
+    weights,
+    mu,
+    cov,
+    n_paths: int = 10_000,
+    horizon: int = 252,
+    method: str = "normal",
+    returns=None,
+    df: float = 5.0,
+    rebalance: bool = True,
+    initial_wealth: float = 1.0,
+    seed: int | None = None,
+    memory_budget_mb: float = 256,
+    n_jobs: int | None = None,
+) -> dict:
+    """
+    Monte Carlo projection of a portfolio's wealth over the next horizon trading days.
+
+    Daily asset returns are drawn from the annualized mu / cov (same conventions as
+    prepare_portfolio_inputs) as multivariate normal, multivariate Student-t scaled to the
+    same covariance, or by bootstrapping whole days of historical returns.
+
+    With daily rebalancing to the target weights, the portfolio return of a day is
+    w'mu_d + w'L z (times the common Student-t scale), i.e. univariate with variance w' cov w,
+    so only one number per path and day is drawn. Without rebalancing (weights drift), full
+    asset paths are simulated through the Cholesky factor L of the daily covariance.
+
+    Paths are simulated in chunks sized to stay within memory_budget_mb, each chunk with its
+    own child of SeedSequence(seed), so results don't depend on n_jobs.
+
+    Args:
+        weights: portfolio weights.
+        mu: annualized expected returns.
+        cov: annualized covariance matrix.
+        n_paths: number of simulated paths.
+        horizon: trading days simulated.
+        method: "normal", "student_t" or "bootstrap".
+        returns: daily historical returns (T, n) for the bootstrap.
+        df: degrees of freedom of the Student-t (> 2).
+        rebalance: rebalance daily to the weights (True) or let them drift (False).
+        initial_wealth: starting portfolio value.
+        seed: seed for reproducible runs.
+        memory_budget_mb: rough upper bound on the working memory of one chunk.
+        n_jobs: run chunks on this many worker processes (None or 1 runs in-process).
+
+    Returns:
+        dict with "terminal_wealth" and "max_drawdown" (one value per path) and a
+        "summary" Series (mean / median / 5% / 95% terminal wealth, probability of a loss,
+        mean and 95% max drawdown).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown simulation method: {method}")
+    if method == "student_t" and df <= 2:
+        raise ValueError("df must be greater than 2 for a finite covariance")
+    if method == "bootstrap" and returns is None:
+        raise ValueError("The bootstrap needs historical returns")
+
+    spec = _simulation_spec(weights, mu, cov, method, returns, df, rebalance)
+    n_assets = 1 if rebalance else len(spec["weights"])
+    # draws, asset growth and a few per-path temporaries per simulated path
+    bytes_per_path = 8 * horizon * (2 * n_assets + 3)
+    chunk = int(max(1, min(n_paths, memory_budget_mb * 2 ** 20 // bytes_per_path)))
+    sizes = [min(chunk, n_paths - start) for start in range(0, n_paths, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = ([spec] * len(sizes), sizes, [horizon] * len(sizes), seeds)
+
+    if n_jobs and n_jobs > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            parts = list(pool.map(_simulate_chunk, *args))
+    else:
+        parts = list(map(_simulate_chunk, *args))
+
+    terminal = np.concatenate([p[0] for p in parts]) * initial_wealth
+    drawdown = np.concatenate([p[1] for p in parts])
+    summary = pd.Series({
+        "mean_terminal": terminal.mean(),
+        "median_terminal": np.median(terminal),
+        "terminal_5%": np.quantile(terminal, 0.05),
+        "terminal_95%": np.quantile(terminal, 0.95),
+        "prob_loss": np.mean(terminal < initial_wealth),
+        "mean_max_drawdown": drawdown.mean(),
+        "max_drawdown_95%": np.quantile(drawdown, 0.95),
+    })
+    return {"terminal_wealth": terminal, "max_drawdown": drawdown, "summary": summary}
+
+
+def _simulation_spec(weights, mu, cov, method, returns, df, rebalance) -> dict:
+    """Daily parameters shared by every chunk."""
+    w = np.asarray(weights, dtype=float)
+    mean = (1 + np.asarray(mu, dtype=float)) ** (1 / 252) - 1
+    cov = np.asarray(cov, dtype=float) / 252
+    spec = {"method": method, "df": df, "rebalance": rebalance, "weights": w}
+
+    if method == "bootstrap":
+        history = np.asarray(returns, dtype=float)
+        history = history[~np.isnan(history).any(axis=1)]
+        spec["history"] = history @ w if rebalance else history
+    elif rebalance:
+        spec["mean"] = float(w @ mean)
+        spec["scale"] = float(np.sqrt(w @ cov @ w))
+    else:
+        spec["mean"] = mean
+        spec["cholesky"] = np.linalg.cholesky(cov)
+    return spec
+
+
+def _simulate_chunk(spec: dict, n_paths: int, horizon: int, seed) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    if spec["rebalance"]:
+        wealth = _draw_returns(rng, spec, (n_paths, horizon))
+        wealth += 1
+        np.cumprod(wealth, axis=1, out=wealth)
+    else:
+        growth = _draw_returns(rng, spec, (n_paths, horizon))
+        growth += 1
+        np.cumprod(growth, axis=1, out=growth)
+        wealth = growth @ spec["weights"]
+
+    peak = np.maximum.accumulate(wealth, axis=1)
+    np.maximum(peak, 1.0, out=peak)
+    drawdown = (1 - wealth / peak).max(axis=1)
+    return wealth[:, -1].copy(), drawdown
+
+
+def _draw_returns(rng, spec, shape) -> np.ndarray:
+    """Daily returns of shape (paths, days) for a rebalanced portfolio, (paths, days, n) otherwise."""
+    if spec["method"] == "bootstrap":
+        history = spec["history"]
+        return history[rng.integers(len(history), size=shape)]
+
+    if spec["rebalance"]:
+        draws = rng.standard_normal(shape)
+        draws *= spec["scale"]
+    else:
+        draws = rng.standard_normal(shape + (len(spec["mean"]),)) @ spec["cholesky"].T
+    if spec["method"] == "student_t":
+        df = spec["df"]
+        scale = np.sqrt((df - 2) / rng.chisquare(df, size=shape))
+        draws *= scale if spec["rebalance"] else scale[..., None]
+    draws += spec["mean"]
+    return draws
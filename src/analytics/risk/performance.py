@@ -0,0 +1,155 @@
+"""
+Performance statistics computed column-wise over a matrix of daily returns, so many strategies
+or portfolios (e.g. every ticker of an SMA batch or thousands of random portfolios) are
+evaluated in a handful of array passes instead of a Python loop.
+"""
+import numpy as np
+import pandas as pd
+
+from src.instrumentation import timed_stage
+
+METRICS = [
+    "total_return",
+    "cagr",
+    "volatility",
+    "sharpe",
+    "sortino",
+    "max_drawdown",
+    "max_drawdown_duration",
+    "calmar",
+    "hit_rate",
+    "turnover",
+]
+
+
+@timed_stage()
+def performance_report(returns, positions=None, rf: float = 0.0, periods_per_year: int = 252) -> pd.DataFrame:
+    """
+    Performance statistics of every column of a daily returns matrix.
+
+    Works on the "strategy_returns" of run_sma_strategy / run_ma_strategy_batch and, through
+    wealth_to_returns, on the cumulative curves of the Markowitz backtest. Missing returns
+    count as 0 (flat day).
+
+    Args:
+        returns: daily returns, DataFrame (one column per strategy / portfolio), Series or
+            array of shape (T,) or (T, N).
+        positions: optional positions or weights, same shape as returns, for the turnover
+            (0/1 positions give the number of trades per year).
+        rf: annual risk-free rate for the Sharpe and Sortino ratios.
+        periods_per_year: return periods per year.
+
+    Returns:
+        DataFrame with one row per column and the METRICS columns:
+          - total_return, cagr, volatility (annualized)
+          - sharpe, sortino (annualized, excess over rf)
+          - max_drawdown (negative fraction, from the starting capital) and
+            max_drawdown_duration (longest time under a previous peak, in periods)
+          - calmar (cagr / |max_drawdown|)
+          - hit_rate (share of positive days among days with a non-zero return)
+          - turnover (sum of absolute position changes per year, NaN without positions)
+    """
+    if isinstance(returns, pd.Series):
+        returns = returns.to_frame()
+    labels = returns.columns if isinstance(returns, pd.DataFrame) else None
+    values = np.asarray(returns, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    if positions is not None:
+        positions = np.asarray(positions, dtype=float).reshape(values.shape)
+    stats = performance_stats(values, positions, rf, periods_per_year)
+    return pd.DataFrame(stats, index=labels if labels is not None else range(values.shape[1]), columns=METRICS)
+
+
+def performance_stats(returns: np.ndarray, positions: np.ndarray | None = None, rf: float = 0.0,
+                      periods_per_year: int = 252, metrics=METRICS) -> np.ndarray:
+    """
+    (N, len(metrics)) array of performance_report for a (T, N) float returns array.
+    Only the requested metrics are computed (the sweep asks for four of them).
+    """
+    if np.isnan(returns).any():
+        returns = np.nan_to_num(returns, nan=0.0)
+    n_days = returns.shape[0]
+    years = n_days / periods_per_year
+    rf_daily = rf / periods_per_year
+    wealth = returns + 1
+    np.cumprod(wealth, axis=0, out=wealth)
+    needed = set(metrics)
+    out = {"total_return": wealth[-1] - 1}
+
+    if needed & {"volatility", "sharpe"}:
+        # mean and variance from one sum and one sum of squares (the risk-free shift doesn't
+        # change the variance)
+        mean = returns.sum(axis=0) / n_days
+        var = np.maximum(np.einsum("ij,ij->j", returns, returns) / n_days - mean ** 2, 0) * n_days / (n_days - 1)
+        std = np.sqrt(var)
+        out["volatility"] = std * np.sqrt(periods_per_year)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["sharpe"] = np.where(std > 1e-12, (mean - rf_daily) / std * np.sqrt(periods_per_year), np.nan)
+    if "sortino" in needed:
+        excess = returns - rf_daily
+        downside = np.sqrt(np.mean(np.minimum(excess, 0) ** 2, axis=0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["sortino"] = np.where(downside > 1e-12, excess.mean(axis=0) / downside * np.sqrt(periods_per_year),
+                                      np.nan)
+    if needed & {"cagr", "calmar"}:
+        cagr = np.full(returns.shape[1], np.nan)
+        np.power(wealth[-1], 1 / years, out=cagr, where=wealth[-1] > 0)
+        out["cagr"] = cagr - 1
+    if needed & {"max_drawdown", "max_drawdown_duration", "calmar"}:
+        out["max_drawdown"], out["max_drawdown_duration"] = drawdown_stats(
+            wealth, with_duration="max_drawdown_duration" in needed)
+    if "calmar" in needed:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["calmar"] = np.where(out["max_drawdown"] < 0, out["cagr"] / -out["max_drawdown"], np.nan)
+    if "hit_rate" in needed:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["hit_rate"] = np.count_nonzero(returns > 0, axis=0) / np.count_nonzero(returns, axis=0)
+    if "turnover" in needed:
+        if positions is None:
+            out["turnover"] = np.full(returns.shape[1], np.nan)
+        else:
+            positions = np.nan_to_num(positions)
+            changes = np.abs(positions[1:] - positions[:-1]).sum(axis=0) + np.abs(positions[0])
+            out["turnover"] = changes / years
+    return np.column_stack([out[name] for name in metrics])
+
+
+def drawdown_stats(wealth: np.ndarray, with_duration: bool = True) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Max drawdown (negative fraction) and longest drawdown duration (periods) per column of a
+    (T, N) wealth array that starts from a capital of 1.
+    """
+    peaks = np.maximum.accumulate(wealth, axis=0)
+    np.maximum(peaks, 1.0, out=peaks)
+    max_drawdown = (wealth / peaks).min(axis=0) - 1
+    if not with_duration:
+        return max_drawdown, None
+
+    # position of the latest peak at every date; the duration is the longest gap to it
+    steps = np.arange(1, len(wealth) + 1)[:, None]
+    last_peak = np.where(wealth >= peaks, steps, 0)
+    np.maximum.accumulate(last_peak, axis=0, out=last_peak)
+    duration = (steps - last_peak).max(axis=0, initial=0)
+    return max_drawdown, duration.astype(float)
+
+
+def wealth_to_returns(wealth, initial: float = 1.0):
+    """
+    Daily returns of cumulative wealth curves (e.g. backtest_portfolio or the "curves" of
+    run_backtest), the first one measured against the initial capital.
+
+    Args:
+        wealth: DataFrame, Series or array of wealth (growth of 1) per date.
+        initial: wealth before the first date.
+
+    Returns:
+        returns of the same type and shape.
+    """
+    if isinstance(wealth, (pd.DataFrame, pd.Series)):
+        returns = wealth.pct_change()
+        returns.iloc[0] = wealth.iloc[0] / initial - 1
+        return returns
+    wealth = np.asarray(wealth, dtype=float)
+    previous = np.concatenate([np.full((1,) + wealth.shape[1:], initial), wealth[:-1]])
+    return wealth / previous - 1
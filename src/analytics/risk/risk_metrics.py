@@ -1,17 +1,19 @@
 import pandas as pd
 import numpy as np
-from matplotlib import pyplot as plt
-from scipy.stats import kurtosis
-import seaborn as sns
+from src.data.panel import PricePanel
+from src.instrumentation import timed_stage
 
+@timed_stage()
 def clean_returns(prices: pd.DataFrame) -> pd.DataFrame:
     """
-        Convert price dataframe to clean daily returns.
+        Convert price dataframe (or PricePanel) to clean daily returns.
         Drops NaNs and resets index for easy analysis.
     """
-    print("prices", prices)
+    if isinstance(prices, PricePanel):
+        # a view on the panel's cached returns when no rows are dropped
+        return pd.DataFrame(prices.clean_returns(), index=prices.clean_return_dates(), columns=prices.tickers,
+                            copy=False)
     prices = prices.pct_change().dropna()
-    print("prices after pct change", prices)
     prices.columns.name = None
     return prices
 
@@ -20,6 +22,9 @@ def compute_covariance(prices):
     return prices.cov()
 
 def plot_covariance_heat_map(covariance):
+    import seaborn as sns
+    from matplotlib import pyplot as plt
+
     masked_cov_matrix = np.triu(np.ones_like(covariance, dtype=bool), k=1)
     plt.figure(figsize=(10,6))
 
@@ -27,11 +32,12 @@ def plot_covariance_heat_map(covariance):
                 fmt=".7f", cbar_kws={"label": "Covariance"})
 
     plt.title("Covariance Matrix")
-    print(covariance)
     plt.show()
 
 def compute_kurtosis(returns):
     """Computing the curtosis of returns for each asset"""
+    from scipy.stats import kurtosis
+
     kurt = kurtosis(returns, fisher = False)
     return pd.Series(kurt,index=returns.columns, name="Kurtosis")
 
@@ -50,6 +56,7 @@ def compute_sharpe_ratio(returns: pd.Series, rf: float = 0.02) -> float:
 
 
 
+@timed_stage()
 def compute_annualized_covariance(daily_returns):
     """
     Annualized covariance from daily returns.
@@ -0,0 +1,192 @@
+"""
+Value at Risk and Conditional Value at Risk (expected shortfall) of daily returns.
+
+Both are reported as positive loss fractions at a confidence level: a 95% VaR of 0.021 means
+that on 5% of days the loss is expected to exceed 2.1%. Three methods are available:
+  - "historical": empirical quantile of the returns (linear interpolation, like np.quantile);
+    CVaR is the mean of the returns at or below it
+  - "parametric": normal distribution with the sample mean and standard deviation
+  - "cornish_fisher": normal quantile adjusted for the sample skewness and excess kurtosis
+"""
+from bisect import bisect_left, bisect_right, insort
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from src.instrumentation import timed_stage
+
+METHODS = ("historical", "parametric", "cornish_fisher")
+
+# midpoints used to average the Cornish-Fisher quantile over the tail
+_TAIL_NODES = 200
+
+
+def value_at_risk(returns, confidence: float = 0.95, method: str = "historical", weights=None):
+    """
+    VaR per asset, or of the portfolio when weights are given.
+
+    Args:
+        returns: daily returns, DataFrame (one column per asset) or Series.
+        confidence: confidence level, e.g. 0.95 or 0.99.
+        method: "historical", "parametric" or "cornish_fisher".
+        weights: optional portfolio weights; the VaR of returns @ weights is returned.
+
+    Returns:
+        Series per asset for a DataFrame, float for a Series or a portfolio.
+    """
+    return _apply(returns, weights, lambda values: _var(values, confidence, method))
+
+
+def conditional_value_at_risk(returns, confidence: float = 0.95, method: str = "historical", weights=None):
+    """CVaR (expected shortfall) with the same arguments and output as value_at_risk."""
+    return _apply(returns, weights, lambda values: _cvar(values, confidence, method))
+
+
+def var_report(returns: pd.DataFrame, weights=None, confidence: float = 0.95) -> pd.DataFrame:
+    """
+    VaR and CVaR of every asset (and of the portfolio if weights are given) with all methods.
+
+    Returns:
+        DataFrame with one row per asset (plus "portfolio") and columns
+        (method, "VaR" / "CVaR").
+    """
+    columns = {}
+    for method in METHODS:
+        for label, fn in (("VaR", value_at_risk), ("CVaR", conditional_value_at_risk)):
+            values = fn(returns, confidence, method)
+            if weights is not None:
+                values = pd.concat([values, pd.Series({"portfolio": fn(returns, confidence, method, weights)})])
+            columns[(method, label)] = values
+    return pd.DataFrame(columns)
+
+
+@timed_stage()
+def rolling_var(returns, window: int = 252, confidence: float = 0.95, method: str = "historical",
+                weights=None, min_periods: int | None = None) -> dict:
+    """
+    VaR and CVaR over a rolling window of days.
+
+    The historical method keeps every column's window in a sorted list that is updated with
+    one insertion and one removal per day (binary search), so the quantile and the tail mean
+    are read off directly instead of sorting each window again. The parametric methods use
+    pandas' rolling moments.
+
+    Args:
+        returns: daily returns, DataFrame or Series.
+        window: window length in days.
+        confidence: confidence level.
+        method: "historical", "parametric" or "cornish_fisher".
+        weights: optional portfolio weights (the result then has a single "portfolio" column).
+        min_periods: non-missing returns required in a window (defaults to window).
+
+    Returns:
+        dict with "var" and "cvar" DataFrames aligned with returns.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown VaR method: {method}")
+    frame = returns.to_frame() if isinstance(returns, pd.Series) else returns
+    if weights is not None:
+        frame = (frame @ np.asarray(weights, dtype=float)).to_frame("portfolio")
+    min_periods = min_periods or window
+
+    if method == "historical":
+        var, cvar = _rolling_historical(frame.to_numpy(dtype=float), window, 1 - confidence, min_periods)
+        return {
+            "var": pd.DataFrame(var, index=frame.index, columns=frame.columns),
+            "cvar": pd.DataFrame(cvar, index=frame.index, columns=frame.columns),
+        }
+
+    rolling = frame.rolling(window, min_periods=min_periods)
+    mean, std = rolling.mean(), rolling.std()
+    if method == "parametric":
+        z = NormalDist().inv_cdf(1 - confidence)
+        return {"var": -(mean + z * std), "cvar": -(mean - std * _normal_tail_mean(1 - confidence))}
+    skew, kurt = rolling.skew(), rolling.kurt()
+    p = 1 - confidence
+    return {
+        "var": -(mean + std * _cornish_fisher_z(NormalDist().inv_cdf(p), skew, kurt)),
+        "cvar": -(mean + std * _cornish_fisher_tail_mean(p, skew, kurt)),
+    }
+
+
+def _apply(returns, weights, fn):
+    if weights is not None:
+        returns = np.asarray(returns, dtype=float) @ np.asarray(weights, dtype=float)
+        return float(fn(pd.Series(returns)))
+    if isinstance(returns, pd.Series):
+        return float(fn(returns))
+    return returns.apply(fn)
+
+
+def _var(values: pd.Series, confidence, method):
+    values = values.dropna()
+    p = 1 - confidence
+    if method == "historical":
+        return -np.quantile(values, p)
+    if method == "parametric":
+        return -(values.mean() + NormalDist().inv_cdf(p) * values.std())
+    if method == "cornish_fisher":
+        z = _cornish_fisher_z(NormalDist().inv_cdf(p), values.skew(), values.kurt())
+        return -(values.mean() + z * values.std())
+    raise ValueError(f"Unknown VaR method: {method}")
+
+
+def _cvar(values: pd.Series, confidence, method):
+    values = values.dropna()
+    p = 1 - confidence
+    if method == "historical":
+        return -values[values <= np.quantile(values, p)].mean()
+    if method == "parametric":
+        return -(values.mean() - values.std() * _normal_tail_mean(p))
+    if method == "cornish_fisher":
+        return -(values.mean() + values.std() * _cornish_fisher_tail_mean(p, values.skew(), values.kurt()))
+    raise ValueError(f"Unknown VaR method: {method}")
+
+
+def _normal_tail_mean(p: float) -> float:
+    """E[-Z | Z <= z_p] for a standard normal Z."""
+    return NormalDist().pdf(NormalDist().inv_cdf(p)) / p
+
+
+def _cornish_fisher_z(z, skew, kurt):
+    """Cornish-Fisher expansion of the standard normal quantile z (kurt is excess kurtosis)."""
+    return (z + (z ** 2 - 1) * skew / 6 + (z ** 3 - 3 * z) * kurt / 24
+            - (2 * z ** 3 - 5 * z) * skew ** 2 / 36)
+
+
+def _cornish_fisher_tail_mean(p, skew, kurt):
+    """
+    Mean of the Cornish-Fisher quantile over the tail probabilities (0, p]. The expansion is
+    linear in skew, kurt and skew**2, so only its coefficients are averaged over the nodes.
+    """
+    z = np.array([NormalDist().inv_cdf(p * (i + 0.5) / _TAIL_NODES) for i in range(_TAIL_NODES)])
+    return (z.mean() + ((z ** 2 - 1) / 6).mean() * skew + ((z ** 3 - 3 * z) / 24).mean() * kurt
+            - ((2 * z ** 3 - 5 * z) / 36).mean() * skew ** 2)
+
+
+def _rolling_historical(values: np.ndarray, window: int, p: float, min_periods: int):
+    n_rows, n_cols = values.shape
+    var = np.full((n_rows, n_cols), np.nan)
+    cvar = np.full((n_rows, n_cols), np.nan)
+    for col in range(n_cols):
+        column = values[:, col].tolist()
+        ordered: list[float] = []
+        for t, value in enumerate(column):
+            if value == value:  # skip NaN
+                insort(ordered, value)
+            if t >= window:
+                old = column[t - window]
+                if old == old:
+                    del ordered[bisect_left(ordered, old)]
+            n = len(ordered)
+            if n < min_periods or n == 0:
+                continue
+            # linear interpolation between order statistics, like np.quantile
+            pos = (n - 1) * p
+            lo = int(pos)
+            q = ordered[lo] + (pos - lo) * (ordered[min(lo + 1, n - 1)] - ordered[lo])
+            k = bisect_right(ordered, q, 0, min(n, lo + 2))
+            var[t, col] = -q
+            cvar[t, col] = -sum(ordered[:k]) / k
+    return var, cvar
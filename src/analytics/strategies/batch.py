@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.helpers.costs import CostModel
+from src.analytics.helpers.kernels import stop_loss_positions
+from src.data.panel import PricePanel
+from src.instrumentation import timed_stage
+
+
+def cumulative_sums(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Prefix sums of a (T, N) array and of its non-NaN counts, with a leading row of zeros.
+
+    Any window mean can then be read off in O(1) per element, which lets several
+    SMA windows share a single pass over the data.
+    """
+    valid = ~np.isnan(values)
+    sums = np.zeros((values.shape[0] + 1, values.shape[1]))
+    counts = np.zeros((values.shape[0] + 1, values.shape[1]), dtype=np.int64)
+    np.cumsum(np.where(valid, values, 0.0), axis=0, out=sums[1:])
+    np.cumsum(valid, axis=0, out=counts[1:])
+    return sums, counts
+
+
+def rolling_mean_from_sums(sums: np.ndarray, counts: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling mean with the semantics of pandas' rolling(window).mean(): NaN until the
+    window is full and whenever it contains a missing value.
+    """
+    n_rows = sums.shape[0] - 1
+    out = np.empty((n_rows, sums.shape[1]))
+    out[:window - 1] = np.nan
+    if window > n_rows:
+        return out
+    np.subtract(sums[window:], sums[:-window], out=out[window - 1:])
+    out[window - 1:] *= 1.0 / window
+    if counts[-1].min() < n_rows:
+        # only pay for the missing-value mask when there are missing values
+        out[window - 1:][(counts[window:] - counts[:-window]) != window] = np.nan
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """SMA of every column of a (T, N) array at once."""
+    return rolling_mean_from_sums(*cumulative_sums(values), window)
+
+
+def moving_average(prices: pd.DataFrame, window: int, kind: str = "sma") -> np.ndarray:
+    """
+    SMA or EMA of every column, as a (T, N) array.
+
+    The EMA uses the same definition as compute_ema (ewm(span=window, adjust=False)),
+    applied to the whole frame in one call.
+    """
+    if kind == "sma":
+        return rolling_mean(prices.to_numpy(dtype=float), window)
+    if kind == "ema":
+        return exponential_mean(prices.to_numpy(dtype=float), window)
+    raise ValueError(f"Unknown moving average kind: {kind}")
+
+
+def exponential_mean(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    EMA of every column with compute_ema's definition (ewm(span, adjust=False)).
+
+    Without missing values the recursion EMA(t) = a P(t) + (1 - a) EMA(t-1), EMA(0) = P(0)
+    is a first-order IIR filter and runs through scipy's lfilter; otherwise pandas handles
+    the missing-value rules.
+    """
+    if np.isnan(values).any():
+        return pd.DataFrame(values).ewm(span=span, adjust=False).mean().to_numpy()
+    from scipy.signal import lfilter
+
+    alpha = 2 / (span + 1)
+    initial = (1 - alpha) * values[:1]
+    ema, _ = lfilter([alpha], [1, alpha - 1], values, axis=0, zi=initial)
+    return ema
+
+
+def daily_returns_2d(values: np.ndarray) -> np.ndarray:
+    """Same as compute_daily_returns on a (T, N) array: pct change with missing values as 0."""
+    returns = np.zeros_like(values, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = values[1:] / values[:-1] - 1
+    returns[~np.isfinite(returns)] = 0.0
+    return returns
+
+
+def strategy_from_average(values: np.ndarray, average: np.ndarray, returns: np.ndarray | None = None):
+    """
+    Signals, next-day positions, and market/strategy daily returns for every column.
+
+    Same rules as generate_signals / build_positions / compute_strategy_returns:
+    long when price > average at the close, acted on the following session.
+    Pass returns (daily_returns_2d(values)) to reuse them across several averages.
+    """
+    signals = values > average
+    positions = np.zeros_like(signals)
+    positions[1:] = signals[:-1]
+    if returns is None:
+        returns = daily_returns_2d(values)
+    return signals.view(np.int8), positions.view(np.int8), returns, returns * positions
+
+
+@timed_stage()
+def run_ma_strategy_batch(prices: pd.DataFrame | pd.Series | PricePanel, window: int = 20, kind: str = "sma",
+                          keep_series: bool = True, costs: CostModel | None = None,
+                          stop_loss: float | None = None, trailing_stop: bool = False) -> dict:
+    """
+    Run the moving-average strategy on every column of a price DataFrame in one vectorized pass.
+
+    Args:
+        prices: close prices, one column per ticker (e.g. a single get_close_prices call),
+            or a PricePanel.
+        window: moving-average window (span for the EMA).
+        kind: "sma" or "ema".
+        keep_series: also return the full time series; when False only the per-ticker
+            summary is returned, which keeps results small for large universes.
+        costs: optional transaction cost model charged on every position change.
+        stop_loss: optional fractional stop-loss (e.g. 0.1); positions then come from the
+            stop_loss_positions state machine (src.analytics.helpers.kernels).
+        trailing_stop: measure the stop from the highest close since entry.
+
+    Returns:
+        dict with "summary" (one row per ticker: strategy_return, bh_return, n_trades, exposure)
+        and, if keep_series, the same series as run_sma_strategy as DataFrames:
+        "prices", "sma"/"ema", "signals", "positions", "strategy_returns", "strategy_cumu", "bh_cumu".
+    """
+    if isinstance(prices, PricePanel):
+        prices = prices.to_frame()
+    if isinstance(prices, pd.Series):
+        prices = prices.to_frame()
+    values = prices.to_numpy(dtype=float)
+
+    average = moving_average(prices, window, kind)
+    signals, positions, daily_returns, strat_returns = strategy_from_average(values, average)
+    if stop_loss is not None:
+        positions = stop_loss_positions(values, average, stop_loss, trailing_stop).astype(np.int8)
+        strat_returns = daily_returns * positions
+    if costs is not None:
+        strat_returns -= costs.costs(daily_returns, positions)
+
+    strat_growth = np.cumprod(1 + strat_returns, axis=0)
+    bh_growth = np.cumprod(1 + daily_returns, axis=0)
+
+    summary = pd.DataFrame(
+        {
+            "strategy_return": strat_growth[-1] - 1,
+            "bh_return": bh_growth[-1] - 1,
+            "n_trades": np.count_nonzero(positions[1:] != positions[:-1], axis=0),
+            "exposure": positions.mean(axis=0),
+        },
+        index=prices.columns,
+    )
+    result = {"summary": summary}
+    if not keep_series:
+        return result
+
+    def frame(data):
+        return pd.DataFrame(data, index=prices.index, columns=prices.columns)
+
+    result.update({
+        "prices": prices,
+        kind: frame(average),
+        "signals": frame(signals),
+        "positions": frame(positions),
+        "strategy_returns": frame(strat_returns),
+        "strategy_cumu": frame(strat_growth - 1),
+        "bh_cumu": frame(bh_growth - 1),
+    })
+    return result
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import numpy as np
+import pandas as pd
+
 from src.data.fetch_data import get_close_prices
 from src.analytics.helpers.returns import (
     compute_daily_returns,
     compute_cumulative_returns_from_returns,
     compute_sma,
 )
+from src.analytics.helpers.costs import CostModel, apply_costs
+from src.analytics.strategies.batch import run_ma_strategy_batch
+from src.analytics.risk.performance import performance_report
+from src.instrumentation import timed_stage
 
 def generate_signals(prices, sma):
     """Signal 1 if price > SMA, else 0 (computed at close of t, acted on at t+1)."""
@@ -19,10 +26,13 @@ def build_positions(signals):
     return positions
 
 
-def compute_strategy_returns(daily_returns, positions):
-    """Daily strategy returns: market return when in position, 0 when out."""
+def compute_strategy_returns(daily_returns, positions, costs: CostModel | None = None):
+    """
+    Daily strategy returns: market return when in position, 0 when out, minus the
+    transaction costs of every position change if a cost model is given.
+    """
     strategy_returns = daily_returns * positions
-    return strategy_returns
+    return apply_costs(strategy_returns, positions, daily_returns, costs)
 
 def compute_ema(prices, span):
     # now this is more complicated, because how do you define the weights ??
@@ -49,7 +59,15 @@ def compute_ema(prices, span):
 
     return prices.ewm(span=span, adjust=False).mean()
 
-def run_sma_strategy(ticker,window=20, period= "5y", start=None, end = None):
+def _strategy_report(strat_returns, daily_returns, positions):
+    """performance_report of the strategy next to buy & hold (always fully invested)."""
+    returns = pd.DataFrame({"strategy": strat_returns, "buy_and_hold": daily_returns})
+    held = np.column_stack([positions, np.ones(len(positions))])
+    return performance_report(returns, positions=held)
+
+
+@timed_stage()
+def run_sma_strategy(ticker,window=20, period= "5y", start=None, end = None, costs: CostModel | None = None):
     prices = (
         get_close_prices(ticker, start=start, end=end)
         if (start or end)
@@ -62,7 +80,7 @@ def run_sma_strategy(ticker,window=20, period= "5y", start=None, end = None):
     positions = build_positions(signals)
 
     daily_returns = compute_daily_returns(close_prices)
-    strat_returns = compute_strategy_returns(daily_returns, positions)
+    strat_returns = compute_strategy_returns(daily_returns, positions, costs)
 
     strat_cumulative = compute_cumulative_returns_from_returns(strat_returns)
     bh_cumulative = compute_cumulative_returns_from_returns(daily_returns)
@@ -75,9 +93,11 @@ def run_sma_strategy(ticker,window=20, period= "5y", start=None, end = None):
         "strategy_returns": strat_returns,
         "strategy_cumu": strat_cumulative,
         "bh_cumu": bh_cumulative,
+        "report": _strategy_report(strat_returns, daily_returns, positions),
     }
 
-def run_ema_strategy(ticker, window=20, period="5y", start=None, end=None):
+@timed_stage()
+def run_ema_strategy(ticker, window=20, period="5y", start=None, end=None, costs: CostModel | None = None):
     prices = (
         get_close_prices(ticker, start=start, end=end)
         if (start or end)
@@ -89,7 +109,7 @@ def run_ema_strategy(ticker, window=20, period="5y", start=None, end=None):
     positions = build_positions(signals)
 
     daily_returns = compute_daily_returns(close_prices)
-    strat_returns = compute_strategy_returns(daily_returns, positions)
+    strat_returns = compute_strategy_returns(daily_returns, positions, costs)
     strat_cumulative = compute_cumulative_returns_from_returns(strat_returns)
     bh_cumulative = compute_cumulative_returns_from_returns(strat_returns)
 
@@ -101,4 +121,21 @@ def run_ema_strategy(ticker, window=20, period="5y", start=None, end=None):
         "strategy_returns": strat_returns,
         "strategy_cumu": strat_cumulative,
         "bh_cumu": bh_cumulative,
-    }
\ No newline at end of file
+        "report": _strategy_report(strat_returns, daily_returns, positions),
+    }
+
+
+@timed_stage()
+def screen_tickers(tickers, window=20, kind="sma", period="5y", start=None, end=None, keep_series=False,
+                   costs: CostModel | None = None):
+    """
+    Run the SMA/EMA strategy on a whole universe with a single price fetch.
+
+    Returns the run_ma_strategy_batch result (per-ticker summary, plus the full series if keep_series).
+    """
+    prices = (
+        get_close_prices(tickers, start=start, end=end)
+        if (start or end)
+        else get_close_prices(tickers, period=period)
+    )
+    return run_ma_strategy_batch(prices, window=window, kind=kind, keep_series=keep_series, costs=costs)
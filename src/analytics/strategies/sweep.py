@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.strategies.batch import (
+    cumulative_sums,
+    daily_returns_2d,
+    exponential_mean,
+    rolling_mean_from_sums,
+    strategy_from_average,
+)
+from src.analytics.helpers.costs import CostModel
+from src.analytics.risk.performance import performance_stats
+from src.data.panel import PricePanel
+from src.instrumentation import timed_stage
+
+METRICS = ["total_return", "sharpe", "max_drawdown", "turnover"]
+
+
+@timed_stage()
+def sweep_ma_windows(
+    prices: pd.DataFrame | pd.Series | PricePanel,
+    windows=range(2, 251),
+    kinds=("sma", "ema"),
+    rf: float = 0.0,
+    n_jobs: int | None = None,
+    costs: CostModel | None = None,
+) -> pd.DataFrame:
+    """
+    Evaluate the moving-average strategy over a grid of windows (and SMA vs EMA).
+
+    All SMA windows are read off one shared cumulative sum of the prices, and the daily
+    returns (and the per-unit trading costs) are computed once, so each extra window only
+    costs the signal, cost and metric pass.
+
+    Args:
+        prices: close prices, one column per ticker, or a PricePanel. A panel opened with
+            open_price_matrix is mapped by every worker instead of being copied to it.
+        windows: iterable of window lengths (span for the EMA).
+        kinds: any of "sma" and "ema".
+        rf: annual risk-free rate for the Sharpe ratio.
+        n_jobs: split the grid across this many worker processes (None or 1 runs in-process).
+        costs: optional transaction cost model charged on every position change.
+
+    Returns:
+        DataFrame indexed by (kind, window, ticker) with columns
+        total_return, sharpe, max_drawdown and turnover (position changes per year).
+    """
+    if isinstance(prices, pd.Series):
+        prices = prices.to_frame()
+    if isinstance(prices, PricePanel):
+        values, columns = prices.values, prices.tickers
+        # store-backed panels pickle as their path, so workers map the file themselves
+        payload = prices if prices.source is not None else values
+    else:
+        values, columns = prices.to_numpy(dtype=float), prices.columns
+        payload = values
+    grid = [(kind, int(window)) for kind in kinds for window in windows]
+
+    if n_jobs and n_jobs > 1 and len(grid) > 1:
+        chunks = [grid[i::n_jobs] for i in range(n_jobs)]
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            parts = list(pool.map(_sweep_grid, [payload] * len(chunks), chunks, [rf] * len(chunks),
+                                  [costs] * len(chunks)))
+        results = dict(pair for part in parts for pair in part.items())
+    else:
+        results = _sweep_grid(values, grid, rf, costs)
+
+    rows = np.concatenate([results[key] for key in grid])
+    index = pd.MultiIndex.from_tuples(
+        [(kind, window, ticker) for kind, window in grid for ticker in columns],
+        names=["kind", "window", "ticker"],
+    )
+    return pd.DataFrame(rows, index=index, columns=METRICS)
+
+
+def best_windows(table: pd.DataFrame, metric: str = "sharpe") -> pd.DataFrame:
+    """Best (kind, window) per ticker for a metric of a sweep_ma_windows table."""
+    ascending = metric == "turnover"
+    ranked = table.sort_values(metric, ascending=ascending)
+    return ranked.groupby(level="ticker").head(1).reset_index(level=["kind", "window"])
+
+
+def _sweep_grid(values: np.ndarray | PricePanel, grid, rf: float, costs: CostModel | None = None) -> dict:
+    if isinstance(values, PricePanel):
+        values = values.values
+    values = np.asarray(values, dtype=float)
+    returns = daily_returns_2d(values)
+    sums, counts = cumulative_sums(values) if any(kind == "sma" for kind, _ in grid) else (None, None)
+    flip_costs = costs.flip_costs(returns) if costs is not None else None
+    results = {}
+    for kind, window in grid:
+        if kind == "sma":
+            average = rolling_mean_from_sums(sums, counts, window)
+        elif kind == "ema":
+            average = exponential_mean(values, window)
+        else:
+            raise ValueError(f"Unknown moving average kind: {kind}")
+        _, positions, _, strat_returns = strategy_from_average(values, average, returns)
+        if costs is not None:
+            # positions are 0/1, so every change is a full flip: charge it only where one happens
+            np.subtract(strat_returns[1:], flip_costs[1:], out=strat_returns[1:],
+                        where=positions[1:] != positions[:-1])
+            np.subtract(strat_returns[:1], flip_costs[:1], out=strat_returns[:1], where=positions[:1] != 0)
+        results[(kind, window)] = _metrics(strat_returns, positions, rf)
+    return results
+
+
+def _metrics(returns: np.ndarray, positions: np.ndarray, rf: float) -> np.ndarray:
+    """(N, 4) array of total return, Sharpe, max drawdown and turnover per column."""
+    return performance_stats(returns, positions, rf, metrics=METRICS)
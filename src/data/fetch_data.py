@@ -1,12 +1,18 @@
-import yfinance as yf
+import re
+
 import pandas as pd
 
+from src.data.price_cache import PriceCache, get_price_cache, period_to_range
+from src.instrumentation import timed_stage
+
 
+@timed_stage()
 def get_close_prices(
         tickers: list[str] | str,
         start: str | None = None,
         end: str | None = None,
-        period: str = "1d"):
+        period: str = "1d",
+        cache: PriceCache | None = None):
     """
     Fetched the daily close prices for one or more tickers
     and returns a clean dataframe ready for analysis
@@ -15,13 +21,43 @@ def get_close_prices(
         start: start date (optional)
         end: end data (optional)
         period: fallback period if no start and end are provided
+        cache: price cache to serve from (defaults to the process-wide one,
+            see src.data.price_cache.set_price_cache)
 
     Returns:
         Dataframe with datatime index and 1 close price column per ticker
 
     """
+    cache = cache or get_price_cache()
+    if cache is None:
+        return download_close_prices(tickers, start, end, period)
 
     if start or end:
+        range_start = pd.Timestamp(start) if start else pd.Timestamp("1970-01-01")
+        range_end = pd.Timestamp(end) if end else pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+        return cache.get(tickers, range_start, range_end)
+
+    range_start, range_end = period_to_range(period)
+    prices = cache.get(tickers, range_start, range_end)
+    n_days = re.fullmatch(r"(\d+)d", period.strip().lower())
+    if n_days:
+        prices = prices.tail(int(n_days.group(1)))
+    return prices
+
+
+@timed_stage()
+def download_close_prices(
+        tickers: list[str] | str,
+        start: str | None = None,
+        end: str | None = None,
+        period: str = "1d"):
+    """
+    Download close prices straight from yfinance, bypassing the cache.
+    Same output format as get_close_prices; also serves as the default PriceCache backend.
+    """
+    import yfinance as yf
+
+    if start is not None or end is not None:
         hist = yf.download(tickers, start=start, end=end)
     else:
         hist = yf.download(tickers, period=period)
@@ -0,0 +1,97 @@
+"""
+On-disk price matrix that many processes can memory-map read-only.
+
+A store is a directory holding:
+  - prices.npy: the (T, n) close price matrix (C order, float64 or float32)
+  - dates.npy: the T dates as int64 (in the unit recorded in the index)
+  - returns.npy: optionally, the (T-1, n) daily returns, so workers don't recompute them
+  - index.json: tickers, dtype, shape and the files present
+
+open_price_matrix() maps the files instead of reading them, so every worker shares the
+same pages of the OS file cache and opening a store costs no extra RAM.
+"""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.panel import PricePanel
+
+INDEX_FILE = "index.json"
+
+
+def write_price_matrix(prices: pd.DataFrame | PricePanel, directory: str | Path, dtype=None,
+                       with_returns: bool = True) -> Path:
+    """
+    Write prices to a memory-mappable store.
+
+    Args:
+        prices: price DataFrame (e.g. from get_close_prices) or PricePanel.
+        directory: store directory (created if needed; an existing store is replaced).
+        dtype: storage dtype, e.g. np.float32; defaults to the dtype of the prices.
+        with_returns: also store the daily returns.
+
+    Returns:
+        the store directory.
+    """
+    panel = prices if isinstance(prices, PricePanel) else PricePanel.from_frame(prices, dtype=dtype)
+    if dtype is not None and panel.dtype != np.dtype(dtype):
+        panel = PricePanel(panel.values, panel.dates, panel.tickers, dtype=dtype)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    files = {"prices": "prices.npy", "dates": "dates.npy"}
+    _save(directory / files["prices"], panel.values)
+    _save(directory / files["dates"], panel.dates.asi8)
+    if with_returns:
+        files["returns"] = "returns.npy"
+        _save(directory / files["returns"], panel.returns)
+    elif (directory / "returns.npy").exists():
+        (directory / "returns.npy").unlink()
+
+    index = {
+        "tickers": [str(t) for t in panel.tickers],
+        "dtype": panel.dtype.str,
+        "date_unit": panel.dates.unit,
+        "shape": list(panel.shape),
+        "files": files,
+    }
+    tmp = directory / (INDEX_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp, directory / INDEX_FILE)
+    return directory
+
+
+def open_price_matrix(directory: str | Path) -> PricePanel:
+    """
+    Open a store as a read-only PricePanel backed by memory maps (no copy of the data).
+
+    The panel remembers where it came from: pickling it (e.g. to send it to a worker process)
+    only sends the path, and the worker maps the same files.
+    """
+    directory = Path(directory)
+    with open(directory / INDEX_FILE) as f:
+        index = json.load(f)
+    files = index["files"]
+    values = np.load(directory / files["prices"], mmap_mode="r")
+    dates = pd.DatetimeIndex(np.load(directory / files["dates"]).view(f"datetime64[{index['date_unit']}]"))
+    panel = PricePanel(values, dates, index["tickers"])
+    if "returns" in files:
+        panel._returns = np.load(directory / files["returns"], mmap_mode="r")
+    panel.source = (str(directory), 0, len(dates))
+    return panel
+
+
+def _reopen(directory: str, start: int, stop: int) -> PricePanel:
+    """Unpickling hook for store-backed panels: map the store again and take the same rows."""
+    panel = open_price_matrix(directory)
+    return panel if (start, stop) == (0, len(panel)) else panel._rows(start, stop)
+
+
+def _save(path: Path, array: np.ndarray):
+    tmp = path.with_suffix(".tmp.npy")
+    np.save(tmp, np.ascontiguousarray(array))
+    os.replace(tmp, path)
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+
+class PricePanel:
+    """
+    Compact close-price panel: one date index shared by every ticker plus a C-contiguous
+    (T, n) matrix, optionally float32 to halve memory.
+
+    Slicing by date returns a view on the same memory, and daily returns are computed once
+    per panel (slices reuse their parent's returns as views). The analytics in returns.py,
+    risk_metrics.py and markowitz.py accept a panel wherever they take a price DataFrame.
+
+    Args:
+        values: (T, n) close prices, rows sorted by date.
+        dates: DatetimeIndex of length T.
+        tickers: n column labels.
+        dtype: storage dtype (float64 or float32); None keeps the dtype of values.
+    """
+
+    def __init__(self, values, dates, tickers, dtype=None):
+        values = np.asarray(values, dtype=dtype)
+        if values.dtype.kind != "f":
+            values = values.astype(np.float64)
+        self.values = np.ascontiguousarray(values.reshape(len(values), -1))
+        self.dates = pd.DatetimeIndex(dates)
+        self.tickers = pd.Index(tickers)
+        if self.values.shape != (len(self.dates), len(self.tickers)):
+            raise ValueError(f"values of shape {self.values.shape} don't match "
+                             f"{len(self.dates)} dates x {len(self.tickers)} tickers")
+        # (parent panel, row offset) when this panel is a date slice of another one
+        self._parent = None
+        self._returns = None
+        # (store directory, first row, end row) for panels mapped from an on-disk store
+        # (see src.data.mmap_store); pickling such a panel only sends the path
+        self.source = None
+
+    @classmethod
+    def from_frame(cls, prices: pd.DataFrame | pd.Series, dtype=None) -> "PricePanel":
+        """Build a panel from a price DataFrame (e.g. get_close_prices output)."""
+        if isinstance(prices, pd.Series):
+            prices = prices.to_frame()
+        prices = prices.sort_index() if not prices.index.is_monotonic_increasing else prices
+        return cls(prices.to_numpy(dtype=dtype), prices.index, prices.columns)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.values.shape
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __repr__(self):
+        span = f"{self.dates[0].date()}..{self.dates[-1].date()}" if len(self) else "empty"
+        return f"PricePanel({len(self)} dates x {len(self.tickers)} tickers, {self.dtype}, {span})"
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame over the same memory (no copy)."""
+        return pd.DataFrame(self.values, index=self.dates, columns=self.tickers, copy=False)
+
+    def loc(self, start=None, end=None) -> "PricePanel":
+        """Zero-copy view of the dates in [start, end] (inclusive, like DataFrame.loc)."""
+        i0 = 0 if start is None else self.dates.searchsorted(pd.Timestamp(start), side="left")
+        i1 = len(self) if end is None else self.dates.searchsorted(pd.Timestamp(end), side="right")
+        return self._rows(i0, i1)
+
+    def _rows(self, i0: int, i1: int) -> "PricePanel":
+        view = PricePanel(self.values[i0:i1], self.dates[i0:i1], self.tickers)
+        view._parent = (self, i0)
+        if self.source is not None:
+            directory, first, _ = self.source
+            view.source = (directory, first + i0, first + max(i1, i0))
+        return view
+
+    def __reduce__(self):
+        if self.source is not None:
+            from src.data.mmap_store import _reopen
+            return _reopen, self.source
+        return super().__reduce__()
+
+    def select(self, tickers) -> "PricePanel":
+        """Panel with a subset of the tickers, in the given order (copies the columns)."""
+        positions = self.tickers.get_indexer(list(tickers))
+        if (positions < 0).any():
+            missing = [t for t, p in zip(tickers, positions) if p < 0]
+            raise KeyError(f"Tickers not in panel: {missing}")
+        return PricePanel(self.values[:, positions], self.dates, self.tickers[positions])
+
+    @property
+    def returns(self) -> np.ndarray:
+        """
+        (T-1, n) simple daily returns (pct_change without the first row), same dtype as the
+        prices. Computed once; read-only.
+        """
+        if self._returns is None:
+            if self._parent is not None:
+                parent, offset = self._parent
+                self._returns = parent.returns[offset:offset + max(len(self) - 1, 0)]
+            else:
+                returns = np.empty((max(len(self) - 1, 0), self.shape[1]), dtype=self.dtype)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    np.divide(self.values[1:], self.values[:-1], out=returns)
+                returns -= 1
+                returns.flags.writeable = False
+                self._returns = returns
+        return self._returns
+
+    def clean_returns(self) -> np.ndarray:
+        """Returns with incomplete rows dropped, like clean_returns (a view when nothing is missing)."""
+        returns = self.returns
+        missing = np.isnan(returns).any(axis=1)
+        return returns[~missing] if missing.any() else returns
+
+    def clean_return_dates(self) -> pd.DatetimeIndex:
+        returns = self.returns
+        return self.dates[1:][~np.isnan(returns).any(axis=1)]
+
+    def daily_returns(self) -> np.ndarray:
+        """(T, n) returns with compute_daily_returns' rules: first row and missing values are 0."""
+        out = np.zeros(self.shape, dtype=self.dtype)
+        out[1:] = self.returns
+        out[~np.isfinite(out)] = 0
+        return out
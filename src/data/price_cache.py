@@ -0,0 +1,278 @@
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from src.instrumentation import get_logger, timed_stage
+
+logger = get_logger(__name__)
+
+
+def default_cache_dir() -> Path:
+    """
+    Root directory for everything OptiFund keeps on disk between runs.
+
+    Uses $OPTIFUND_CACHE_DIR when set, ~/.cache/optifund otherwise.
+    """
+    root = os.environ.get("OPTIFUND_CACHE_DIR")
+    return Path(root) if root else Path.home() / ".cache" / "optifund"
+
+
+def period_to_range(period: str, today: pd.Timestamp | None = None) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """
+    Translate a yfinance style period ("5d", "6mo", "1y", "ytd", "max") into an explicit
+    [start, end) calendar range ending after today.
+
+    Day periods count trading days in yfinance, so the range is padded with extra
+    calendar days and callers are expected to keep only the last N rows.
+    """
+    today = (today or pd.Timestamp.today()).normalize()
+    end = today + pd.Timedelta(days=1)
+    period = period.strip().lower()
+
+    if period == "max":
+        return pd.Timestamp("1970-01-01"), end
+    if period == "ytd":
+        return pd.Timestamp(year=today.year, month=1, day=1), end
+    if period.endswith("mo"):
+        return today - pd.DateOffset(months=int(period[:-2])), end
+    if period.endswith("y"):
+        return today - pd.DateOffset(years=int(period[:-1])), end
+    if period.endswith("wk"):
+        return today - pd.DateOffset(weeks=int(period[:-2])), end
+    if period.endswith("d"):
+        n_days = int(period[:-1])
+        return today - pd.Timedelta(days=n_days * 7 // 5 + 5), end
+
+    raise ValueError(f"Unsupported period: {period}")
+
+
+class LocalFileBackend:
+    """
+    Offline stand-in for the yfinance backend.
+
+    Reads one csv per ticker ("<TICKER>.csv" with a date column and a close column)
+    from a directory, which is handy for tests and for running without network access.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.calls: list[tuple[list[str], pd.Timestamp, pd.Timestamp]] = []
+
+    def __call__(self, tickers: list[str], start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        self.calls.append((list(tickers), start, end))
+        columns = {}
+        for ticker in tickers:
+            path = self.directory / f"{ticker}.csv"
+            if not path.exists():
+                continue
+            series = pd.read_csv(path, index_col=0, parse_dates=True).iloc[:, 0]
+            columns[ticker] = series[(series.index >= start) & (series.index < end)]
+        return pd.DataFrame(columns)
+
+
+class PriceCache:
+    """
+    On-disk cache of daily close prices, one file per ticker.
+
+    Every ticker keeps a list of [start, end) date intervals that were already fetched from
+    the backend, up to the last price received. A lookup only downloads the gaps between
+    those intervals and the requested range, merges them into the stored series and serves
+    the rest from disk.
+
+    Args:
+        directory: folder holding the per-ticker files and the coverage index.
+        backend: callable (tickers, start, end) -> close price DataFrame, one column per
+            ticker; tickers listed in the frame's attrs["failed"] are not marked as covered.
+            Defaults to a FetchScheduler over the yfinance download.
+        file_format: "parquet" when pyarrow is installed, "pickle" otherwise.
+    """
+
+    index_name = "_coverage.json"
+
+    def __init__(self, directory: str | Path, backend=None, file_format: str | None = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if backend is None:
+            from src.data.scheduler import FetchScheduler
+            backend = FetchScheduler()
+        self.backend = backend
+        self.file_format = file_format or _default_file_format()
+        self._coverage = self._load_coverage()
+
+    @timed_stage("price_cache.get")
+    def get(self, tickers: list[str] | str, start, end) -> pd.DataFrame:
+        """
+        Return close prices for tickers on [start, end), fetching only missing gaps.
+        """
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        tickers = [t.upper().strip() for t in tickers]
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        # today's bar is still moving, so coverage never extends past it
+        horizon = pd.Timestamp.today().normalize()
+
+        gaps_by_range: dict[tuple[pd.Timestamp, pd.Timestamp], list[str]] = {}
+        for ticker in tickers:
+            for gap in self._missing(ticker, start, end):
+                gaps_by_range.setdefault(gap, []).append(ticker)
+
+        for (gap_start, gap_end), gap_tickers in gaps_by_range.items():
+            logger.debug("fetching %d tickers for %s..%s", len(gap_tickers), gap_start.date(), gap_end.date())
+            fetched = self.backend(gap_tickers, gap_start, gap_end)
+            failed = set(fetched.attrs.get("failed", ()))
+            for ticker in gap_tickers:
+                if ticker in failed:
+                    # the download failed, try this range again next time
+                    continue
+                has_new = ticker in fetched.columns and fetched[ticker].notna().any()
+                received_end = gap_start
+                if has_new:
+                    received_end = self._merge(ticker, fetched[ticker].dropna()) + pd.Timedelta(days=1)
+                elif not self._path(ticker).exists():
+                    # nothing known about this ticker yet (bad symbol or failed download),
+                    # so don't remember the range as covered
+                    continue
+                covered_end = min(gap_end, horizon)
+                # yfinance returns NaN instead of raising when a ticker fails or is throttled, so
+                # weekdays after the last price received are left uncovered and fetched again
+                if _has_weekdays(received_end, covered_end):
+                    covered_end = received_end
+                if gap_start < covered_end:
+                    self._add_coverage(ticker, gap_start, covered_end)
+        if gaps_by_range:
+            self._save_coverage()
+
+        frames = {ticker: self._read(ticker) for ticker in tickers}
+        prices = pd.DataFrame({t: s[(s.index >= start) & (s.index < end)] for t, s in frames.items()})
+        prices = prices.reindex(columns=tickers).sort_index()
+        prices.index.name = "Date"
+        return prices.dropna(how="all")
+
+    def clear(self, ticker: str | None = None):
+        """Forget cached data for one ticker, or for everything."""
+        tickers = [ticker.upper()] if ticker else list(self._coverage)
+        for t in tickers:
+            self._coverage.pop(t, None)
+            self._path(t).unlink(missing_ok=True)
+        self._save_coverage()
+
+    def _missing(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp):
+        gaps = []
+        cursor = start
+        for lo, hi in self._intervals(ticker):
+            if hi <= cursor:
+                continue
+            if lo >= end:
+                break
+            if lo > cursor:
+                gaps.append((cursor, lo))
+            cursor = max(cursor, hi)
+            if cursor >= end:
+                break
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def _intervals(self, ticker: str):
+        return [(pd.Timestamp(lo), pd.Timestamp(hi)) for lo, hi in self._coverage.get(ticker, [])]
+
+    def _add_coverage(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp):
+        intervals = sorted(self._intervals(ticker) + [(start, end)])
+        merged = [intervals[0]]
+        for lo, hi in intervals[1:]:
+            if lo <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+            else:
+                merged.append((lo, hi))
+        self._coverage[ticker] = [[lo.strftime("%Y-%m-%d"), hi.strftime("%Y-%m-%d")] for lo, hi in merged]
+
+    def _merge(self, ticker: str, new: pd.Series) -> pd.Timestamp:
+        """Merge new prices into the stored series; returns the last date of new."""
+        new = new.copy()
+        new.index = pd.DatetimeIndex(new.index).tz_localize(None).normalize()
+        current = self._read(ticker)
+        merged = new.combine_first(current) if not current.empty else new
+        merged = merged[~merged.index.duplicated(keep="first")].sort_index()
+        self._write(ticker, merged.astype("float64"))
+        return new.index.max()
+
+    def _path(self, ticker: str) -> Path:
+        safe = ticker.replace("/", "_")
+        suffix = "parquet" if self.file_format == "parquet" else "pkl"
+        return self.directory / f"{safe}.{suffix}"
+
+    def _read(self, ticker: str) -> pd.Series:
+        path = self._path(ticker)
+        if not path.exists():
+            return pd.Series(dtype="float64", name=ticker, index=pd.DatetimeIndex([]))
+        if self.file_format == "parquet":
+            frame = pd.read_parquet(path)
+        else:
+            frame = pd.read_pickle(path)
+        series = frame["close"]
+        series.name = ticker
+        return series
+
+    def _write(self, ticker: str, series: pd.Series):
+        frame = series.rename("close").to_frame()
+        path = self._path(ticker)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        if self.file_format == "parquet":
+            frame.to_parquet(tmp)
+        else:
+            frame.to_pickle(tmp)
+        os.replace(tmp, path)
+
+    def _load_coverage(self) -> dict:
+        path = self.directory / self.index_name
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_coverage(self):
+        path = self.directory / self.index_name
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._coverage, f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+
+
+def _has_weekdays(start: pd.Timestamp, end: pd.Timestamp) -> bool:
+    """True when [start, end) contains a Monday-Friday date."""
+    return start < end and len(pd.bdate_range(start, end - pd.Timedelta(days=1))) > 0
+
+
+def _default_file_format() -> str:
+    try:
+        import pyarrow  # noqa: F401
+        return "parquet"
+    except ImportError:
+        return "pickle"
+
+
+_price_cache: PriceCache | None = None
+_cache_disabled = os.environ.get("OPTIFUND_DISABLE_CACHE", "") not in ("", "0")
+
+
+def get_price_cache() -> PriceCache | None:
+    """
+    Process-wide cache used by get_close_prices, created on first use.
+
+    Returns None when caching was turned off with set_price_cache(None) or
+    $OPTIFUND_DISABLE_CACHE.
+    """
+    global _price_cache
+    if _cache_disabled:
+        return None
+    if _price_cache is None:
+        _price_cache = PriceCache(default_cache_dir() / "prices")
+    return _price_cache
+
+
+def set_price_cache(cache: PriceCache | None):
+    """Swap the process-wide cache (e.g. for one backed by LocalFileBackend); None disables it."""
+    global _price_cache, _cache_disabled
+    _price_cache = cache
+    _cache_disabled = cache is None
@@ -0,0 +1,177 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from src.instrumentation import get_logger, timed_stage
+
+logger = get_logger(__name__)
+
+OK, MISSING, FAILED = "ok", "missing", "failed"
+
+
+@dataclass
+class FetchResult:
+    """
+    Outcome of a scheduled download.
+
+    Attributes:
+        prices: close prices of every ticker that came back, one column per ticker.
+        status: ticker -> "ok", "missing" (the backend returned no data for it) or
+            "failed" (its batch kept raising after all retries).
+        errors: ticker -> last error message, for failed tickers.
+    """
+
+    prices: pd.DataFrame
+    status: dict[str, str]
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def failed(self) -> list[str]:
+        return [t for t, s in self.status.items() if s == FAILED]
+
+    @property
+    def missing(self) -> list[str]:
+        return [t for t, s in self.status.items() if s == MISSING]
+
+
+class RateLimiter:
+    """
+    Token bucket allowing rate calls per second on average and bursts of up to burst calls.
+    Thread safe; clock and sleep can be swapped out in tests.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call is allowed."""
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self.sleep(wait)
+
+
+class FetchScheduler:
+    """
+    Downloads a large universe in batches with bounded concurrency, retries and a rate limit.
+
+    Each batch goes to the backend on its own; a batch that raises is retried with exponential
+    backoff, and if it still fails only its tickers are reported as failed. Instances are also
+    valid PriceCache backends (see __call__).
+
+    Args:
+        backend: callable (tickers, start, end) -> close price DataFrame, one column per
+            ticker. Defaults to the yfinance download.
+        batch_size: tickers per backend call.
+        max_workers: batches downloaded at the same time.
+        max_retries: retries per batch after the first attempt.
+        backoff: delay before the first retry in seconds, doubled on every retry.
+        max_backoff: upper bound on the delay between retries.
+        rate_limit: backend calls per second (None for no limit).
+        burst: calls allowed back to back before the rate limit kicks in.
+        jitter: randomize each delay between 50% and 100% so retries don't line up.
+        sleep: sleep function (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        batch_size: int = 100,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        rate_limit: float | None = 2.0,
+        burst: int = 4,
+        jitter: bool = True,
+        sleep=time.sleep,
+    ):
+        if backend is None:
+            from src.data.fetch_data import download_close_prices
+            backend = download_close_prices
+        self.backend = backend
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.sleep = sleep
+        self.limiter = RateLimiter(rate_limit, burst, sleep=sleep) if rate_limit else None
+
+    @timed_stage("scheduler.fetch")
+    def fetch(self, tickers: list[str] | str, start=None, end=None) -> FetchResult:
+        """
+        Download close prices for all tickers on [start, end).
+
+        Returns:
+            FetchResult with the prices of every ticker that succeeded and a status per ticker.
+        """
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        tickers = list(dict.fromkeys(t.upper().strip() for t in tickers))
+        batches = [tickers[i:i + self.batch_size] for i in range(0, len(tickers), self.batch_size)]
+
+        status, errors, frames = {}, {}, []
+        if batches:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(batches)))) as pool:
+                outcomes = list(pool.map(lambda batch: self._fetch_batch(batch, start, end), batches))
+            for batch, (prices, error) in zip(batches, outcomes):
+                if error is not None:
+                    status.update(dict.fromkeys(batch, FAILED))
+                    errors.update(dict.fromkeys(batch, error))
+                    continue
+                prices = prices.rename(columns=str.upper)
+                for ticker in batch:
+                    has_data = ticker in prices.columns and prices[ticker].notna().any()
+                    status[ticker] = OK if has_data else MISSING
+                frames.append(prices[[t for t in batch if status[t] == OK]])
+
+        prices = pd.concat(frames, axis=1).sort_index() if frames else pd.DataFrame()
+        failed = [t for t in tickers if status[t] == FAILED]
+        if failed:
+            logger.warning("%d of %d tickers failed to download", len(failed), len(tickers))
+        return FetchResult(prices=prices, status=status, errors=errors)
+
+    def __call__(self, tickers: list[str], start, end) -> pd.DataFrame:
+        """
+        PriceCache backend interface. Failed tickers are listed in prices.attrs["failed"],
+        so the cache doesn't mark their range as covered.
+        """
+        result = self.fetch(tickers, start, end)
+        prices = result.prices
+        prices.attrs["failed"] = result.failed
+        return prices
+
+    def _fetch_batch(self, batch, start, end):
+        for attempt in range(self.max_retries + 1):
+            if self.limiter:
+                self.limiter.acquire()
+            try:
+                return self.backend(batch, start, end), None
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                if attempt == self.max_retries:
+                    return None, error
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+                if self.jitter:
+                    delay *= random.uniform(0.5, 1.0)
+                logger.debug("batch of %d failed (%s), retrying in %.2fs", len(batch), error, delay)
+                self.sleep(delay)
@@ -10,24 +10,30 @@ from visualization.plot import plot_correlation_heatmap
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 out_dir = BASE_DIR / "src" / "plots" / "risk"
-out_dir.mkdir(parents=True, exist_ok=True)
 
 
-tickers = ["JPM", "XEQT.TO", "VEQT.TO", "TSLA", "TLT"]
+def main():
+    out_dir.mkdir(parents=True, exist_ok=True)
 
-prices = get_close_prices(tickers, period="5y")
-returns = clean_returns(prices)
+    tickers = ["JPM", "XEQT.TO", "VEQT.TO", "TSLA", "TLT"]
 
-cov = compute_covariance(returns)
-corr = compute_correlation(returns)
-kurt = compute_kurtosis(returns)
-sharpe_jpm = compute_sharpe_ratio(returns["JPM"])
-print("prices", prices)
-print("returns", returns)
+    prices = get_close_prices(tickers, period="5y")
+    returns = clean_returns(prices)
 
-print("Covariance:\n", cov)
-print("Correlation:\n", corr)
-print(f"\nJPM Sharpe Ratio: {sharpe_jpm:.2f}")
+    cov = compute_covariance(returns)
+    corr = compute_correlation(returns)
+    kurt = compute_kurtosis(returns)
+    sharpe_jpm = compute_sharpe_ratio(returns["JPM"])
+    print("prices", prices)
+    print("returns", returns)
 
-plot_covariance_heatmap(cov, path=out_dir / "covariance_heatmap.png", return_fig=False)
-plot_correlation_heatmap(corr, path=out_dir / "correlation_heatmap.png", return_fig=False)
+    print("Covariance:\n", cov)
+    print("Correlation:\n", corr)
+    print(f"\nJPM Sharpe Ratio: {sharpe_jpm:.2f}")
+
+    plot_covariance_heatmap(cov, path=out_dir / "covariance_heatmap.png", return_fig=False)
+    plot_correlation_heatmap(corr, path=out_dir / "correlation_heatmap.png", return_fig=False)
+
+
+if __name__ == "__main__":
+    main()
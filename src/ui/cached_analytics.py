@@ -0,0 +1,77 @@
+"""
+Memoized analytics for the Streamlit pages.
+
+Every stage is cached on its own inputs only, so a rerun recomputes just the stages whose
+inputs changed: moving the "random portfolios" slider regenerates the cloud but reuses the
+fetched prices, mu / cov and both optimal portfolios. Caches are bounded (least recently
+used entries are evicted) and expire so intraday prices get refreshed.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.analytics.optimization.cla import EfficientFrontier
+from src.analytics.optimization.markowitz import (
+    compute_min_var_portfolio,
+    maximize_sharpe_ratio,
+    portfolio_stats,
+    prepare_portfolio_inputs,
+)
+from src.analytics.optimization.random_portfolios import generate_portfolios
+from src.analytics.strategies.sma_strategy import run_sma_strategy
+from src.data.fetch_data import get_close_prices
+
+MAX_ENTRIES = 32
+TTL_SECONDS = 3600
+
+
+@st.cache_data(max_entries=MAX_ENTRIES, ttl=TTL_SECONDS, show_spinner="Fetching prices...")
+def load_prices(tickers: tuple[str, ...], period: str) -> pd.DataFrame:
+    return get_close_prices(list(tickers), period=period)
+
+
+@st.cache_data(max_entries=MAX_ENTRIES, ttl=TTL_SECONDS, show_spinner=False)
+def portfolio_inputs(tickers: tuple[str, ...], period: str):
+    """mu and cov for the tickers over period."""
+    return prepare_portfolio_inputs(load_prices(tickers, period))
+
+
+@st.cache_data(max_entries=MAX_ENTRIES, ttl=TTL_SECONDS, show_spinner=False)
+def min_variance_portfolio(tickers: tuple[str, ...], period: str) -> dict:
+    """Min-variance weights and stats (they don't depend on the risk-free rate)."""
+    mu, cov = portfolio_inputs(tickers, period)
+    weights = compute_min_var_portfolio(mu, cov)
+    return {"weights": weights, "stats": portfolio_stats(weights, mu, cov)}
+
+
+@st.cache_data(max_entries=MAX_ENTRIES, ttl=TTL_SECONDS, show_spinner=False)
+def max_sharpe_portfolio(tickers: tuple[str, ...], period: str, rf: float) -> dict:
+    """Max-Sharpe weights and stats for the given risk-free rate."""
+    mu, cov = portfolio_inputs(tickers, period)
+    weights = maximize_sharpe_ratio(mu, cov, rf)
+    return {"weights": weights, "stats": portfolio_stats(weights, mu, cov)}
+
+
+@st.cache_data(max_entries=MAX_ENTRIES, ttl=TTL_SECONDS, show_spinner=False)
+def frontier_curve(tickers: tuple[str, ...], period: str) -> pd.DataFrame | None:
+    """
+    Exact efficient frontier (risk / ret points) from the Critical Line Algorithm, or None
+    when the covariance is too ill-conditioned for it (the chart then shows only the QP
+    optimized portfolios).
+    """
+    mu, cov = portfolio_inputs(tickers, period)
+    try:
+        return EfficientFrontier(mu, cov).curve()
+    except np.linalg.LinAlgError:
+        return None
+
+
+@st.cache_data(max_entries=MAX_ENTRIES, ttl=TTL_SECONDS, show_spinner=False)
+def random_portfolios(tickers: tuple[str, ...], period: str, rf: float, n_portfolios: int) -> pd.DataFrame:
+    mu, cov = portfolio_inputs(tickers, period)
+    return generate_portfolios(mu, cov, n_portfolios, rf=rf)
+
+
+@st.cache_data(max_entries=MAX_ENTRIES, ttl=TTL_SECONDS, show_spinner=False)
+def sma_results(ticker: str, window: int, start, end) -> dict:
+    return run_sma_strategy(ticker, window=window, start=start, end=end)
@@ -1,16 +1,14 @@
 import streamlit as st
 import numpy as np
 from src.visualization.plot import plot_efficiency_frontier, plot_cumulative_returns
-from src.data.fetch_data import get_close_prices
-from src.analytics.optimization.markowitz import (
-    prepare_portfolio_inputs,
-    compute_min_var_portfolio,
-    portfolio_stats,
-    maximize_sharpe_ratio,
-)
 from src.analytics.optimization.markowitz_backtesting import run_backtest
-from src.analytics.helpers.validateTickers import validateTicker
-from src.examples.run_markowitz_example import generate_portfolios
+from src.analytics.helpers.validateTickers import validate_tickers
+from src.ui.cached_analytics import (
+    frontier_curve,
+    max_sharpe_portfolio,
+    min_variance_portfolio,
+    random_portfolios,
+)
 from matplotlib.figure import Figure
 
 st.title("OptiFund | Markowitz Optimizer")
@@ -59,6 +57,7 @@ with st.sidebar.expander("Configure Efficient Frontier"):
 if st.sidebar.button("Run Efficiency Frontier"):
     st.markdown("""
     - The **blue cloud** shows feasible portfolios.  
+    - The **black line** is the exact efficient frontier (Critical Line Algorithm).  
     - The **orange star** marks the **Maximum Sharpe Ratio Portfolio**.  
     - The **red star** marks the **Minimum Variance Portfolio** — the safest efficient portfolio.
     """)
@@ -68,14 +67,12 @@ if st.sidebar.button("Run Efficiency Frontier"):
 
     st.subheader("Efficient Frontier Simulation")
     try:
-        prices = get_close_prices(eff_tickers, period=eff_period)
-        mu, cov = prepare_portfolio_inputs(prices)
-        w_min_var = compute_min_var_portfolio(mu, cov)
-        stats_min_var = portfolio_stats(w_min_var, mu, cov)
-
-        w_max_sharpe = maximize_sharpe_ratio(mu, cov)
-        stats_max_sharpe = portfolio_stats(w_max_sharpe, mu, cov)
-        portfolios = generate_portfolios(mu, cov, eff_n_portfolios, rf=eff_rf)
+        # cached per stage on (tickers, period[, rf]), so only what changed gets recomputed
+        key = tuple(eff_tickers)
+        stats_min_var = min_variance_portfolio(key, eff_period)["stats"]
+        stats_max_sharpe = max_sharpe_portfolio(key, eff_period, eff_rf)["stats"]
+        portfolios = random_portfolios(key, eff_period, eff_rf, eff_n_portfolios)
+        frontier = frontier_curve(key, eff_period)
 
         fig = plot_efficiency_frontier(
             portfolios,
@@ -84,6 +81,7 @@ if st.sidebar.button("Run Efficiency Frontier"):
             eff_rf,
             path=None,
             return_fig=True,
+            frontier=frontier,
         )
         st.pyplot(fig)
 
@@ -136,11 +134,12 @@ with st.sidebar.expander("Configure Backtest"):
 if st.sidebar.button("Run Backtest"):
     st.subheader("Portfolio Backtest")
     try:
-        # validate tickers up-front
-        for ticker in backtest_tickers:
-            if not validateTicker(ticker):
-                st.error(f"Invalid ticker: {ticker}, must only use existing tickers trading in USD")
-                st.stop()
+        # validate tickers up-front (results are cached, so run_backtest doesn't look them up again)
+        statuses = validate_tickers(backtest_tickers)
+        invalid = [t for t, valid in statuses.items() if not valid]
+        if invalid:
+            st.error(f"Invalid ticker(s): {', '.join(invalid)}, must only use existing tickers trading in USD")
+            st.stop()
 
         # Run backtest and ask it to return the figure directly.
         result = run_backtest(
@@ -150,7 +149,7 @@ if st.sidebar.button("Run Backtest"):
             test_start=test_start,
             test_end=test_end,
             rf=backtest_rf,
-            n_random=50,
+            n_random=1000,
             save_plot=False,
             plot_path=None,
             return_fig=True,
@@ -174,6 +173,8 @@ if st.sidebar.button("Run Backtest"):
                     "Min Var": np.round(weights["min_var"], 6),
                     "Max Sharpe": np.round(weights["max_sharpe"], 6),
                     "Equal Weight": np.round(weights["equal"], 6),
+                    "Risk Parity": np.round(weights["risk_parity"], 6),
+                    "HRP": np.round(weights["hrp"], 6),
                 })
         else:
             st.error(f"Unexpected result from run_backtest: {type(result)}")
@@ -1,8 +1,6 @@
-from turtledemo.penrose import start
-
 import streamlit as st
 import matplotlib.pyplot as plt
-from src.analytics.strategies.sma_strategy import run_sma_strategy
+from src.ui.cached_analytics import sma_results
 from src.analytics.helpers.validateTickers import validateTicker
 from src.visualization.plot import plot_strategy_comparison, plot_price_with_sma
 
@@ -27,10 +25,9 @@ if st.sidebar.button("Run Backtest"):
         st.stop()
     elif window < 2:
         st.error(f"Invalid window size: {window}, must be at least 2 days ")
+        st.stop()
 
-
-
-    results = run_sma_strategy(ticker, window=window, start=start, end=end)
+    results = sma_results(ticker, window, start, end)
 
     st.subheader("Performance Comparison")
     fig1, ax1 = plt.subplots(figsize=(10, 6))
@@ -39,6 +36,7 @@ if st.sidebar.button("Run Backtest"):
     ax1.legend()
     ax1.set_title(f"{ticker} — SMA Strategy vs Buy & Hold")
     st.pyplot(fig1)
+    st.dataframe(results["report"].rename(index={"strategy": "SMA Strategy", "buy_and_hold": "Buy & Hold"}).round(4))
 
     st.subheader("Price with SMA Overlay")
     fig2, ax2 = plt.subplots(figsize=(10, 4))
@@ -48,9 +46,5 @@ if st.sidebar.button("Run Backtest"):
     ax2.set_title(f"{ticker} — Price & SMA ({window}-day)")
     st.pyplot(fig2)
 
-@st.cache_data
-def get_results(ticker, window, start, end):
-    return run_sma_strategy(ticker, window, start, end)
-
 
 
@@ -75,10 +75,12 @@ def plot_correlation_heatmap(df, path=None, return_fig=False):
 
 
 
-def plot_efficiency_frontier(portfolios,marko_stats, max_sharpe_stats, rf, path, return_fig=False):
+def plot_efficiency_frontier(portfolios,marko_stats, max_sharpe_stats, rf, path, return_fig=False, frontier=None):
     plt.figure(figsize=(10,6))
     plt.title("Efficiency Frontiers")
     plt.scatter(portfolios["risk"], portfolios["ret"], c=portfolios["sharpe"], cmap="Blues")
+    if frontier is not None:
+        plt.plot(frontier["risk"], frontier["ret"], c="black", linewidth=2, label="Efficient Frontier")
     plt.scatter(marko_stats["Risk"], marko_stats["Return"], c="red", marker="*", s=200, label="Min Var")
     plt.scatter(max_sharpe_stats["Risk"], max_sharpe_stats["Return"], c="orange", marker="*", s=200, label="Max Sharpe")
     plt.colorbar(label="Sharpe Ratio")
@@ -92,13 +94,17 @@ def plot_efficiency_frontier(portfolios,marko_stats, max_sharpe_stats, rf, path,
         plt.close()
         return fig
     if path:
-        print(path)
         plt.savefig(path)
     plt.close()
 
 
-def plot_cumulative_returns(path, curves: dict[str, pd.Series], title: str = "Portfolio Backtest", return_fig=False ):
+def plot_cumulative_returns(path, curves: dict[str, pd.Series], title: str = "Portfolio Backtest", return_fig=False, band: pd.DataFrame | None = None):
     plt.figure(figsize=(12,6))
+    if band is not None:
+        low, mid, high = band.columns[0], band.columns[len(band.columns) // 2], band.columns[-1]
+        plt.fill_between(band.index, band[low], band[high], color="gray", alpha=0.25, zorder=1,
+                         label=f"Random portfolios ({low:.0%}-{high:.0%})")
+        plt.plot(band.index, band[mid], c="gray", linestyle=":", linewidth=1, zorder=1, label="Random median")
     for label, series in curves.items():
         if label == "Max Sharpe Portfolio":
             plt.plot(series.index, series.values, label=label, c="red", linewidth=2.5, zorder=4)
@@ -106,6 +112,10 @@ def plot_cumulative_returns(path, curves: dict[str, pd.Series], title: str = "Po
             plt.plot(series.index, series.values, label=label, c="blue", linestyle="--", linewidth=2, zorder=2)
         elif label == "Min Var Portfolio":
             plt.plot(series.index, series.values, label=label, c="green", linewidth=2.5, zorder=3)
+        elif label == "Risk Parity":
+            plt.plot(series.index, series.values, label=label, c="purple", linewidth=2, zorder=3)
+        elif label == "HRP":
+            plt.plot(series.index, series.values, label=label, c="orange", linewidth=2, zorder=3)
         else:
             plt.plot(series.index, series.values, c="gray", alpha=0.3, linewidth=1, zorder=1)
 
@@ -0,0 +1,16 @@
+from benchmarks.suite import compare, load_results, run_suite, save_results
+
+
+def test_suite_runs_saves_and_compares(tmp_path):
+    records = run_suite(sizes=[(4, 120)], repeat=1, pattern="portfolio", verbose=False)
+    names = {r["name"] for r in records}
+    assert {"compute_min_var_portfolio", "backtest_portfolio", "random_portfolio_returns"} <= names
+    assert all(r["best"] > 0 for r in records)
+
+    save_results(records, tmp_path)
+    saved = load_results("latest", tmp_path)
+    assert saved["results"] == records
+
+    slower = [{**r, "best": r["best"] * 2} for r in records]
+    assert len(compare(records, slower, threshold=1.5, verbose=False)) == len(records)
+    assert compare(records, records, verbose=False) == []
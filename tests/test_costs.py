@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.helpers.costs import CostModel, trailing_volatility
+from src.analytics.optimization.markowitz_backtesting import backtest_portfolio
+from src.analytics.strategies.batch import run_ma_strategy_batch
+from src.analytics.strategies.sma_strategy import compute_strategy_returns
+from src.analytics.strategies.sweep import sweep_ma_windows
+
+
+def make_prices(n_days=300, n_assets=3, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0004, 0.012, (n_days, n_assets))
+    return pd.DataFrame(100 * np.cumprod(1 + returns, axis=0), index=pd.bdate_range("2021-01-01", periods=n_days),
+                        columns=[f"T{i}" for i in range(n_assets)])
+
+
+def test_trailing_volatility_uses_only_past_returns():
+    returns = np.random.default_rng(0).normal(0, 0.01, 60)
+    vol = trailing_volatility(returns, 20)
+    assert vol[0] == vol[1] == 0
+    assert vol[30] == pytest.approx(np.std(returns[10:30], ddof=1))
+    assert vol[5] == pytest.approx(np.std(returns[:5], ddof=1))
+
+
+def test_strategy_costs_charged_on_position_changes():
+    daily = pd.Series([0.0, 0.01, -0.02, 0.03, 0.01])
+    positions = pd.Series([0.0, 1.0, 1.0, 0.0, 1.0])
+    net = compute_strategy_returns(daily, positions, CostModel(bps=10, fixed=0.001))
+    np.testing.assert_allclose(net, daily * positions - np.array([0, 0.002, 0, 0.002, 0.002]))
+
+    prices = make_prices()
+    costs = CostModel(bps=5, slippage=0.5)
+    gross = run_ma_strategy_batch(prices, window=10)
+    net = run_ma_strategy_batch(prices, window=10, costs=costs)
+    assert (net["summary"]["strategy_return"] < gross["summary"]["strategy_return"]).all()
+
+    # the sweep applies the same costs as the batch engine
+    table = sweep_ma_windows(prices, windows=[10], kinds=("sma",), costs=costs)
+    np.testing.assert_allclose(table["total_return"].to_numpy(), net["summary"]["strategy_return"].to_numpy())
+
+
+@pytest.mark.parametrize("missing", [None, "gap", "late_listing"])
+def test_rebalancing_modes_against_holdings_loop(missing):
+    prices = make_prices(n_assets=4)
+    if missing == "gap":
+        prices.iloc[100, 1] = np.nan  # the asset is flat until its next close
+    if missing == "late_listing":
+        prices.iloc[:30, 2] = np.nan  # and flat before its first close
+    weights = np.array([0.1, 0.2, 0.3, 0.4])
+    pd.testing.assert_series_equal(backtest_portfolio(weights, prices, costs=CostModel()),
+                                   backtest_portfolio(weights, prices), check_freq=False)
+
+    # buy and hold is the weighted growth of each asset
+    held = backtest_portfolio(weights, prices, rebalance=None)
+    np.testing.assert_allclose(held, (prices.ffill() / prices.bfill().iloc[0]).fillna(1).iloc[1:] @ weights)
+
+    costs = CostModel(bps=10, fixed=1e-4, slippage=0.1)
+    returns = np.nan_to_num(prices.ffill().pct_change().iloc[1:].to_numpy())
+    unit = 10 / 10_000 + 0.1 * trailing_volatility(returns, 20)
+    wealth, holdings, expected = 1.0, np.zeros(4), []
+    for t, r in enumerate(returns):
+        if t % 21 == 0:
+            trades = weights - holdings / wealth
+            wealth *= 1 - (np.abs(trades) * unit[t] + 1e-4 * (trades != 0)).sum()
+            holdings = weights * wealth
+        holdings = holdings * (1 + r)
+        wealth = holdings.sum()
+        expected.append(wealth)
+    np.testing.assert_allclose(backtest_portfolio(weights, prices, costs=costs, rebalance=21), expected)
+
+
+@pytest.mark.parametrize("rebalance", [0, -5, 2.5])
+def test_invalid_rebalance_is_rejected(rebalance):
+    with pytest.raises(ValueError):
+        backtest_portfolio(np.full(3, 1 / 3), make_prices(), rebalance=rebalance)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from src.analytics.optimization.markowitz import compute_min_var_portfolio, compute_porfolio_risk
+from src.analytics.risk.covariance import (
+    EWMACovariance,
+    FactorCovariance,
+    LedoitWolfCovariance,
+    SampleCovariance,
+)
+
+
+def make_returns(n_days=200, n_assets=12, seed=0):
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0, 0.01, size=(n_days, 2)) @ rng.normal(0, 1, size=(2, n_assets))
+    return factors + rng.normal(0.0003, 0.01, size=(n_days, n_assets))
+
+
+def test_ledoit_wolf_matches_reference_formula_and_is_well_conditioned():
+    returns = make_returns()
+    X = returns - returns.mean(axis=0)
+    T, n = X.shape
+    S = X.T @ X / T
+    target = np.trace(S) / n
+    d2 = np.sum((S - target * np.eye(n)) ** 2) / n
+    b2 = sum(np.sum((np.outer(x, x) - S) ** 2) for x in X) / T ** 2 / n
+
+    lw = LedoitWolfCovariance().fit(returns)
+    assert lw.shrinkage_ == pytest.approx(min(b2, d2) / d2)
+
+    # more assets than days: the sample covariance is singular, the shrunk one is not
+    wide = make_returns(n_days=30, n_assets=60)
+    assert np.linalg.eigvalsh(SampleCovariance().fit(wide).matrix).min() < 1e-10
+    assert np.linalg.eigvalsh(LedoitWolfCovariance().fit(wide).matrix).min() > 1e-6
+
+
+def test_factor_model_risk_and_solve_match_dense_matrix():
+    returns = make_returns(n_assets=40)
+    model = FactorCovariance(n_factors=3).fit(returns)
+    dense = model.matrix
+    weights = np.random.default_rng(1).dirichlet(np.ones(40), size=5)
+
+    np.testing.assert_allclose(model.variance(weights), np.einsum("ij,jk,ik->i", weights, dense, weights))
+    np.testing.assert_allclose(model.solve(np.ones(40)), np.linalg.solve(dense, np.ones(40)))
+    np.testing.assert_allclose(compute_min_var_portfolio(None, model, allow_short=True),
+                               compute_min_var_portfolio(None, dense, allow_short=True))
+    assert compute_porfolio_risk(weights[0], model) == pytest.approx(np.sqrt(weights[0] @ dense @ weights[0]))
+
+
+def test_estimators_cache_decompositions_until_refit():
+    returns = make_returns()
+    est = EWMACovariance(decay=0.97).fit(returns)
+    assert est.cholesky() is est.cholesky()
+    assert np.allclose(est.cholesky() @ est.cholesky().T, est.matrix)
+    first = est.cholesky()
+    est.fit(returns[50:])
+    assert est.cholesky() is not first
@@ -0,0 +1,73 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.helpers.incremental import CovarianceState, CumulativeReturnState, EMAState, SMAState
+from src.analytics.helpers.returns import compute_cumulative_returns, compute_ema, compute_sma
+from src.analytics.risk.risk_metrics import clean_returns, compute_annualized_covariance
+
+
+def make_prices(n_days=300, tickers=("A", "B", "C"), seed=0):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0003, 0.015, size=(n_days, len(tickers)))
+    return pd.DataFrame(100 * np.exp(np.cumsum(steps, axis=0)), index=pd.bdate_range("2020-01-01", periods=n_days),
+                        columns=list(tickers))
+
+
+def roundtrip(state):
+    return type(state).from_dict(json.loads(json.dumps(state.to_dict())))
+
+
+def test_incremental_states_match_full_recomputation():
+    prices = make_prices()
+    history, new_days = prices.iloc[:250], prices.iloc[250:]
+
+    sma = SMAState.from_history(history, window=20)
+    ema = EMAState.from_history(history, span=20)
+    cumu = CumulativeReturnState.from_history(history)
+    cov = CovarianceState.from_history(clean_returns(history))
+    for date, row in new_days.iterrows():
+        # store and reload every day, like a nightly job would
+        sma, ema, cumu, cov = map(roundtrip, (sma, ema, cumu, cov))
+        sma.update(row)
+        ema.update(row)
+        cov.update(cumu.update(row))
+
+    np.testing.assert_allclose(sma.value, compute_sma(prices, 20).iloc[-1])
+    np.testing.assert_allclose(ema.value, compute_ema(prices, 20).iloc[-1])
+    np.testing.assert_allclose(cumu.value, compute_cumulative_returns(prices).iloc[-1])
+    np.testing.assert_allclose(cov.annualized()[1], compute_annualized_covariance(clean_returns(prices)))
+    assert sma.columns == ["A", "B", "C"]
+
+
+def test_sma_state_handles_missing_prices_like_rolling_mean():
+    prices = make_prices(n_days=40)
+    prices.iloc[10, 1] = np.nan
+    expected = compute_sma(prices, 5).to_numpy()
+
+    state = SMAState(5, 3)
+    got = np.array([state.update(row) for row in prices.to_numpy()])
+    np.testing.assert_allclose(got, expected)
+
+
+def test_ema_state_decays_across_missing_prices_like_compute_ema():
+    prices = make_prices(n_days=60)
+    prices.iloc[:3, 0] = np.nan  # listed later
+    prices.iloc[20:25, 1] = np.nan  # a 5-day gap
+    prices.iloc[38:42, 2] = np.nan  # history below ends inside this gap
+    expected = compute_ema(prices, 10).to_numpy()
+
+    state = EMAState(10, 3)
+    got = np.array([state.update(row) for row in prices.to_numpy()])
+    np.testing.assert_allclose(got, expected)
+
+    state = EMAState(3, 3)
+    got = np.array([state.update(row) for row in prices.to_numpy()])
+    np.testing.assert_allclose(got, compute_ema(prices, 3).to_numpy())
+
+    state = EMAState.from_history(prices.iloc[:40], span=10)
+    for row in prices.iloc[40:].to_numpy():
+        state = roundtrip(state)
+        state.update(row)
+    np.testing.assert_allclose(state.value, expected[-1])
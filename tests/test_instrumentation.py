@@ -0,0 +1,32 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.optimization.markowitz import prepare_portfolio_inputs
+from src.analytics.risk.risk_metrics import clean_returns
+
+
+def make_prices():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, size=(50, 3)), axis=0)),
+                        index=pd.bdate_range("2022-01-03", periods=50), columns=["A", "B", "C"])
+
+
+def test_clean_returns_does_not_print(capsys):
+    clean_returns(make_prices())
+    assert capsys.readouterr().out == ""
+
+
+def test_stages_log_duration_and_shapes_at_debug(caplog):
+    with caplog.at_level(logging.INFO, logger="optifund"):
+        prepare_portfolio_inputs(make_prices())
+    assert caplog.records == []
+
+    with caplog.at_level(logging.DEBUG, logger="optifund"):
+        prepare_portfolio_inputs(make_prices())
+    stages = {r.stage: r for r in caplog.records}
+    assert {"clean_returns", "compute_annualized_covariance", "prepare_portfolio_inputs"} <= set(stages)
+    assert stages["clean_returns"].in_shape == (50, 3)
+    assert stages["clean_returns"].out_shape == (49, 3)
+    assert stages["prepare_portfolio_inputs"].duration_ms >= 0
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.helpers import kernels
+from src.analytics.helpers.kernels import drawdown, ema, stop_loss_positions
+from src.analytics.helpers.returns import compute_sma
+from src.analytics.strategies.batch import run_ma_strategy_batch
+from src.analytics.strategies.sma_strategy import build_positions, compute_ema, generate_signals
+
+BACKENDS = ["numpy", pytest.param("numba", marks=pytest.mark.skipif(
+    kernels._import_numba() is None, reason="numba not installed"))]
+
+
+def make_prices(n_days=300, n_assets=3, seed=0):
+    rng = np.random.default_rng(seed)
+    values = 100 * np.cumprod(1 + rng.normal(0.0003, 0.015, (n_days, n_assets)), axis=0)
+    return pd.DataFrame(values, index=pd.bdate_range("2021-01-01", periods=n_days),
+                        columns=[f"T{i}" for i in range(n_assets)])
+
+
+def python_kernel(name, *args):
+    """Run a loop kernel uncompiled, so its logic is checked even without numba."""
+    return kernels._KERNELS[name](*args)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_ema_matches_pandas(backend):
+    prices = make_prices()
+    pd.testing.assert_frame_equal(ema(prices, 20, backend=backend), compute_ema(prices, 20))
+
+    with_gaps = prices.copy()
+    with_gaps.iloc[:5, 0] = np.nan
+    with_gaps.iloc[[50, 51, 120], 1] = np.nan
+    pd.testing.assert_frame_equal(ema(with_gaps, 20, backend=backend), compute_ema(with_gaps, 20))
+    pd.testing.assert_frame_equal(ema(with_gaps, 3, backend=backend), compute_ema(with_gaps, 3))
+
+    # SMA seeding: NaN for the first span - 1 valid values, then the recursion from their mean
+    seeded = ema(with_gaps, 10, seed="sma", backend=backend)
+    column = with_gaps["T0"].dropna()
+    tail = pd.concat([pd.Series([column.iloc[:10].mean()]), column.iloc[10:].reset_index(drop=True)])
+    np.testing.assert_allclose(seeded["T0"].dropna(), tail.ewm(span=10, adjust=False).mean())
+    assert seeded["T0"].isna().sum() == 5 + 9
+
+
+def test_python_kernels_match_numpy():
+    prices = make_prices()
+    prices.iloc[[10, 11, 70], 2] = np.nan
+    values = prices.to_numpy()
+    for span in (3, 20):
+        for sma_seed in (False, True):
+            np.testing.assert_allclose(python_kernel("ema", values, 2 / (span + 1), span, sma_seed),
+                                       kernels._ema_numpy(values, 2 / (span + 1), span, sma_seed))
+    wealth = values / values[0]
+    np.testing.assert_allclose(python_kernel("drawdown", wealth, 1.0), drawdown(wealth, 1.0, backend="numpy"))
+    average = compute_sma(prices, 20).to_numpy()
+    for stop, trailing in ((1.0, False), (0.05, False), (0.05, True)):
+        np.testing.assert_array_equal(python_kernel("stop_loss", values, average, stop, trailing),
+                                      kernels._stop_loss_numpy(values, average, stop, trailing))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_drawdown_matches_pandas(backend):
+    wealth = (1 + make_prices().pct_change().fillna(0)).cumprod()
+    pd.testing.assert_frame_equal(drawdown(wealth, backend=backend), wealth / wealth.cummax() - 1)
+    below_start = drawdown(np.array([0.9, 1.1, 1.0]), initial=1.0, backend=backend)
+    np.testing.assert_allclose(below_start, [-0.1, 0, 1 / 1.1 - 1])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_stop_loss_positions(backend):
+    prices = make_prices()
+    sma = compute_sma(prices, 20)
+
+    # no stop: the plain moving-average rule
+    plain = stop_loss_positions(prices, sma, backend=backend)
+    pd.testing.assert_frame_equal(plain, build_positions(generate_signals(prices, sma)).astype(float))
+
+    stopped = stop_loss_positions(prices, sma, stop_loss=0.01, backend=backend)
+    assert (stopped <= plain).all().all() and (stopped < plain).any().any()
+
+    # enter at 10; a fixed 5% stop exits at 9 although the price stays above the average,
+    # and the strategy waits for the dip below it (7) before entering again
+    close = pd.Series([10, 11, 9, 9.5, 7, 10, 11, 11.5])
+    average = pd.Series([9, 9, 8, 8, 8, 9, 9, 9])
+    np.testing.assert_array_equal(stop_loss_positions(close, average, 0.05, backend=backend),
+                                  [0, 1, 1, 0, 0, 0, 1, 1])
+    # 15% from the entry (8.5) isn't hit, 15% from the 11 high (9.35) is
+    np.testing.assert_array_equal(stop_loss_positions(close, average, 0.15, backend=backend),
+                                  [0, 1, 1, 1, 1, 0, 1, 1])
+    np.testing.assert_array_equal(stop_loss_positions(close, average, 0.15, trailing=True, backend=backend),
+                                  [0, 1, 1, 0, 0, 0, 1, 1])
+
+
+def test_batch_engine_with_stop_loss():
+    prices = make_prices()
+    plain = run_ma_strategy_batch(prices, window=20)
+    stopped = run_ma_strategy_batch(prices, window=20, stop_loss=0.01, trailing_stop=True)
+    expected = stop_loss_positions(prices, compute_sma(prices, 20), 0.01, trailing=True)
+    pd.testing.assert_frame_equal(stopped["positions"].astype(float), expected)
+    assert (stopped["summary"]["exposure"] <= plain["summary"]["exposure"]).all()
@@ -0,0 +1,39 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY = ["matplotlib", "seaborn", "scipy", "yfinance", "numba"]
+
+
+def loaded_after_import(module):
+    code = (
+        f"import json, sys; import {module}; "
+        f"print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", [
+    "src.analytics.helpers.returns",
+    "src.analytics.risk.risk_metrics",
+    "src.analytics.optimization.markowitz",
+    "src.analytics.optimization.markowitz_backtesting",
+    "src.analytics.helpers.kernels",
+])
+def test_import_skips_heavy_dependencies(module):
+    assert loaded_after_import(module) == []
+
+
+def test_import_creates_no_directories():
+    code = (
+        "import pathlib; calls = []; "
+        "pathlib.Path.mkdir = lambda self, *a, **k: calls.append(str(self)); "
+        "import src.analytics.optimization.markowitz_backtesting; print(calls)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "[]"
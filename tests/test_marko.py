@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.optimization.markowitz import (
+    compute_min_var_portfolio,
+    compute_sharpe_ratio,
+    maximize_sharpe_ratio,
+    prepare_portfolio_inputs,
+)
+from src.analytics.optimization.cla import EfficientFrontier
+from src.analytics.optimization.markowitz_backtesting import backtest_portfolio, random_portfolio_paths
+from src.analytics.optimization.random_portfolios import generate_portfolios
+from src.analytics.optimization import solvers
+from src.analytics.optimization.solvers import (
+    QPNotConverged, long_only_min_variance, negative_sharpe_with_grad, solve_simplex_qp
+)
+from src.analytics.optimization.walk_forward import walk_forward_backtest
+
+
+def make_inputs(n_assets=6, seed=0):
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(size=(n_assets, 3)) * 0.15
+    cov = factors @ factors.T + np.diag(rng.uniform(0.01, 0.05, n_assets))
+    mu = rng.uniform(0.02, 0.15, n_assets)
+    return mu, cov
+
+
+def test_generate_portfolios_matches_per_portfolio_formulas():
+    mu, cov = make_inputs()
+    portfolios, weights = generate_portfolios(mu, cov, n_portfolios=50, rf=0.02, seed=1, return_weights=True)
+
+    for i in range(50):
+        w = weights[i]
+        assert w.sum() == pytest.approx(1.0)
+        assert portfolios["ret"][i] == pytest.approx(np.dot(w, mu))
+        assert portfolios["risk"][i] == pytest.approx(np.sqrt(w @ cov @ w))
+        assert portfolios["sharpe"][i] == pytest.approx((np.dot(w, mu) - 0.02) / np.sqrt(w @ cov @ w))
+
+
+def test_generate_portfolios_is_independent_of_chunk_size():
+    mu, cov = make_inputs()
+    whole = generate_portfolios(mu, cov, n_portfolios=1000, seed=7)
+    chunked = generate_portfolios(mu, cov, n_portfolios=1000, seed=7, chunk_size=64)
+
+    np.testing.assert_allclose(whole.values, chunked.values)
+
+
+def test_qp_min_variance_matches_tight_slsqp():
+    from scipy.optimize import minimize
+
+    mu, cov = make_inputs(n_assets=12, seed=3)
+    w_qp = compute_min_var_portfolio(mu, cov)
+    res = minimize(lambda w: w @ cov @ w, np.ones(12) / 12, jac=lambda w: 2 * cov @ w,
+                   bounds=[(0, 1)] * 12, constraints=[{"type": "eq", "fun": lambda w: w.sum() - 1}],
+                   method="SLSQP", options={"ftol": 1e-15, "maxiter": 1000})
+
+    assert w_qp.min() >= 0
+    assert w_qp.sum() == pytest.approx(1.0)
+    assert w_qp @ cov @ w_qp <= res.x @ cov @ res.x + 1e-12
+    np.testing.assert_allclose(w_qp, res.x, atol=1e-4)
+
+
+def test_qp_max_sharpe_beats_slsqp():
+    mu, cov = make_inputs(n_assets=20, seed=4)
+    w_qp = maximize_sharpe_ratio(mu, cov, rf=0.03)
+    w_sl = maximize_sharpe_ratio(mu, cov, rf=0.03, method="slsqp")
+
+    assert w_qp.min() >= 0
+    assert w_qp.sum() == pytest.approx(1.0)
+    assert compute_sharpe_ratio(w_qp, mu, cov, 0.03) >= compute_sharpe_ratio(w_sl, mu, cov, 0.03) - 1e-9
+
+
+def test_closed_form_solutions_satisfy_first_order_conditions():
+    mu, cov = make_inputs(seed=5)
+    w_mv = compute_min_var_portfolio(mu, cov, allow_short=True)
+    w_ms = maximize_sharpe_ratio(mu, cov, rf=0.01, allow_short=True)
+
+    # min variance: cov w is proportional to 1; tangency: cov w is proportional to mu - rf
+    g = cov @ w_mv
+    np.testing.assert_allclose(g, g.mean())
+    np.testing.assert_allclose(cov @ w_ms / (mu - 0.01), (cov @ w_ms / (mu - 0.01))[0])
+    assert w_mv.sum() == pytest.approx(1.0)
+    assert w_ms.sum() == pytest.approx(1.0)
+
+
+def test_qp_that_runs_out_of_iterations_raises_and_optimizers_fall_back(monkeypatch):
+    mu, cov = make_inputs(n_assets=12, seed=3)
+    vertex = np.eye(12)[0]  # a feasible start several active-set steps from the optimum
+    with pytest.raises(QPNotConverged):
+        solve_simplex_qp(cov, np.zeros(12), np.ones(12), 1.0, x0=vertex, max_iter=1)
+
+    solve = solvers.solve_simplex_qp
+    monkeypatch.setattr(solvers, "solve_simplex_qp",
+                        lambda P, q, a, b, x0=None: solve(P, q, a, b, x0=vertex, max_iter=1))
+    w = compute_min_var_portfolio(mu, cov)
+    np.testing.assert_allclose(w, compute_min_var_portfolio(mu, cov, method="slsqp"))
+
+
+def test_sharpe_gradient_matches_finite_differences():
+    mu, cov = make_inputs(seed=6)
+    w = np.full(len(mu), 1 / len(mu))
+    value, grad = negative_sharpe_with_grad(w, mu, cov, 0.02)
+    eps = 1e-6
+    numeric = [(negative_sharpe_with_grad(w + eps * e, mu, cov, 0.02)[0] - value) / eps for e in np.eye(len(mu))]
+
+    np.testing.assert_allclose(grad, numeric, rtol=1e-4, atol=1e-6)
+
+
+def test_cla_end_points_match_qp_optimizers():
+    mu, cov = make_inputs(n_assets=15, seed=8)
+    frontier = EfficientFrontier(mu, cov)
+
+    np.testing.assert_allclose(frontier.min_variance(), compute_min_var_portfolio(mu, cov), atol=1e-8)
+    np.testing.assert_allclose(frontier.max_sharpe(0.03), maximize_sharpe_ratio(mu, cov, 0.03), atol=1e-8)
+    assert np.all(np.diff(frontier.returns) < 0)
+
+
+@pytest.mark.parametrize("seed, noise", [(3, 1e-5), (5, 1e-5), (21, 1e-7), (2, 0.0)])
+def test_cla_with_near_duplicate_assets_matches_qp_optimizers(seed, noise):
+    # a second share class / an ETF on the same index: one column tracks another almost exactly
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0005, 0.015, (500, 20))
+    j = rng.integers(1, 20)
+    returns[:, j] = returns[:, 0] + rng.normal(0, noise, 500) if noise else returns[:, 0]
+    mu, cov = returns.mean(axis=0) * 252, np.cov(returns.T) * 252
+    frontier = EfficientFrontier(mu, cov)
+
+    w_mv, w_qp = frontier.min_variance(), compute_min_var_portfolio(mu, cov)
+    assert w_mv @ cov @ w_mv <= w_qp @ cov @ w_qp * (1 + 1e-6)
+    w_ms = frontier.max_sharpe(0.02)
+    assert compute_sharpe_ratio(w_ms, mu, cov, 0.02) >= compute_sharpe_ratio(
+        maximize_sharpe_ratio(mu, cov, 0.02), mu, cov, 0.02) - 1e-6
+    assert frontier.returns[0] == pytest.approx(mu.max())
+    assert frontier.weights.min() >= 0
+    np.testing.assert_allclose(frontier.weights.sum(axis=1), 1)
+
+
+@pytest.mark.parametrize("seed", [None, 3, 8])
+def test_cla_with_tied_highest_returns_matches_qp_optimizers(seed):
+    # e.g. expected returns from a rounded view: several assets share the top value
+    if seed is None:
+        mu, cov = np.array([0.10, 0.10, 0.05]), np.diag([0.04, 0.09, 0.01])
+    else:
+        mu, cov = make_inputs(n_assets=8, seed=seed)
+        mu[np.argsort(mu)[-3:]] = mu.max()
+    frontier = EfficientFrontier(mu, cov)
+
+    np.testing.assert_allclose(frontier.min_variance(), long_only_min_variance(cov), atol=1e-6)
+    w_ms = frontier.max_sharpe(0.02)
+    assert compute_sharpe_ratio(w_ms, mu, cov, 0.02) >= compute_sharpe_ratio(
+        maximize_sharpe_ratio(mu, cov, 0.02), mu, cov, 0.02) - 1e-6
+    assert frontier.returns[0] == pytest.approx(mu.max())
+    np.testing.assert_allclose(frontier.weights.sum(axis=1), 1)
+
+
+def test_cla_interpolated_points_are_on_the_frontier():
+    from scipy.optimize import minimize
+
+    mu, cov = make_inputs(n_assets=8, seed=9)
+    frontier = EfficientFrontier(mu, cov)
+    target = 0.5 * (frontier.returns[0] + frontier.returns[-1])
+    w = frontier.weights_for_return(target)
+    res = minimize(lambda x: x @ cov @ x, np.ones(8) / 8, bounds=[(0, 1)] * 8, method="SLSQP",
+                   constraints=[{"type": "eq", "fun": lambda x: x.sum() - 1},
+                                {"type": "eq", "fun": lambda x: x @ mu - target}],
+                   options={"ftol": 1e-15, "maxiter": 1000})
+
+    assert w @ mu == pytest.approx(target)
+    assert w @ cov @ w <= res.x @ cov @ res.x + 1e-10
+
+    risk = np.sqrt(w @ cov @ w)
+    np.testing.assert_allclose(frontier.weights_for_risk(risk), w, atol=1e-8)
+
+
+def test_walk_forward_weights_match_direct_optimization():
+    rng = np.random.default_rng(11)
+    steps = rng.normal(0.0004, 0.01, size=(400, 4))
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(steps, axis=0)), index=pd.bdate_range("2020-01-01", periods=400),
+                          columns=["A", "B", "C", "D"])
+    result = walk_forward_backtest(prices, frequency="M", lookback=120, objective="min_var")
+
+    date = result["weights"].index[5]
+    pos = prices.index.get_loc(date)
+    mu, cov = prepare_portfolio_inputs(prices.iloc[pos - 120:pos + 1])
+    np.testing.assert_allclose(result["weights"].loc[date], compute_min_var_portfolio(mu, cov), atol=1e-10)
+    assert result["returns"].index[0] > result["weights"].index[0]
+
+
+def test_random_portfolio_paths_match_backtest_portfolio():
+    rng = np.random.default_rng(12)
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, size=(60, 3)), axis=0)),
+                          index=pd.bdate_range("2021-01-01", periods=60), columns=["A", "B", "C"])
+    paths = random_portfolio_paths(prices, n_portfolios=200, seed=3)
+
+    assert paths["cumulative"].shape == (59, 200)
+    for i in (0, 57, 199):
+        np.testing.assert_allclose(paths["cumulative"][:, i], backtest_portfolio(paths["weights"][i], prices))
+    band = paths["band"]
+    assert np.all(band[0.05] <= band[0.5]) and np.all(band[0.5] <= band[0.95])
+
+    # an asset listed later is flat before its first close instead of blanking the band
+    prices.iloc[:10, 1] = np.nan
+    paths = random_portfolio_paths(prices, n_portfolios=200, seed=3)
+    assert not paths["band"].isna().any().any()
+    np.testing.assert_allclose(paths["cumulative"][:, 57], backtest_portfolio(paths["weights"][57], prices))
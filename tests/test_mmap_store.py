@@ -0,0 +1,58 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.optimization.markowitz import prepare_portfolio_inputs
+from src.analytics.optimization.markowitz_backtesting import backtest_portfolio
+from src.analytics.strategies.batch import run_ma_strategy_batch
+from src.analytics.strategies.sweep import sweep_ma_windows
+from src.data.mmap_store import open_price_matrix, write_price_matrix
+
+
+def make_prices(n_days=300, n_assets=5, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, size=(n_days, n_assets)), axis=0)),
+                        index=pd.bdate_range("2020-01-01", periods=n_days), columns=[f"T{i}" for i in range(n_assets)])
+
+
+def is_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def test_store_round_trip_is_memory_mapped_and_pickles_as_a_path(tmp_path):
+    prices = make_prices()
+    panel = open_price_matrix(write_price_matrix(prices, tmp_path / "store"))
+
+    assert is_mapped(panel.values) and not panel.values.flags.writeable
+    pd.testing.assert_frame_equal(panel.to_frame(), prices, check_freq=False, check_names=False)
+
+    window = panel.loc("2020-03-02", "2020-06-30")
+    payload = pickle.dumps(window)
+    assert len(payload) < 1000
+    reopened = pickle.loads(payload)
+    np.testing.assert_array_equal(reopened.values, window.values)
+    assert reopened.dates.equals(window.dates)
+    assert is_mapped(reopened.values) and is_mapped(reopened.returns)
+
+
+def test_analytics_accept_a_mapped_store(tmp_path):
+    prices = make_prices()
+    panel = open_price_matrix(write_price_matrix(prices, tmp_path / "store"))
+    weights = np.full(5, 0.2)
+
+    mu, cov = prepare_portfolio_inputs(panel)
+    mu_df, cov_df = prepare_portfolio_inputs(prices)
+    np.testing.assert_allclose(mu, mu_df)
+    np.testing.assert_allclose(cov, cov_df)
+    np.testing.assert_allclose(backtest_portfolio(weights, panel), backtest_portfolio(weights, prices))
+    pd.testing.assert_frame_equal(run_ma_strategy_batch(panel, 20)["summary"],
+                                  run_ma_strategy_batch(prices, 20)["summary"])
+
+    in_process = sweep_ma_windows(prices, windows=[5, 20], kinds=("sma",))
+    in_workers = sweep_ma_windows(panel, windows=[5, 20], kinds=("sma",), n_jobs=2)
+    pd.testing.assert_frame_equal(in_workers, in_process)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from src.analytics.risk.monte_carlo import simulate_portfolio
+
+
+def make_inputs(n_assets=4, seed=0):
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(0, 0.15, size=(n_assets, 2))
+    cov = loadings @ loadings.T + np.diag(rng.uniform(0.01, 0.04, n_assets))
+    return rng.uniform(0.03, 0.12, n_assets), cov
+
+
+@pytest.mark.parametrize("method", ["normal", "student_t"])
+def test_simulated_daily_moments_match_inputs(method):
+    mu, cov = make_inputs()
+    w = np.array([0.4, 0.3, 0.2, 0.1])
+    result = simulate_portfolio(w, mu, cov, n_paths=40_000, horizon=1, method=method, seed=0)
+    daily = result["terminal_wealth"] - 1
+
+    assert daily.mean() == pytest.approx(w @ ((1 + mu) ** (1 / 252) - 1), abs=3e-4)
+    assert daily.std() == pytest.approx(np.sqrt(w @ cov @ w / 252), rel=0.03)
+
+
+def test_drifting_weights_use_full_asset_paths():
+    mu, cov = make_inputs()
+    w = np.array([0.4, 0.3, 0.2, 0.1])
+    rebalanced = simulate_portfolio(w, mu, cov, n_paths=20_000, horizon=21, seed=1)
+    drifting = simulate_portfolio(w, mu, cov, n_paths=20_000, horizon=21, rebalance=False, seed=1)
+
+    # over a month both give nearly the same distribution
+    assert drifting["summary"]["mean_terminal"] == pytest.approx(rebalanced["summary"]["mean_terminal"], abs=2e-3)
+    assert drifting["summary"]["terminal_5%"] == pytest.approx(rebalanced["summary"]["terminal_5%"], abs=5e-3)
+    assert np.all(drifting["max_drawdown"] >= 0) and np.all(drifting["max_drawdown"] < 1)
+
+
+def test_results_do_not_depend_on_worker_processes():
+    mu, cov = make_inputs()
+    w = np.full(4, 0.25)
+    # a tiny memory budget forces many chunks
+    kwargs = dict(n_paths=3000, horizon=50, method="student_t", seed=7, memory_budget_mb=0.5)
+    local = simulate_portfolio(w, mu, cov, **kwargs)
+    pooled = simulate_portfolio(w, mu, cov, n_jobs=2, **kwargs)
+
+    np.testing.assert_array_equal(local["terminal_wealth"], pooled["terminal_wealth"])
+    np.testing.assert_array_equal(local["max_drawdown"], pooled["max_drawdown"])
+
+
+def test_bootstrap_resamples_historical_days():
+    mu, cov = make_inputs()
+    history = np.tile([[0.01, -0.02, 0.0, 0.03]], (100, 1))
+    w = np.array([0.5, 0.0, 0.5, 0.0])
+    result = simulate_portfolio(w, mu, cov, n_paths=100, horizon=10, method="bootstrap", returns=history,
+                                initial_wealth=100, seed=0)
+
+    np.testing.assert_allclose(result["terminal_wealth"], 100 * 1.005 ** 10)
+    np.testing.assert_allclose(result["max_drawdown"], 0)
+    with pytest.raises(ValueError):
+        simulate_portfolio(w, mu, cov, method="bootstrap")
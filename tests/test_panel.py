@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from src.analytics.helpers.returns import compute_cumulative_returns, compute_daily_returns, compute_sma
+from src.analytics.optimization.markowitz import prepare_portfolio_inputs
+from src.analytics.risk.risk_metrics import clean_returns
+from src.data.panel import PricePanel
+
+
+def make_prices(n_days=120, n_assets=4, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, size=(n_days, n_assets)), axis=0)),
+                          index=pd.bdate_range("2021-01-01", periods=n_days),
+                          columns=[f"T{i}" for i in range(n_assets)])
+    prices.iloc[7, 2] = np.nan
+    return prices
+
+
+def test_panel_gives_the_same_analytics_as_a_dataframe():
+    prices = make_prices()
+    panel = PricePanel.from_frame(prices)
+
+    pd.testing.assert_frame_equal(clean_returns(panel), clean_returns(prices), check_freq=False)
+    pd.testing.assert_frame_equal(compute_daily_returns(panel), compute_daily_returns(prices), check_freq=False)
+    pd.testing.assert_frame_equal(compute_cumulative_returns(panel), compute_cumulative_returns(prices),
+                                  check_freq=False)
+    pd.testing.assert_frame_equal(compute_sma(panel, 10), compute_sma(prices, 10), check_freq=False)
+
+    mu, cov = prepare_portfolio_inputs(panel)
+    mu_df, cov_df = prepare_portfolio_inputs(prices)
+    np.testing.assert_allclose(mu, mu_df)
+    np.testing.assert_allclose(cov, cov_df)
+
+
+def test_float32_panel_halves_memory_and_slices_share_it():
+    prices = make_prices().ffill()
+    panel = PricePanel.from_frame(prices, dtype=np.float32)
+    assert panel.nbytes * 2 == PricePanel.from_frame(prices).nbytes
+
+    window = panel.loc("2021-02-01", "2021-03-31")
+    assert np.shares_memory(window.values, panel.values)
+    assert window.dates[0] == pd.Timestamp("2021-02-01") and window.dates[-1] == pd.Timestamp("2021-03-31")
+    # the slice's returns are a view on the parent's cached returns
+    assert np.shares_memory(window.returns, panel.returns)
+    np.testing.assert_allclose(window.returns, prices.loc["2021-02-01":"2021-03-31"].pct_change().iloc[1:],
+                               atol=1e-6)
+    assert np.shares_memory(clean_returns(window).to_numpy(), panel.returns)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.risk.performance import METRICS, performance_report, wealth_to_returns
+from src.analytics.strategies.batch import run_ma_strategy_batch
+from src.analytics.strategies.sma_strategy import _strategy_report
+
+
+def test_report_matches_single_series_formulas():
+    rng = np.random.default_rng(0)
+    returns = pd.DataFrame(rng.normal(0.0004, 0.01, (504, 3)), columns=["a", "b", "c"])
+    report = performance_report(returns, rf=0.02)
+
+    assert list(report.columns) == METRICS
+    for name, column in returns.items():
+        row = report.loc[name]
+        wealth = (1 + column).cumprod()
+        excess = column - 0.02 / 252
+        assert row["total_return"] == pytest.approx(wealth.iloc[-1] - 1)
+        assert row["cagr"] == pytest.approx(wealth.iloc[-1] ** 0.5 - 1)
+        assert row["sharpe"] == pytest.approx(excess.mean() / excess.std() * np.sqrt(252))
+        assert row["sortino"] == pytest.approx(excess.mean() / np.sqrt((excess.clip(upper=0) ** 2).mean()) * np.sqrt(252))
+        drawdown = wealth / np.maximum(wealth.cummax(), 1) - 1
+        assert row["max_drawdown"] == pytest.approx(drawdown.min())
+        assert row["calmar"] == pytest.approx(row["cagr"] / -row["max_drawdown"])
+        assert row["hit_rate"] == pytest.approx((column > 0).mean())
+    assert report["turnover"].isna().all()
+
+
+def test_drawdown_duration_and_turnover():
+    # up, two losing days, recovery on the fourth day, then a final loss
+    returns = np.array([0.1, -0.1, -0.1, 0.3, -0.05])
+    positions = np.array([1, 1, 0, 1, 1])
+    row = performance_report(returns, positions=positions, periods_per_year=5).iloc[0]
+
+    assert row["max_drawdown_duration"] == 2
+    assert row["max_drawdown"] == pytest.approx(0.81 - 1)
+    assert row["turnover"] == 3
+
+
+def test_report_on_strategy_and_backtest_outputs():
+    dates = pd.bdate_range("2021-01-01", periods=300)
+    rng = np.random.default_rng(1)
+    prices = pd.DataFrame(100 * np.cumprod(1 + rng.normal(0.0005, 0.01, (300, 4)), axis=0),
+                          index=dates, columns=list("ABCD"))
+    batch = run_ma_strategy_batch(prices, window=20)
+    report = performance_report(batch["strategy_returns"], positions=batch["positions"])
+    assert report.loc["A", "turnover"] == pytest.approx(
+        (batch["summary"].loc["A", "n_trades"] + (batch["positions"]["A"].iloc[0] != 0)) / (300 / 252))
+    assert report.loc["A", "total_return"] == pytest.approx(batch["summary"].loc["A", "strategy_return"])
+
+    single = _strategy_report(batch["strategy_returns"]["A"], prices["A"].pct_change().fillna(0),
+                              batch["positions"]["A"])
+    assert list(single.index) == ["strategy", "buy_and_hold"]
+
+    wealth = (1 + prices.pct_change().fillna(0)).cumprod()
+    np.testing.assert_allclose(wealth_to_returns(wealth).to_numpy(), prices.pct_change().fillna(0).to_numpy())
+    np.testing.assert_allclose(wealth_to_returns(wealth.to_numpy()), prices.pct_change().fillna(0).to_numpy())
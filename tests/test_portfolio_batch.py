@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.optimization.batch import PortfolioSpec, optimize_portfolios, results_frame
+from src.analytics.optimization.markowitz import (
+    compute_min_var_portfolio,
+    maximize_sharpe_ratio,
+    prepare_portfolio_inputs,
+)
+
+
+def make_prices(n_days=400, tickers=("AAA", "BBB", "CCC", "DDD", "EEE"), seed=0):
+    rng = np.random.default_rng(seed)
+    drift = np.linspace(0.0002, 0.001, len(tickers))
+    returns = rng.normal(drift, 0.01 + 0.002 * np.arange(len(tickers)), (n_days, len(tickers)))
+    return pd.DataFrame(100 * np.cumprod(1 + returns, axis=0),
+                        index=pd.bdate_range("2022-01-03", periods=n_days), columns=list(tickers))
+
+
+def test_batch_matches_single_portfolio_runs():
+    prices = make_prices()
+    prices.iloc[:50, 4] = np.nan  # EEE starts later, which must not change the other specs
+    specs = [
+        PortfolioSpec("a", ["aaa", "BBB", "CCC"], rf=0.01),
+        PortfolioSpec("b", ["BBB", "CCC", "DDD"], objective="min_var"),
+        PortfolioSpec("c", ["AAA", "DDD"], objective="min_var", allow_short=True),
+    ]
+    results = optimize_portfolios(specs, prices=prices)
+
+    for spec, result in zip(specs, results):
+        assert result.ok and result.spec is spec
+        mu, cov = prepare_portfolio_inputs(prices[spec.tickers])
+        solve = maximize_sharpe_ratio if spec.objective == "max_sharpe" else compute_min_var_portfolio
+        expected = solve(mu.to_numpy(), cov.to_numpy(), spec.rf, allow_short=spec.allow_short)
+        np.testing.assert_allclose(result.weights.to_numpy(), expected, atol=1e-6)
+        assert list(result.weights.index) == spec.tickers
+
+
+def test_failed_specs_are_reported_and_pool_matches():
+    prices = make_prices()
+    specs = [PortfolioSpec(f"p{i}", ["AAA", "BBB", "CCC", "DDD", "EEE"][i % 3:i % 3 + 3]) for i in range(6)]
+    specs.append(PortfolioSpec("bad", ["AAA", "ZZZ"]))
+
+    serial = optimize_portfolios(specs, prices=prices)
+    pooled = optimize_portfolios(specs, prices=prices, n_jobs=2)
+    assert not serial[-1].ok and "ZZZ" in serial[-1].error
+    for a, b in zip(serial[:-1], pooled[:-1]):
+        pd.testing.assert_series_equal(a.weights, b.weights)
+
+    table = results_frame(serial)
+    assert list(table.index) == [s.name for s in specs]
+    assert table["error"].notna().sum() == 1
+
+    with pytest.raises(ValueError):
+        optimize_portfolios([PortfolioSpec("x", ["AAA"]), PortfolioSpec("x", ["BBB"])], prices=prices)
+    with pytest.raises(ValueError):
+        PortfolioSpec("y", ["AAA"], objective="max_return")
+
+
+def test_tickers_without_overlapping_history_are_reported():
+    prices = make_prices()
+    prices.iloc[200:, 0] = np.nan  # AAA delisted before EEE was listed
+    prices.iloc[:250, 4] = np.nan
+    results = optimize_portfolios([PortfolioSpec("ok", ["AAA", "BBB"]), PortfolioSpec("gap", ["AAA", "BBB", "EEE"])],
+                                  prices=prices)
+
+    assert results[0].ok
+    assert results[1].error == "No overlapping history for AAA, EEE"
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+
+from src.data.fetch_data import get_close_prices
+from src.data.price_cache import LocalFileBackend, PriceCache
+
+
+def make_backend(tmp_path, tickers=("AAA", "BBB")):
+    dates = pd.bdate_range("2020-01-01", "2021-12-31")
+    source = tmp_path / "source"
+    source.mkdir()
+    for i, ticker in enumerate(tickers):
+        prices = pd.Series(100 + i + np.arange(len(dates)) * 0.1, index=dates, name="Close")
+        prices.to_csv(source / f"{ticker}.csv", index_label="Date")
+    return LocalFileBackend(source)
+
+
+def test_second_lookup_is_served_from_disk(tmp_path):
+    backend = make_backend(tmp_path)
+    cache = PriceCache(tmp_path / "cache", backend=backend)
+
+    first = cache.get(["AAA", "BBB"], "2020-03-01", "2020-06-01")
+    second = cache.get(["aaa", "bbb"], "2020-03-01", "2020-06-01")
+
+    assert len(backend.calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert list(first.columns) == ["AAA", "BBB"]
+
+
+def test_only_missing_gaps_are_fetched(tmp_path):
+    backend = make_backend(tmp_path)
+    cache = PriceCache(tmp_path / "cache", backend=backend)
+
+    cache.get(["AAA"], "2020-03-01", "2020-06-01")
+    prices = cache.get(["AAA"], "2020-01-01", "2020-09-01")
+
+    gaps = [(start, end) for _, start, end in backend.calls[1:]]
+    assert gaps == [
+        (pd.Timestamp("2020-01-01"), pd.Timestamp("2020-03-01")),
+        (pd.Timestamp("2020-06-01"), pd.Timestamp("2020-09-01")),
+    ]
+    assert prices.index.is_monotonic_increasing
+    assert prices.index[0] == pd.Timestamp("2020-01-01")
+    assert prices.index[-1] < pd.Timestamp("2020-09-01")
+
+
+def test_cache_survives_reopening(tmp_path):
+    backend = make_backend(tmp_path)
+    PriceCache(tmp_path / "cache", backend=backend).get(["AAA"], "2020-03-01", "2020-06-01")
+
+    reopened = PriceCache(tmp_path / "cache", backend=backend)
+    reopened.get(["AAA"], "2020-04-01", "2020-05-01")
+
+    assert len(backend.calls) == 1
+
+
+def test_get_close_prices_uses_given_cache(tmp_path):
+    backend = make_backend(tmp_path)
+    cache = PriceCache(tmp_path / "cache", backend=backend)
+
+    prices = get_close_prices(["AAA", "BBB"], start="2021-01-01", end="2021-02-01", cache=cache)
+
+    assert prices.shape[1] == 2
+    assert prices.index.min() >= pd.Timestamp("2021-01-01")
+
+
+def test_get_close_prices_with_period(tmp_path):
+    today = pd.Timestamp.today().normalize()
+    dates = pd.bdate_range(today - pd.Timedelta(days=400), today)
+    source = tmp_path / "source"
+    source.mkdir()
+    pd.Series(100 + np.arange(len(dates)) * 0.1, index=dates, name="Close").to_csv(
+        source / "AAA.csv", index_label="Date")
+    cache = PriceCache(tmp_path / "cache", backend=LocalFileBackend(source))
+
+    assert len(get_close_prices(["AAA"], period="5d", cache=cache)) == 5
+    ytd = get_close_prices(["AAA"], period="ytd", cache=cache)
+    assert list(ytd.index) == list(dates[dates.year == today.year])
+
+
+class SilentlyFailingBackend:
+    """Like yfinance on a throttled request: no exception, just no prices."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.calls = []
+        self.failing = False
+
+    def __call__(self, tickers, start, end):
+        self.calls.append((list(tickers), start, end))
+        if self.failing:
+            return pd.DataFrame({t: pd.Series(np.nan, index=pd.bdate_range(start, end)) for t in tickers})
+        return self.backend(tickers, start, end)
+
+
+def test_empty_fetch_for_cached_ticker_is_retried(tmp_path):
+    backend = SilentlyFailingBackend(make_backend(tmp_path))
+    cache = PriceCache(tmp_path / "cache", backend=backend)
+    cache.get(["AAA"], "2020-03-01", "2020-06-01")
+
+    backend.failing = True
+    assert cache.get(["AAA"], "2020-03-01", "2020-09-01").index[-1] < pd.Timestamp("2020-06-01")
+    backend.failing = False
+    prices = cache.get(["AAA"], "2020-03-01", "2020-09-01")
+
+    assert [(start, end) for _, start, end in backend.calls[1:]] == [
+        (pd.Timestamp("2020-06-01"), pd.Timestamp("2020-09-01")),
+    ] * 2
+    assert prices.index[-1] == pd.Timestamp("2020-08-31")
+
+
+def test_weekend_after_last_price_counts_as_covered(tmp_path):
+    backend = make_backend(tmp_path)
+    cache = PriceCache(tmp_path / "cache", backend=backend)
+
+    cache.get(["AAA"], "2020-03-02", "2020-03-08")  # ends on a Sunday, last price on Friday
+    cache.get(["AAA"], "2020-03-02", "2020-03-08")
+
+    assert len(backend.calls) == 1
@@ -0,0 +1,59 @@
+import logging
+
+import numpy as np
+import pytest
+
+from src.analytics.optimization.risk_parity import (
+    equal_risk_contribution,
+    hierarchical_risk_parity,
+    risk_contributions,
+)
+
+
+def make_cov(n, seed=0):
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(size=(n, 3))
+    return (loadings @ np.diag([0.04, 0.02, 0.01]) @ loadings.T + np.diag(rng.uniform(0.01, 0.09, n))) / 3
+
+
+@pytest.mark.parametrize("method", ["newton", "ccd"])
+def test_erc_equalizes_risk_contributions(method):
+    cov = make_cov(30)
+    w = equal_risk_contribution(cov, method=method)
+
+    assert w.sum() == pytest.approx(1) and (w > 0).all()
+    np.testing.assert_allclose(risk_contributions(w, cov), 1 / 30, atol=1e-8)
+
+    budget = np.linspace(1, 3, 30)
+    w_budget = equal_risk_contribution(cov, budget=budget, method=method)
+    np.testing.assert_allclose(risk_contributions(w_budget, cov), budget / budget.sum(), atol=1e-8)
+
+
+@pytest.mark.parametrize("method", ["newton", "ccd"])
+def test_erc_warns_when_it_runs_out_of_iterations(method, caplog):
+    with caplog.at_level(logging.WARNING, logger="optifund"):
+        w = equal_risk_contribution(make_cov(30), method=method, max_iter=1)
+    assert "did not converge" in caplog.text
+    assert w.sum() == pytest.approx(1)
+
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="optifund"):
+        equal_risk_contribution(make_cov(30), method=method)
+    assert caplog.records == []
+
+
+def test_erc_two_assets_is_inverse_volatility():
+    cov = np.array([[0.04, 0.006], [0.006, 0.01]])
+    np.testing.assert_allclose(equal_risk_contribution(cov), [1 / 3, 2 / 3])
+
+
+def test_hrp_weights():
+    # uncorrelated assets: every split is inverse variance, so HRP is the inverse-variance portfolio
+    variances = np.array([0.04, 0.01, 0.02, 0.09])
+    np.testing.assert_allclose(hierarchical_risk_parity(np.diag(variances)),
+                               (1 / variances) / (1 / variances).sum())
+
+    # a singular covariance (more assets than observations) still gets valid weights
+    returns = np.random.default_rng(1).normal(0, 0.01, (50, 200))
+    w = hierarchical_risk_parity(np.cov(returns, rowvar=False), corr=np.corrcoef(returns, rowvar=False))
+    assert w.sum() == pytest.approx(1) and (w > 0).all()
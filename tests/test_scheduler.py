@@ -0,0 +1,64 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.data.price_cache import PriceCache
+from src.data.scheduler import FetchScheduler, RateLimiter
+
+
+class FlakyBackend:
+    """Fake backend: fails the first `flaky_calls` calls of every batch, always fails batches holding "DEAD"."""
+
+    def __init__(self, flaky_calls=1):
+        self.flaky_calls = flaky_calls
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, tickers, start, end):
+        with self._lock:
+            self.calls.append(tuple(tickers))
+            attempts = self.calls.count(tuple(tickers))
+        if "DEAD" in tickers or attempts <= self.flaky_calls:
+            raise ConnectionError("rate limited")
+        dates = pd.bdate_range(start, end - pd.Timedelta(days=1))
+        return pd.DataFrame({t: np.linspace(10, 20, len(dates)) for t in tickers if t != "GONE"}, index=dates)
+
+
+def test_batches_are_retried_and_failures_stay_per_batch():
+    backend = FlakyBackend(flaky_calls=1)
+    sleeps = []
+    scheduler = FetchScheduler(backend, batch_size=2, max_workers=3, max_retries=2, backoff=1.0,
+                               rate_limit=None, jitter=False, sleep=sleeps.append)
+    tickers = ["A", "B", "C", "GONE", "DEAD", "E"]
+    result = scheduler.fetch(tickers, pd.Timestamp("2021-01-04"), pd.Timestamp("2021-02-01"))
+
+    assert result.status == {"A": "ok", "B": "ok", "C": "ok", "GONE": "missing", "DEAD": "failed", "E": "failed"}
+    assert list(result.prices.columns) == ["A", "B", "C"]
+    assert "ConnectionError" in result.errors["DEAD"]
+    # every batch failed once, then the healthy ones succeeded; the dead one used all retries
+    assert len(backend.calls) == 2 + 2 + 3
+    assert sorted(sleeps) == [1.0, 1.0, 1.0, 2.0]
+
+
+def test_rate_limiter_spaces_calls_after_the_burst():
+    now = [0.0]
+    limiter = RateLimiter(rate=2.0, burst=2, clock=lambda: now[0], sleep=lambda s: now.__setitem__(0, now[0] + s))
+    times = []
+    for _ in range(5):
+        limiter.acquire()
+        times.append(now[0])
+    np.testing.assert_allclose(times, [0.0, 0.0, 0.5, 1.0, 1.5])
+
+
+def test_failed_downloads_are_not_cached_as_covered(tmp_path):
+    backend = FlakyBackend(flaky_calls=1)
+    scheduler = FetchScheduler(backend, max_retries=0, rate_limit=None, sleep=lambda s: None)
+    cache = PriceCache(tmp_path, backend=scheduler)
+
+    assert cache.get("AAA", "2021-01-04", "2021-02-01").empty
+    prices = cache.get("AAA", "2021-01-04", "2021-02-01")
+    assert len(prices) == 20
+    assert len(backend.calls) == 2
+    cache.get("AAA", "2021-01-04", "2021-02-01")
+    assert len(backend.calls) == 2
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.helpers.returns import (
+    compute_cumulative_returns_from_returns,
+    compute_daily_returns,
+    compute_ema,
+    compute_sma,
+)
+from src.analytics.strategies.batch import rolling_mean, run_ma_strategy_batch
+from src.analytics.strategies.sma_strategy import build_positions, compute_strategy_returns, generate_signals
+from src.analytics.strategies.sweep import sweep_ma_windows
+
+
+def make_prices(n_days=300, tickers=("AAA", "BBB", "CCC"), seed=0):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0005, 0.02, size=(n_days, len(tickers)))
+    index = pd.bdate_range("2022-01-03", periods=n_days)
+    return pd.DataFrame(100 * np.exp(np.cumsum(steps, axis=0)), index=index, columns=list(tickers))
+
+
+def test_rolling_mean_matches_pandas_with_gaps():
+    prices = make_prices()
+    prices.iloc[40:43, 1] = np.nan
+    prices.iloc[:10, 2] = np.nan
+
+    expected = prices.rolling(15).mean().to_numpy()
+    np.testing.assert_allclose(rolling_mean(prices.to_numpy(), 15), expected, equal_nan=True)
+
+
+@pytest.mark.parametrize("kind", ["sma", "ema"])
+def test_batch_strategy_matches_single_ticker_pipeline(kind):
+    prices = make_prices()
+    result = run_ma_strategy_batch(prices, window=20, kind=kind)
+
+    for ticker in prices.columns:
+        close = prices[ticker]
+        average = compute_sma(close, 20) if kind == "sma" else compute_ema(close, 20)
+        positions = build_positions(generate_signals(close, average))
+        daily = compute_daily_returns(close)
+        strat = compute_strategy_returns(daily, positions)
+
+        np.testing.assert_allclose(result[kind][ticker], average, equal_nan=True)
+        np.testing.assert_allclose(result["positions"][ticker], positions)
+        np.testing.assert_allclose(result["strategy_cumu"][ticker], compute_cumulative_returns_from_returns(strat))
+        np.testing.assert_allclose(result["bh_cumu"][ticker], compute_cumulative_returns_from_returns(daily))
+        assert result["summary"].loc[ticker, "strategy_return"] == pytest.approx(
+            compute_cumulative_returns_from_returns(strat).iloc[-1])
+
+
+def test_batch_strategy_summary_only():
+    result = run_ma_strategy_batch(make_prices(tickers=[f"T{i}" for i in range(50)]), keep_series=False)
+
+    assert list(result) == ["summary"]
+    assert result["summary"].shape == (50, 4)
+
+
+def test_sweep_matches_batch_engine():
+    prices = make_prices(tickers=("AAA", "BBB"))
+    table = sweep_ma_windows(prices, windows=[5, 30], kinds=("sma", "ema"))
+
+    assert table.shape == (8, 4)
+    for kind in ("sma", "ema"):
+        batch = run_ma_strategy_batch(prices, window=30, kind=kind)
+        for ticker in prices.columns:
+            row = table.loc[(kind, 30, ticker)]
+            strat = batch["strategy_returns"][ticker]
+            wealth = (1 + strat).cumprod()
+            assert row["total_return"] == pytest.approx(batch["summary"].loc[ticker, "strategy_return"])
+            assert row["sharpe"] == pytest.approx(strat.mean() / strat.std() * np.sqrt(252))
+            assert row["max_drawdown"] == pytest.approx((wealth / wealth.cummax() - 1).min())
+
+
+def test_sweep_process_pool_gives_same_table():
+    prices = make_prices(n_days=120, tickers=("AAA", "BBB"))
+    serial = sweep_ma_windows(prices, windows=range(2, 12))
+    pooled = sweep_ma_windows(prices, windows=range(2, 12), n_jobs=2)
+
+    pd.testing.assert_frame_equal(serial, pooled)
@@ -0,0 +1,27 @@
+from src.analytics.helpers.validateTickers import TickerCache, validate_tickers
+
+
+def test_validate_tickers_caches_results_but_not_errors(tmp_path):
+    calls = []
+
+    def check(ticker):
+        calls.append(ticker)
+        if ticker == "DOWN":
+            raise ConnectionError("network down")
+        return ticker != "FAKE"
+
+    cache = TickerCache(tmp_path / "tickers.json", ttl=60)
+    first = validate_tickers(["aapl", "FAKE", "DOWN", "AAPL"], cache=cache, check=check)
+    assert first == {"AAPL": True, "FAKE": False, "DOWN": False}
+    assert sorted(calls) == ["AAPL", "DOWN", "FAKE"]
+
+    # valid and invalid answers come from the file, the failed lookup is retried
+    calls.clear()
+    second = validate_tickers(["AAPL", "FAKE", "DOWN"], cache=TickerCache(tmp_path / "tickers.json"), check=check)
+    assert second == first
+    assert calls == ["DOWN"]
+
+    # expired entries are looked up again
+    calls.clear()
+    validate_tickers(["AAPL"], cache=TickerCache(tmp_path / "tickers.json", ttl=-1), check=check)
+    assert calls == ["AAPL"]
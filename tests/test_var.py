@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.risk.var import (
+    METHODS,
+    conditional_value_at_risk,
+    rolling_var,
+    value_at_risk,
+    var_report,
+)
+
+
+def _returns(n_days=400, n_assets=3, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2020-01-01", periods=n_days)
+    return pd.DataFrame(rng.standard_t(4, (n_days, n_assets)) * 0.01, index=dates,
+                        columns=[f"A{i}" for i in range(n_assets)])
+
+
+def test_historical_var_matches_quantile():
+    returns = _returns()
+    var = value_at_risk(returns, 0.95)
+    cvar = conditional_value_at_risk(returns, 0.95)
+    expected = -returns.quantile(0.05)
+    pd.testing.assert_series_equal(var, expected, check_names=False)
+    assert (cvar >= var).all()
+
+    weights = np.array([0.2, 0.3, 0.5])
+    assert value_at_risk(returns, 0.99, weights=weights) == pytest.approx(-np.quantile(returns @ weights, 0.01))
+
+
+def test_parametric_and_cornish_fisher_agree_on_normal_data():
+    rng = np.random.default_rng(1)
+    returns = pd.Series(rng.normal(0.0005, 0.01, 200_000))
+    parametric = value_at_risk(returns, 0.99, "parametric")
+    assert parametric == pytest.approx(-(0.0005 - 2.3263 * 0.01), rel=1e-2)
+    assert value_at_risk(returns, 0.99, "cornish_fisher") == pytest.approx(parametric, rel=1e-2)
+    assert conditional_value_at_risk(returns, 0.99, "cornish_fisher") == pytest.approx(
+        conditional_value_at_risk(returns, 0.99, "parametric"), rel=1e-2)
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_rolling_var_matches_static_windows(method):
+    returns = _returns()
+    returns.iloc[50, 1] = np.nan
+    rolled = rolling_var(returns, window=120, confidence=0.95, method=method)
+
+    assert rolled["var"].iloc[:119].isna().all().all()
+    for end in (119, 250, len(returns) - 1):
+        window = returns.iloc[end - 119:end + 1]
+        complete = window.notna().all()
+        np.testing.assert_allclose(rolled["var"].iloc[end][complete],
+                                   value_at_risk(window, 0.95, method)[complete])
+        np.testing.assert_allclose(rolled["cvar"].iloc[end][complete],
+                                   conditional_value_at_risk(window, 0.95, method)[complete])
+
+
+def test_var_report_layout():
+    returns = _returns()
+    report = var_report(returns, weights=[1 / 3] * 3)
+    assert list(report.index) == ["A0", "A1", "A2", "portfolio"]
+    assert report.shape == (4, 2 * len(METHODS))
+    with pytest.raises(ValueError):
+        value_at_risk(returns, method="garch")